@@ -1,10 +1,196 @@
 import threading
 import time
 import traceback
+from collections import deque
 from typing import Dict, List, Optional, Callable, Any
 import importlib.util
 import os
+import numpy as np
 from interfaces import AppBase
+from display_commands import TimingStats
+
+
+class FrameTimeStats:
+    """The most recent frame times (ms) and their distribution"""
+
+    def __init__(self, size: int = 600):
+        self._times = deque(maxlen=size)
+
+    def record(self, ms: float) -> None:
+        self._times.append(ms)
+
+    def as_dict(self) -> Dict[str, Any]:
+        if not self._times:
+            return {"count": 0}
+        times = np.fromiter(self._times, dtype=float, count=len(self._times))
+        p50, p90, p99 = np.percentile(times, [50, 90, 99])
+        return {
+            "count": len(times),
+            "avg_ms": float(times.mean()),
+            "min_ms": float(times.min()),
+            "p50_ms": float(p50),
+            "p90_ms": float(p90),
+            "p99_ms": float(p99),
+            "max_ms": float(times.max()),
+        }
+
+
+class AppRunner:
+    """
+    Runs one app's update() on its own thread.
+
+    Ticks are due at fixed monotonic deadlines, so a slow update() doesn't push
+    back the ticks after it; ticks missed while it ran are counted and skipped
+    rather than run in a burst. Between ticks the thread waits on a condition.
+    An app with no tick rate only wakes for request_update() or to stop, so an
+    idle app costs nothing. Wakeups per second are kept for stats().
+
+    Apps with a fixed_step run as a game loop instead: each tick (a frame) adds
+    the real time since the last one to an accumulator, calls update(dt) with
+    dt == fixed_step until it is used up, then calls render(alpha) once. After a
+    stall at most max_catch_up_steps steps are run, and the rest of the backlog
+    is dropped (the game slows down rather than freezing while it catches up).
+    """
+
+    RATE_WINDOW = 5.0  # Seconds of wakeups behind wakeups_per_sec
+
+    def __init__(self, name: str, app: AppBase, rate_hz: float):
+        self.name = name
+        self.app = app
+        self.rate_hz = 0.0
+        self._cond = threading.Condition()
+        self._running = True
+        self._wake_requested = False
+        self._deadline: Optional[float] = None
+        self._recent = deque()
+        self.started_at = time.monotonic()
+
+        self.wakeups = 0
+        self.ticks = 0
+        self.requested = 0
+        self.missed_ticks = 0
+        self.update_timing = TimingStats()
+        self.frame_times = FrameTimeStats()
+        self._last_frame: Optional[float] = None
+
+        # Game loop mode
+        self.fixed_step = getattr(app, "fixed_step", None)
+        self.max_catch_up_steps = getattr(app, "max_catch_up_steps", 5)
+        self._accumulator = 0.0
+        self.steps = 0
+        self.dropped_steps = 0
+        self.render_timing = TimingStats()
+        self.set_rate(rate_hz)
+
+    def set_rate(self, rate_hz: Optional[float]) -> None:
+        """Tick rate_hz times a second from now on; 0 or None stops ticking"""
+        with self._cond:
+            self.rate_hz = float(rate_hz or 0.0)
+            self._deadline = time.monotonic() + 1.0 / self.rate_hz if self.rate_hz > 0 else None
+            self._cond.notify()
+
+    def wake(self) -> None:
+        """Run update() once as soon as the app's thread is free"""
+        with self._cond:
+            self._wake_requested = True
+            self._cond.notify()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+
+    def wait(self) -> bool:
+        """Sleep until the next tick or a requested update; False once stopped"""
+        with self._cond:
+            while self._running and not self._wake_requested:
+                if self._deadline is None:
+                    self._cond.wait()
+                    continue
+                remaining = self._deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            if not self._running:
+                return False
+
+            now = time.monotonic()
+            if self._wake_requested:
+                self._wake_requested = False
+                self.requested += 1
+            if self._deadline is not None and now >= self._deadline:
+                period = 1.0 / self.rate_hz
+                behind = int((now - self._deadline) // period)
+                self.missed_ticks += behind
+                self._deadline += (behind + 1) * period
+                self.ticks += 1
+
+            self.wakeups += 1
+            self._recent.append(now)
+            while self._recent[0] < now - self.RATE_WINDOW:
+                self._recent.popleft()
+            return True
+
+    def run_frame(self) -> None:
+        """Run update() once, or in game loop mode the steps that are due and render()"""
+        now = time.monotonic()
+        elapsed = 0.0 if self._last_frame is None else now - self._last_frame
+        self._last_frame = now
+        if elapsed:
+            with self._cond:
+                self.frame_times.record(elapsed * 1000.0)
+
+        if not self.fixed_step:
+            start = time.perf_counter()
+            self.app.update()
+            with self._cond:
+                self.update_timing.record((time.perf_counter() - start) * 1000.0)
+            return
+
+        step = self.fixed_step
+        self._accumulator += elapsed
+        start = time.perf_counter()
+        steps = 0
+        while self._accumulator >= step and steps < self.max_catch_up_steps:
+            self.app.update(step)
+            self._accumulator -= step
+            steps += 1
+        dropped = int(self._accumulator // step)
+        self._accumulator -= dropped * step
+        render_start = time.perf_counter()
+        self.app.render(self._accumulator / step)
+        end = time.perf_counter()
+
+        with self._cond:
+            self.steps += steps
+            self.dropped_steps += dropped
+            if steps:
+                self.update_timing.record((render_start - start) * 1000.0)
+            self.render_timing.record((end - render_start) * 1000.0)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            now = time.monotonic()
+            window = min(self.RATE_WINDOW, now - self.started_at)
+            recent = sum(1 for t in self._recent if t >= now - self.RATE_WINDOW)
+            stats = {
+                "tick_rate_hz": self.rate_hz,
+                "wakeups": self.wakeups,
+                "wakeups_per_sec": recent / window if window > 0 else 0.0,
+                "ticks": self.ticks,
+                "requested": self.requested,
+                "missed_ticks": self.missed_ticks,
+                "update": self.update_timing.as_dict(),
+                "frame_time": self.frame_times.as_dict(),
+            }
+            if self.fixed_step:
+                stats.update({
+                    "fixed_step": self.fixed_step,
+                    "steps": self.steps,
+                    "dropped_steps": self.dropped_steps,
+                    "render": self.render_timing.as_dict(),
+                })
+            return stats
 
 
 class AppManager:
@@ -20,6 +206,8 @@ class AppManager:
         self.app_threads: Dict[str, threading.Thread] = {}
         self.running_apps: Dict[str, bool] = {}
         self.app_cursor_preferences: Dict[str, bool] = {}  # Track cursor preferences per app
+        self.runners: Dict[str, AppRunner] = {}
+        self.event_counts: Dict[str, int] = {}
         self._stop_all = False
         
     def load_app_instance(self, app_name: str) -> Optional[AppBase]:
@@ -79,7 +267,12 @@ class AppManager:
         return False
     
     def start_app(self, app_name: str, update_rate_hz: float = 20.0) -> bool:
-        """Start an application in a background thread."""
+        """
+        Start an application in a background thread.
+
+        The app's update() is ticked at its tick_rate_hz, or update_rate_hz if it
+        doesn't set one. Apps that set tick_rate_hz = 0 are never ticked.
+        """
         if app_name not in self.loaded_apps:
             print(f"[AppManager] Cannot start unloaded app: {app_name}")
             return False
@@ -89,19 +282,20 @@ class AppManager:
             return True
         
         app_instance = self.loaded_apps[app_name]
+        runner = AppRunner(app_name, app_instance, self.get_tick_rate(app_instance, update_rate_hz))
+        app_instance._runner = runner
+        self.runners[app_name] = runner
         self.running_apps[app_name] = True
         
         def app_loop():
             try:
-                print(f"[AppManager] Starting app: {app_name}")
+                print(f"[AppManager] Starting app: {app_name} ({runner.rate_hz:g} Hz ticks)")
                 # Set cursor state for this app
                 self.set_app_cursor_state(app_name)
                 app_instance.start()
                 
-                sleep_time = 1.0 / update_rate_hz
-                while self.running_apps.get(app_name, False) and not self._stop_all:
-                    app_instance.update()
-                    time.sleep(sleep_time)
+                while not self._stop_all and runner.wait():
+                    runner.run_frame()
                     
             except Exception as e:
                 print(f"[AppManager] Exception in app '{app_name}': {e}")
@@ -120,6 +314,16 @@ class AppManager:
         self.app_threads[app_name] = app_thread
         
         return True
+
+    def get_tick_rate(self, app_instance: AppBase, update_rate_hz: float) -> float:
+        """How often an app's update() (or game loop frame) should run; 0 for never"""
+        rate = getattr(app_instance, "tick_rate_hz", None)
+        if rate is not None:
+            return rate
+        if getattr(app_instance, "fixed_step", None):
+            # Game loops render once per step unless they ask for another frame rate
+            return 1.0 / app_instance.fixed_step
+        return update_rate_hz
     
     def stop_app(self, app_name: str, timeout: float = 5.0) -> bool:
         """Stop a running application."""
@@ -128,6 +332,8 @@ class AppManager:
             
         print(f"[AppManager] Stopping app: {app_name}")
         self.running_apps[app_name] = False
+        if app_name in self.runners:
+            self.runners[app_name].stop()
         
         # Clear cursor when stopping an app
         self.clear_cursor()
@@ -141,6 +347,7 @@ class AppManager:
                 return False
             else:
                 del self.app_threads[app_name]
+                self.runners.pop(app_name, None)
         
         return True
     
@@ -157,6 +364,8 @@ class AppManager:
         # Stop all apps
         for app_name in list(self.running_apps.keys()):
             self.running_apps[app_name] = False
+        for runner in list(self.runners.values()):
+            runner.stop()
         
         # Wait for all threads to finish
         all_stopped = True
@@ -167,6 +376,7 @@ class AppManager:
                 all_stopped = False
             else:
                 del self.app_threads[app_name]
+                self.runners.pop(app_name, None)
         
         return all_stopped
     
@@ -186,6 +396,7 @@ class AppManager:
         """Distribute an event to all loaded applications that have the event handler."""
         for app_name, app_instance in list(self.loaded_apps.items()):
             if hasattr(app_instance, event_name):
+                self.event_counts[app_name] = self.event_counts.get(app_name, 0) + 1
                 try:
                     handler = getattr(app_instance, event_name)
                     handler(*args, **kwargs)
@@ -193,6 +404,21 @@ class AppManager:
                     print(f"[AppManager] Error in {app_name}.{event_name}: {e}")
                     traceback.print_exc()
     
+    def get_app_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-app scheduling stats for the running apps: tick rate, wakeups
+        (total and per second over the last few seconds), ticks, requested
+        updates, ticks skipped because update() overran, update() time, and
+        input events delivered.
+        """
+        stats = {}
+        for app_name in self.get_running_apps():
+            runner = self.runners.get(app_name)
+            if runner is not None:
+                stats[app_name] = runner.stats()
+                stats[app_name]["events"] = self.event_counts.get(app_name, 0)
+        return stats
+
     def get_app_instance(self, app_name: str) -> Optional[AppBase]:
         """Get a loaded app instance by name."""
         return self.loaded_apps.get(app_name)
@@ -4,9 +4,10 @@ import datetime
 import time
 import json
 import os
-from PIL import Image, ImageDraw
 
 class App(AppBase):
+    tick_rate_hz = 0
+
     def __init__(self, context):
         super().__init__(context)
         self.display_queue = context["display_queue"]
@@ -47,6 +48,9 @@ class App(AppBase):
         # Load events from JSON file
         self.events = self.load_events()
         
+        # True while the selected day's event list is shown instead of the month
+        self.showing_events = False
+        
     def load_events(self):
         """Load events from the events.json file"""
         try:
@@ -78,20 +82,31 @@ class App(AppBase):
     
     def draw_calendar(self):
         """Draw the complete calendar view"""
-        # Clear the screen
-        self.display_queue.put(("clear_base",))
+        # Collect every text run, outline segment and event dot, then send them as a
+        # handful of batch commands instead of one message per element
+        texts, lines, dots = [], [], []
         
         # Draw month/year header
-        self.draw_header()
+        self.draw_header(texts)
         
         # Draw day names
-        self.draw_day_names()
+        self.draw_day_names(texts)
         
         # Draw calendar grid
-        self.draw_calendar_grid()
+        self.draw_calendar_grid(texts, lines, dots)
         
-    def draw_header(self):
-        """Draw the month/year header"""
+        # Draw everything as one frame, starting from a clear screen
+        self.display_queue.put(("begin_frame",))
+        self.display_queue.put(("clear_base",))
+        self.display_queue.put(("draw_base_texts", texts))
+        if lines:
+            self.display_queue.put(("draw_base_lines", lines))
+        if dots:
+            self.display_queue.put(("draw_base_pixels", dots))
+        self.display_queue.put(("commit_frame",))
+        
+    def draw_header(self, texts):
+        """Add the month/year header"""
         month_name = self.month_names[self.view_month - 1]
         header_text = f"{month_name} {self.view_year}"
         
@@ -99,18 +114,18 @@ class App(AppBase):
         font_width, font_height = self.context["get_text_size"](header_text, self.font_small)
         header_x = (self.width - font_width) // 2
         
-        self.display_queue.put(("draw_base_text", self.font_small, header_text, header_x, 2))
+        texts.append((self.font_small, header_text, header_x, 2))
         
-    def draw_day_names(self):
-        """Draw the day names row"""
+    def draw_day_names(self, texts):
+        """Add the day names row"""
         y_pos = self.header_height + 2
         
         for i, day_name in enumerate(self.day_names):
             x_pos = self.start_x + (i * self.cell_width)
-            self.display_queue.put(("draw_base_text", self.font_small, day_name, x_pos, y_pos))
+            texts.append((self.font_small, day_name, x_pos, y_pos))
             
-    def draw_calendar_grid(self):
-        """Draw the calendar grid with dates"""
+    def draw_calendar_grid(self, texts, lines, dots):
+        """Add the calendar grid with dates"""
         # Get calendar data for the current month
         cal = calendar.monthcalendar(self.view_year, self.view_month)
         
@@ -141,90 +156,61 @@ class App(AppBase):
                 # Choose font and draw background if needed
                 if is_today:
                     # Draw background rectangle for today
-                    self.draw_cell_outline(x_pos - 2, y_pos - 1, self.cell_width - 1, self.cell_height - 1)
+                    lines.extend(self.draw_cell_outline(x_pos - 2, y_pos - 1, self.cell_width - 1, self.cell_height - 1))
                     font_to_use = self.font_small
                 elif is_selected:
                     # Draw outline for selected date
-                    self.draw_cell_outline_dashed(x_pos - 2, y_pos - 1, self.cell_width - 1, self.cell_height - 1)
+                    lines.extend(self.draw_cell_outline_dashed(x_pos - 2, y_pos - 1, self.cell_width - 1, self.cell_height - 1))
                     font_to_use = self.font_small
                 else:
                     font_to_use = self.font_small
                 
                 # Draw the day number
                 day_str = str(day)
-                self.display_queue.put(("draw_base_text", font_to_use, day_str, x_pos, y_pos))
+                texts.append((font_to_use, day_str, x_pos, y_pos))
                 
                 # Draw event indicator if there are events
                 if has_events:
-                    self.draw_event_indicator(x_pos + self.cell_width - 6, y_pos + 1)
+                    dots.extend(self.draw_event_indicator(x_pos + self.cell_width - 6, y_pos + 1))
                 
     def draw_cell_outline_dashed(self, x, y, width, height):
-        """Draw a dashed outline around a cell"""
-        from PIL import Image, ImageDraw
-        
-        # Create a small image for the outline
+        """Line segments for a dashed outline around a cell"""
+        x, y = int(x), int(y)
         outline_width = int(width) + 2
         outline_height = int(height) + 2
-        outline_img = Image.new("1", (outline_width, outline_height), 0)  # Black background
-        draw = ImageDraw.Draw(outline_img)
+        right = x + outline_width - 1
+        bottom = y + outline_height - 1
         
-        # Draw dashed outline manually
         dash_length = 3
         gap_length = 2
+        segments = []
         
-        # Top edge
+        # Top and bottom edges
         for i in range(0, outline_width, dash_length + gap_length):
             end_x = min(i + dash_length - 1, outline_width - 1)
-            if i < outline_width:
-                draw.line([i, 0, end_x, 0], fill=1)
-        
-        # Bottom edge
-        for i in range(0, outline_width, dash_length + gap_length):
-            end_x = min(i + dash_length - 1, outline_width - 1)
-            if i < outline_width:
-                draw.line([i, outline_height - 1, end_x, outline_height - 1], fill=1)
-        
-        # Left edge
-        for i in range(0, outline_height, dash_length + gap_length):
-            end_y = min(i + dash_length - 1, outline_height - 1)
-            if i < outline_height:
-                draw.line([0, i, 0, end_y], fill=1)
+            segments.append((x + i, y, x + end_x, y))
+            segments.append((x + i, bottom, x + end_x, bottom))
         
-        # Right edge
+        # Left and right edges
         for i in range(0, outline_height, dash_length + gap_length):
             end_y = min(i + dash_length - 1, outline_height - 1)
-            if i < outline_height:
-                draw.line([outline_width - 1, i, outline_width - 1, end_y], fill=1)
+            segments.append((x, y + i, x, y + end_y))
+            segments.append((right, y + i, right, y + end_y))
         
-        # Draw the outline image to the display
-        self.display_queue.put(("draw_base_image", outline_img, int(x), int(y)))
+        return segments
         
     def draw_cell_outline(self, x, y, width, height):
-        """Draw an outline around a cell"""
-        
-        # Create a small image for the outline
-        outline_width = int(width) + 2
-        outline_height = int(height) + 2
-        outline_img = Image.new("1", (outline_width, outline_height), 0)  # Black background
-        draw = ImageDraw.Draw(outline_img)
-        
-        # Draw the outline rectangle
-        draw.rectangle([0, 0, outline_width-1, outline_height-1], outline=1, fill=0)
-        
-        # Draw the outline image to the display
-        self.display_queue.put(("draw_base_image", outline_img, int(x), int(y)))
+        """Line segments for an outline around a cell"""
+        x, y = int(x), int(y)
+        right = x + int(width) + 1
+        bottom = y + int(height) + 1
+        return [(x, y, right, y), (x, bottom, right, bottom), (x, y, x, bottom), (right, y, right, bottom)]
         
     def draw_event_indicator(self, x, y):
-        """Draw a small dot to indicate events on a date"""
-        # Create a small 3x3 image for the event indicator
-        indicator_img = Image.new("1", (3, 3), 0)  # Black background
-        draw = ImageDraw.Draw(indicator_img)
-        
-        # Draw a small filled circle/dot
-        draw.ellipse([0, 0, 2, 2], fill=1)
-        
-        # Draw the indicator to the display
-        self.display_queue.put(("draw_base_image", indicator_img, int(x), int(y)))
+        """Pixels of a small dot to indicate events on a date"""
+        x, y = int(x), int(y)
+        # Same shape as a 3x3 filled ellipse
+        return [(x + 1, y), (x, y + 1), (x + 1, y + 1), (x + 2, y + 1), (x + 1, y + 2)]
         
     def navigate_month(self, direction):
         """Navigate to previous (-1) or next (1) month"""
@@ -292,6 +278,16 @@ class App(AppBase):
             
         return info
         
+    def get_events_screen_text(self, events):
+        """Event list for the screen, one event per paragraph"""
+        lines = []
+        for event in events:
+            line = f"{event['time']} {event['title']}"
+            if event.get('description'):
+                line += f" - {event['description']}"
+            lines.append(line)
+        return "\n".join(lines)
+        
     def get_date_info_for_tts(self):
         """Get date information formatted for TTS (more natural speech)"""
         weekday = self.selected_date.strftime("%A")
@@ -332,6 +328,17 @@ class App(AppBase):
         
     def onkeyup(self, keycode):
         """Handle key release events"""
+        if self.showing_events:
+            # Up/Down and Page Up/Down scroll the list; Esc or E goes back to the month
+            if self.screen_view.handle_key(keycode):
+                return
+            if keycode in ("KEY_ESC", "KEY_E"):
+                self.showing_events = False
+                # The list may still be following background TTS; keep it off the month grid
+                self.screen_view.detach()
+                self.draw_calendar()
+            return
+            
         # Navigation keys
         if keycode == "KEY_LEFT":
             self.navigate_day(-1)
@@ -390,9 +397,11 @@ class App(AppBase):
                         
                 print(f"Events TTS: {events_text}")
                 
-                # Use TTS to speak the events
+                # Show the whole list (it scrolls along with the speech) and speak the events
+                self.set_screen(self.selected_date.strftime("%a %d %b"), self.get_events_screen_text(events))
+                self.showing_events = True
                 if "run_tts" in self.context:
-                    self.context["run_tts"](events_text, background=True)
+                    self.context["run_tts"](events_text, background=True, scroll_view=self.screen_view)
             else:
                 no_events_text = f"No events scheduled for {self.selected_date.strftime('%A %B %d')}"
                 print(no_events_text)
@@ -1,7 +1,11 @@
 from interfaces import AppBase
+from widgets import Container, Label
 import time
 
 class App(AppBase):
+    # The clock and timer advance every 20th tick, once a second
+    tick_rate_hz = 20.0
+
     def __init__(self, context):
         super().__init__(context)
         self.display_queue = context["display_queue"]
@@ -20,38 +24,50 @@ class App(AppBase):
         self.timer_running = False
         self.timer_finished = False
         self.input_mode = None  # "minutes" or "seconds" when setting timer
+        
+        # Retained widgets: each second only the labels whose text changed are redrawn
+        self.ui = context["create_widget_screen"]()
+        small_font = context["fonts"]["small"]
+        
+        self.clock_view = self.ui.add(Container())
+        # Centered a little above the middle of the screen
+        time_font = context["get_font"]("sans", 20, "bold")
+        time_height = context["get_text_size"]("00:00:00", time_font)[1]
+        self.time_label = self.clock_view.add(Label(0, (self.height/2)-(time_height/2)-6, font=time_font,
+                                                    width=self.width, height=time_height, align="center"))
+        self.clock_view.add(Label(4, 4, "CLOCK - Press T for Timer", small_font))
+        
+        self.timer_view = self.ui.add(Container(visible=False))
+        self.timer_label = self.timer_view.add(Label(0, 2, font=context["fonts"]["default"],
+                                                     width=self.width, height=14, align="center"))
+        self.timer_sub_label = self.timer_view.add(Label(0, 0, font=small_font, width=self.width,
+                                                         height=6, align="center"))
+        self.instruction_labels = [
+            self.timer_view.add(Label(0, 32 + i * 6, font=small_font, width=self.width, height=6, align="center"))
+            for i in range(4)
+        ]
 
     def start(self):
-        pass
+        # Take over the whole screen at the first update
+        self.ui.invalidate()
 
     def update(self):
         self.t += 1
         
-        # Update every 20 ticks (every 1 second if update rate is 20Hz)
+        # Update every 20 ticks (every second at 20Hz)
         if self.t % 20 == 0:
-            self.display_queue.put(("clear_base",))
-            
+            self.clock_view.visible = self.mode == "clock"
+            self.timer_view.visible = self.mode == "timer"
             if self.mode == "clock":
                 self.update_clock()
             elif self.mode == "timer":
                 self.update_timer()
+            self.ui.render()
     
     def update_clock(self):
         """Update the clock display"""
         self.current_time = time.strftime("%H:%M:%S", time.localtime())
-        
-        # Get font and calculate position
-        font = self.context["fonts"]["large_bold"]
-        font_width, font_height = self.context["get_text_size"](self.current_time, font)
-        
-        # Draw clock
-        self.display_queue.put(("draw_base_text", font, self.current_time, 
-                              (self.width/2)-(font_width/2), (self.height/2)-(font_height/2)-6))
-        
-        # Draw mode indicator
-        small_font = self.context["fonts"]["small"]
-        self.display_queue.put(("draw_base_text", small_font, "CLOCK - Press T for Timer", 
-                              4, 4))
+        self.time_label.text = self.current_time
         
         self.play_sfx(self.path + "tick.wav")
         
@@ -92,20 +108,13 @@ class App(AppBase):
             display_text = f"{minutes:02d}:{seconds:02d}"
             sub_text = "(paused)" if self.timer_remaining > 0 else ""
         
-        # Draw timer display
-        font = self.context["fonts"]["default"]
-        font_width, font_height = self.context["get_text_size"](display_text, font)
-        self.display_queue.put(("draw_base_text", font, display_text,
-                              (self.width/2)-(font_width/2), 2))
-        
-        if sub_text:
-            sub_font = self.context["fonts"]["small"]
-            sub_width, sub_height = self.context["get_text_size"](sub_text, sub_font)
-            self.display_queue.put(("draw_base_text", sub_font, sub_text,
-                                  (self.width/2)-(sub_width/2), font_height + 6))
+        # Timer display, with the sub text just below it
+        self.timer_label.text = display_text
+        font_height = self.context["get_text_size"](display_text, self.timer_label.font)[1]
+        self.timer_sub_label.text = sub_text or ""
+        self.timer_sub_label.y = font_height + 6
         
-        # Draw instructions
-        small_font = self.context["fonts"]["small"]
+        # Instructions
         if self.input_mode:
             instructions = [
                 "Up/Down: Change value",
@@ -124,12 +133,8 @@ class App(AppBase):
                 "S: Set Timer | C: Switch to Clock"
             ]
         
-        # Draw each instruction line with proper spacing
-        y_offset = 32
-        for i, instruction in enumerate(instructions):
-            width, height = self.context["get_text_size"](instruction, small_font)
-            self.display_queue.put(("draw_base_text", small_font, instruction, 
-                                  self.width / 2 - width / 2, y_offset + (i * 6)))
+        for i, label in enumerate(self.instruction_labels):
+            label.text = instructions[i] if i < len(instructions) else ""
         
         # Play tick sound for running timer
         if self.timer_running and self.timer_remaining > 0:
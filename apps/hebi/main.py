@@ -1,9 +1,12 @@
 from interfaces import AppBase
 import random
 import time
-from PIL import Image, ImageDraw
+import numpy as np
 
 class App(AppBase):
+    # Game loop: update(dt) every 50ms of real time, however late the thread wakes
+    fixed_step = 0.05
+
     def __init__(self, context):
         super().__init__(context)
         self.display_queue = context["display_queue"]
@@ -16,6 +19,10 @@ class App(AppBase):
         self.GRID_HEIGHT = 16
         self.CELL_SIZE = 4  # 4x4 pixels per cell (128/32 = 4, 64/16 = 4)
         
+        # Drawn into directly and presented once per frame; cells is reused every frame
+        self.canvas = context["create_canvas"]()
+        self.cells = np.zeros((self.GRID_HEIGHT, self.GRID_WIDTH), dtype=bool)
+        
         # Game states
         self.PLAYING = 0
         self.GAME_OVER = 1
@@ -24,9 +31,10 @@ class App(AppBase):
         # Game state
         self.reset_game()
         
-        # Timing
-        self.move_timer = 0
-        self.move_interval = 8  # Move every 10 ticks (0.5 seconds at 20Hz)
+        # Timing (seconds)
+        self.move_timer = 0.0
+        self.move_interval = 0.4  # Time between moves; shrinks as the hebi eats
+        self.needs_redraw = False
         
     def reset_game(self):
         """Reset the game to initial state"""
@@ -40,7 +48,7 @@ class App(AppBase):
         
         self.score = 0
         self.state = self.PLAYING
-        self.move_timer = 0
+        self.move_timer = 0.0
         
     def place_food(self):
         """Place food at a random empty position"""
@@ -55,14 +63,19 @@ class App(AppBase):
         """Called when the app starts"""
         self.draw_game()
         
-    def update(self):
+    def update(self, dt):
         if self.state == self.PLAYING:
-            self.move_timer += 1
-            if self.move_timer >= self.move_interval:
-                self.move_timer = 0
+            self.move_timer += dt
+            # Allow for float rounding in the summed steps
+            if self.move_timer >= self.move_interval - 1e-9:
+                self.move_timer = 0.0
                 self.move_hebi()
-                if self.state == self.PLAYING:  # Only draw if still playing
-                    self.draw_game()
+                self.needs_redraw = True
+
+    def render(self, alpha):
+        if self.needs_redraw and self.state == self.PLAYING:  # Only draw if still playing
+            self.draw_game()
+        self.needs_redraw = False
 
     def move_hebi(self):
         """Move the hebi one step"""
@@ -96,8 +109,8 @@ class App(AppBase):
             self.score += 1
             self.place_food()
             # Speed up slightly
-            if self.move_interval > 3:
-                self.move_interval = max(3, self.move_interval - 1)
+            if self.move_interval > 0.15:
+                self.move_interval = max(0.15, self.move_interval - 0.05)
         else:
             # Remove tail if no food eaten
             self.hebi.pop()
@@ -110,23 +123,20 @@ class App(AppBase):
         
     def draw_game(self):
         """Draw the current game state"""
-        # Create a 128x64 image
-        img = Image.new("1", (128, 64), 0)
-        draw = ImageDraw.Draw(img)
-        
-        # Draw hebi
-        for segment in self.hebi:
-            x, y = segment
-            pixel_x = x * self.CELL_SIZE
-            pixel_y = y * self.CELL_SIZE
-            draw.rectangle([pixel_x, pixel_y, pixel_x + self.CELL_SIZE - 1, pixel_y + self.CELL_SIZE - 1], fill=1)
+        canvas = self.canvas
+        
+        # Draw hebi as a cell grid covering the whole screen
+        self.cells.fill(False)
+        xs, ys = zip(*self.hebi)
+        self.cells[list(ys), list(xs)] = True
+        canvas.blit_cells(self.cells, 0, 0, self.CELL_SIZE)
             
         # Draw food (blinking effect)
         food_x, food_y = self.food
         pixel_x = food_x * self.CELL_SIZE
         pixel_y = food_y * self.CELL_SIZE
         # Make food slightly smaller for visual distinction
-        draw.rectangle([pixel_x + 1, pixel_y + 1, pixel_x + self.CELL_SIZE - 2, pixel_y + self.CELL_SIZE - 2], fill=1)
+        canvas.fill_rect(pixel_x + 1, pixel_y + 1, pixel_x + self.CELL_SIZE - 2, pixel_y + self.CELL_SIZE - 2)
         
         # Draw score in corner
         font = self.context["fonts"]["small"]
@@ -134,18 +144,18 @@ class App(AppBase):
         font_width, font_height = self.context["get_text_size"](font_text, font)
         
         # draw box around score based on font size
-        draw.rectangle([1, 1, 3 + font_width, 4 + font_height], outline=1, fill=0)
-        draw.text((3, 2), font_text, font=font, fill=1)
+        canvas.fill_rect(1, 1, 3 + font_width, 4 + font_height, False)
+        canvas.rect_outline(1, 1, 3 + font_width, 4 + font_height)
+        canvas.draw_text(font, font_text, 3, 2)
 
         # Send to display
-        self.display_queue.put(("clear_base",))
-        self.display_queue.put(("draw_base_image", img, 0, 0))
+        canvas.present()
         
     def draw_game_over(self):
         """Draw game over screen"""
         print("Drawing game over screen", flush=True)
-        img = Image.new("1", (128, 64), 0)
-        draw = ImageDraw.Draw(img)
+        canvas = self.canvas
+        canvas.clear()
         
         font = self.context["fonts"]["bold"]
         small_font = self.context["fonts"]["default"]
@@ -155,27 +165,26 @@ class App(AppBase):
         # Game Over text
         game_over_text = "GAME OVER"
         text_width, text_height = self.context["get_text_size"](game_over_text, font)
-        draw.text((64 - text_width/2, y), game_over_text, font=font, fill=1)
+        canvas.draw_text(font, game_over_text, 64 - text_width/2, y)
         y += text_height + 2  # Move down after game over text
         
         # Score
         score_text = f"Score: {self.score}"
         score_width, score_height = self.context["get_text_size"](score_text, small_font)
-        draw.text((64 - score_width/2, y), score_text, font=small_font, fill=1)
+        canvas.draw_text(small_font, score_text, 64 - score_width/2, y)
         y += score_height + 2  # Move down after score text
 
         # Instructions
         restart_text = "R: Restart"
         restart_width, restart_height = self.context["get_text_size"](restart_text, small_font)
-        draw.text((64 - restart_width/2, y), restart_text, font=small_font, fill=1)
+        canvas.draw_text(small_font, restart_text, 64 - restart_width/2, y)
         y += restart_height + 2  # Move down after restart text
         
         exit_text = "ESC: Exit"
         exit_width, exit_height = self.context["get_text_size"](exit_text, small_font)
-        draw.text((64 - exit_width/2, y), exit_text, font=small_font, fill=1)
+        canvas.draw_text(small_font, exit_text, 64 - exit_width/2, y)
         # Send to display
-        self.display_queue.put(("clear_base",))
-        self.display_queue.put(("draw_base_image", img, 0, 0))
+        canvas.present()
         
     def onkeydown(self, keycode):
         """Handle key press events"""
@@ -3,6 +3,8 @@ from interfaces import AppBase
 import time
 
 class App(AppBase):
+    tick_rate_hz = 0
+
     def __init__(self, context):
         super().__init__(context)
         self.display_queue = context["display_queue"]
@@ -1,14 +1,22 @@
 import app_manager
 from interfaces import AppBase
+from widgets import Grid, Icon
 import time
 
 class App(AppBase):
+    tick_rate_hz = 0
+
     def __init__(self, context):
         super().__init__(context)
         self.display_queue = context["display_queue"]
         self.selection = 0
         self.app_count = 0
         self.valid_apps = []
+        
+        # Retained widgets: moving the selection only redraws the two icons involved
+        self.ui = context["create_widget_screen"]()
+        self.grid = None
+        self.icons = []
 
     def start(self):
         print("[Launcher] Started")
@@ -18,7 +26,12 @@ class App(AppBase):
         self.drawAllApps()
         
     def drawAllApps(self):
-        self.display_queue.put(("clear_base_area", 0, 0, 128, 64))
+        if self.grid is not None:
+            self.ui.remove(self.grid)
+            self.grid = None
+        self.icons = []
+        # Take over the whole screen from whatever was shown before
+        self.ui.invalidate()
 
         icons = []
         for app in self.get_valid_apps():
@@ -27,6 +40,7 @@ class App(AppBase):
         self.app_count = len(icons)
 
         if self.app_count == 0:
+            self.ui.render()
             return
 
         # Assume consistent icon size
@@ -45,35 +59,32 @@ class App(AppBase):
         x_offset = (128 - total_grid_w) // 2
         y_offset = (64 - total_grid_h) // 2
 
+        self.grid = self.ui.add(Grid(x_offset, y_offset, cols, icon_w, icon_h, padding))
         for index, app in enumerate(icons):
-            col = index % cols
-            row = index // cols
-
-            x = x_offset + col * (icon_w + padding)
-            y = y_offset + row * (icon_h + padding)
+            self.icons.append(self.grid.add(Icon(0, 0, self.app_icon(index, app), masked=True)))
+        self.ui.render()
 
-            self.draw_app(index, app, x, y)
-
-    def draw_app(self, index, app, x, y):
+    def app_icon(self, index, app):
         if index == self.selection:
-            icon = app.get("icon_selected")
-        else:
-            icon = app.get("icon_normal")
-
-        if icon:
-            self.display_queue.put(("draw_base_image", icon, x, y))
+            return app.get("icon_selected")
+        return app.get("icon_normal")
 
+    def select(self, index):
+        apps = self.get_valid_apps()
+        previous = self.selection
+        self.selection = index
+        for i in (previous, index):
+            self.icons[i].image = self.app_icon(i, apps[i])
+        self.ui.render()
 
     def update(self):
         pass
     
     def onkeyup(self, keycode):
         if keycode == "KEY_LEFT" or keycode == "KEY_A":
-            self.selection = (self.selection - 1) % self.app_count
-            self.drawAllApps()
+            self.select((self.selection - 1) % self.app_count)
         elif keycode == "KEY_RIGHT" or keycode == "KEY_D":
-            self.selection = (self.selection + 1) % self.app_count
-            self.drawAllApps()
+            self.select((self.selection + 1) % self.app_count)
         elif keycode == "KEY_ENTER" or keycode == "KEY_SPACE":
             if self.app_count > 0:
                 # Swap to the selected app
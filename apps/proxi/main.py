@@ -3,8 +3,11 @@ from interfaces import AppBase
 import bisect
 import os
 from config.keymap import key_map, shift_key_map
+from text_entry import TextEntry
 
 class App(AppBase):
+    tick_rate_hz = 0
+
     def __init__(self, context):
         super().__init__(context)
         self.display_queue = context["display_queue"]
@@ -12,7 +15,14 @@ class App(AppBase):
         self.words = self.load_autocomplete_words(context["AUTOCOMPLETE_PATH"])
         self.autocomplete_words = self.load_autocomplete_words(context["AUTOCOMPLETE_PATH"])
         self.autocomplete_words.sort()
-        self.currentline = ""
+        
+        # Text field below the title, laid out like set_screen's body text
+        padding = 2
+        title_height = context["get_text_size"]("Input", context["fonts"]["small"])[1]
+        top = padding + title_height + padding
+        self.entry = TextEntry(context, 4, top, context["screen_width"] - 8, context["screen_height"] - top,
+                               suggest=self.get_autocomplete_suggestion)
+        self.editing = False  # True while the Input screen (rather than a message) is shown
         
     def load_autocomplete_words(self, filepath):
         words = []
@@ -45,16 +55,30 @@ class App(AppBase):
     def update(self):
         pass
     
+    def show_entry(self):
+        """Switch from a message screen to the Input screen"""
+        if not self.editing:
+            self.set_screen("Input", "")
+            self.entry.redraw()
+            self.editing = True
+
     def onkeyup(self, keycode):
         if keycode == 'KEY_ESC':
+            self.editing = False
             self.set_screen("Launcher", "Switching to Launcher...")
             self.context["app_manager"].swap_app_async("proxi", "launcher", update_rate_hz=20.0, delay=0.1)
         
         if keycode == 'KEY_TAB':
-            suggestion = self.get_autocomplete_suggestion(self.currentline)
+            self.show_entry()
+            suggestion = self.entry.suggestion
             if suggestion:
-                self.currentline += suggestion + ' '
-            self.set_screen("Input", self.currentline)
+                self.entry.insert(suggestion + ' ')
+            return
+
+        # Cursor keys, Backspace (Ctrl+Backspace deletes a word) and Delete
+        if keycode in ('KEY_LEFT', 'KEY_RIGHT', 'KEY_HOME', 'KEY_END', 'KEY_BACKSPACE', 'KEY_DELETE'):
+            self.show_entry()
+            self.entry.handle_key(keycode)
             return
 
         char = key_map.get(keycode, None)
@@ -62,25 +86,19 @@ class App(AppBase):
             return
 
         if keycode == 'KEY_ENTER':
-            old_line = self.currentline
-            self.context["run_tts"](self.currentline)
+            old_line = self.entry.text
+            # run_tts takes over the screen, so a failure goes back to a full Input screen
+            self.editing = False
+            self.context["run_tts"](old_line)
             cached_path = os.path.join(self.context["CACHE_DIR"], self.context["hash_text"](old_line) + ".raw")
             if os.path.exists(cached_path):
-                self.currentline = ""
+                self.entry.clear(redraw=False)
                 self.set_screen("Ready", "Ready for new input...")
             else:
-                self.set_screen("Input", old_line)
-        elif keycode == 'KEY_BACKSPACE':
-            self.currentline = self.currentline[:-1]
-            self.set_screen("Input", self.currentline)
+                self.show_entry()
         else:
-            self.currentline += char
-            suggestion = self.get_autocomplete_suggestion(self.currentline)
-            if not suggestion:
-                self.set_screen("Input", self.currentline)
-            else:
-                # Create custom display with suggestion background
-                self.set_screen("Input", self.currentline + f"[{suggestion}]")
+            self.show_entry()
+            self.entry.insert(char)
     
     def stop(self):
         print("[Proxi] Stopped")
@@ -4,6 +4,9 @@ import threading
 from PIL import Image, ImageDraw
 
 class App(AppBase):
+    # Only ticks while a test runs (see start_test)
+    tick_rate_hz = 0
+
     def __init__(self, context):
         super().__init__(context)
         self.display_queue = context["display_queue"]
@@ -14,7 +17,6 @@ class App(AppBase):
         self.frame_count = 0
         self.start_time = None
         self.last_time = None
-        self.last_update_time = 0  # Track last update time for rate limiting
         self.current_fps = 0
         self.average_fps = 0
         self.max_fps = 0
@@ -22,17 +24,18 @@ class App(AppBase):
         self.fps_history = []
         self.test_running = False
         self.test_duration = 5.0  # Test for 5 seconds
-        self.max_update_rate = 60.0  # Limit to 60 FPS max for reasonable testing
+        self.max_update_rate = 60.0  # Test rate (update() ticks per second)
         
         # Visual elements
         self.flash_state = False
 
     def start(self):
-        self.display_queue.put(("clear_base",))
         self.show_instructions()
 
     def show_instructions(self):
         font = self.context["fonts"]["small"]
+        self.display_queue.put(("begin_frame",))
+        self.display_queue.put(("clear_base",))
         
         instructions = [
             "Refresh Rate Test",
@@ -52,20 +55,22 @@ class App(AppBase):
                 x_pos = (self.width - text_width) // 2
                 self.display_queue.put(("draw_base_text", font, line, x_pos, y_offset))
             y_offset += text_height + 2
+        self.display_queue.put(("commit_frame",))
 
     def start_test(self):
         self.test_running = True
         self.frame_count = 0
         self.start_time = time.time()
         self.last_time = self.start_time
-        self.last_update_time = 0  # Reset rate limiting
         self.fps_history = []
         self.max_fps = 0
         self.min_fps = float('inf')
         self.display_queue.put(("clear_base",))
+        self.set_tick_rate(self.max_update_rate)
 
     def stop_test(self):
         self.test_running = False
+        self.set_tick_rate(0)
         if self.fps_history:
             self.average_fps = sum(self.fps_history) / len(self.fps_history)
         self.show_results()
@@ -73,6 +78,7 @@ class App(AppBase):
     def show_results(self):
         font_small = self.context["fonts"]["small"]
         
+        self.display_queue.put(("begin_frame",))
         self.display_queue.put(("clear_base",))
         
         y_offset = 2
@@ -102,6 +108,7 @@ class App(AppBase):
                 x_pos = (self.width - text_width) // 2
                 self.display_queue.put(("draw_base_text", font_small, result, x_pos, y_offset))
             y_offset += text_height + 2
+        self.display_queue.put(("commit_frame",))
 
     def update(self):
         if not self.test_running:
@@ -109,11 +116,6 @@ class App(AppBase):
             
         current_time = time.time()
         
-        # Rate limiting to prevent overwhelming the system
-        if current_time - self.last_update_time < (1.0 / self.max_update_rate):
-            return
-        self.last_update_time = current_time
-        
         if self.start_time is None:
             self.start_time = current_time
             self.last_time = current_time
@@ -135,15 +137,15 @@ class App(AppBase):
         # Toggle flash state for visual feedback
         self.flash_state = not self.flash_state
         
-        # Clear and draw current state
-        self.display_queue.put(("clear_base",))
+        # Draw the whole state as one frame
+        self.display_queue.put(("begin_frame",))
         
         # Create and draw background image with flashing effect
         bg_color = 1 if self.flash_state else 0  # Use 1 (white) or 0 (black) for monochrome display
         
         # Create and draw background image
         bg_img = Image.new("1", (self.width, self.height), bg_color)
-        self.display_queue.put(("draw_base_image", bg_img, 0, 0))
+        self.display_queue.put(("replace_base_image", bg_img))
         
         # Draw frame counter and FPS info on top of the background
         font_small = self.context["fonts"]["small"]
@@ -170,27 +172,23 @@ class App(AppBase):
         self.display_queue.put(("draw_base_text", font_small, progress_text,
                                (self.width - progress_width) // 2,
                                (self.height - progress_height) // 2 + 60))
+        self.display_queue.put(("commit_frame",))
         
         # Auto-stop after test duration
         if elapsed >= self.test_duration:
             self.stop_test()
             return
-            
-        # Small delay to prevent overwhelming the system and blocking input
-        time.sleep(0.001)  # 1ms delay to allow input processing
 
     def reset_stats(self):
         self.frame_count = 0
         self.start_time = None
         self.last_time = None
-        self.last_update_time = 0  # Reset rate limiting
         self.current_fps = 0
         self.average_fps = 0
         self.max_fps = 0
         self.min_fps = float('inf')
         self.fps_history = []
         self.test_running = False
-        self.display_queue.put(("clear_base",))
         self.show_instructions()
 
     def onkeyup(self, keycode):
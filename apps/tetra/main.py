@@ -1,15 +1,20 @@
 from interfaces import AppBase
 import random
 import time
-from PIL import Image, ImageDraw
+import numpy as np
 
 class App(AppBase):
+    # Game loop: update(dt) every 50ms of real time, however late the thread wakes
+    fixed_step = 0.05
+
     def __init__(self, context):
         super().__init__(context)
         self.display_queue = context["display_queue"]
         self.play_sfx = context["audio"]["play_sfx"]
         self.run_tts = context["run_tts"]
         self.path = context["app_path"]
+        # Drawn into directly and presented once per frame
+        self.canvas = context["create_canvas"]()
         
         # Game constants
         self.GRID_WIDTH = 10
@@ -63,6 +68,7 @@ class App(AppBase):
                 [0, 0, 0, 0]
             ]
         }
+        self.SHAPES = {key: np.array(shape, dtype=bool) for key, shape in self.SHAPES.items()}
         
         # Game states
         self.PLAYING = 0
@@ -72,9 +78,9 @@ class App(AppBase):
         # Initialize game
         self.reset_game()
         
-        # Timing
-        self.drop_timer = 0
-        self.drop_interval = 20  # Drop every 20 ticks initially
+        # Timing (seconds)
+        self.drop_timer = 0.0
+        self.drop_interval = 1.0  # Drop once a second initially
         self.fast_drop_active = False  # Track if fast drop is active
         
         # Performance optimization
@@ -83,14 +89,14 @@ class App(AppBase):
     def reset_game(self):
         """Reset the game to initial state"""
         # Initialize empty grid
-        self.grid = [[0 for _ in range(self.GRID_WIDTH)] for _ in range(self.GRID_HEIGHT)]
+        self.grid = np.zeros((self.GRID_HEIGHT, self.GRID_WIDTH), dtype=bool)
         
         # Game state
         self.score = 0
         self.lines_cleared = 0
         self.level = 1
         self.state = self.PLAYING
-        self.drop_timer = 0
+        self.drop_timer = 0.0
         self.fast_drop_active = False  # Reset fast drop state
         self.needs_redraw = True  # Force redraw after reset
         
@@ -110,15 +116,7 @@ class App(AppBase):
         
     def rotate_piece(self, piece):
         """Rotate a piece 90 degrees clockwise"""
-        shape = piece['shape']
-        # Transpose and reverse each row
-        rotated = []
-        for i in range(4):
-            row = []
-            for j in range(4):
-                row.append(shape[3-j][i])
-            rotated.append(row)
-        return rotated
+        return np.rot90(piece['shape'], -1)
         
     def is_valid_position(self, piece, dx=0, dy=0, shape=None):
         """Check if a piece position is valid"""
@@ -136,7 +134,7 @@ class App(AppBase):
                         return False
                     
                     # Check collision with placed pieces (ignore if above grid)
-                    if new_y >= 0 and self.grid[new_y][new_x]:
+                    if new_y >= 0 and self.grid[new_y, new_x]:
                         return False
                         
         return True
@@ -149,25 +147,20 @@ class App(AppBase):
                     grid_x = piece['x'] + x
                     grid_y = piece['y'] + y
                     if 0 <= grid_y < self.GRID_HEIGHT and 0 <= grid_x < self.GRID_WIDTH:
-                        self.grid[grid_y][grid_x] = 1
+                        self.grid[grid_y, grid_x] = True
                         
     def clear_lines(self):
         """Clear completed lines and return the number cleared"""
-        lines_to_clear = []
-        
         # Find completed lines
-        for y in range(self.GRID_HEIGHT):
-            if all(self.grid[y][x] for x in range(self.GRID_WIDTH)):
-                lines_to_clear.append(y)
+        completed = self.grid.all(axis=1)
+        lines_count = int(completed.sum())
                 
-        # Remove completed lines
-        for y in lines_to_clear:
-            del self.grid[y]
-            self.grid.insert(0, [0 for _ in range(self.GRID_WIDTH)])
+        # Remove completed lines, shifting the rest down
+        if lines_count:
+            self.grid = np.vstack((np.zeros((lines_count, self.GRID_WIDTH), dtype=bool), self.grid[~completed]))
             
         # Update score and level
-        if lines_to_clear:
-            lines_count = len(lines_to_clear)
+        if lines_count:
             self.lines_cleared += lines_count
             
             # Score based on lines cleared at once
@@ -178,23 +171,25 @@ class App(AppBase):
             new_level = (self.lines_cleared // 10) + 1
             if new_level > self.level:
                 self.level = new_level
-                self.drop_interval = max(2, 20 - (self.level - 1) * 2)  # Speed up
+                self.drop_interval = max(0.1, 1.0 - (self.level - 1) * 0.1)  # Speed up
                 self.play_sfx(self.path + "level_up.wav")
                 self.run_tts(f"Level {self.level}!", background=True)
                 
-        return len(lines_to_clear)
+        return lines_count
         
     def start(self):
         """Called when the app starts"""
         self.needs_redraw = True
         
-    def update(self):
+    def update(self, dt):
         if self.state == self.PLAYING:
-            self.drop_timer += 1
-            if self.drop_timer >= self.drop_interval:
-                self.drop_timer = 0
+            self.drop_timer += dt
+            # Allow for float rounding in the summed steps (20 x 0.05 is not exactly 1.0)
+            if self.drop_timer >= self.drop_interval - 1e-9:
+                self.drop_timer = 0.0
                 self.drop_piece()
                 
+    def render(self, alpha):
         # Only redraw when necessary
         if self.needs_redraw and self.state == self.PLAYING:
             self.draw_game()
@@ -238,88 +233,58 @@ class App(AppBase):
         
     # this should definitely only draw the game itself and not the UI since that update less...
     def draw_game(self):
-        img = Image.new("1", (128, 64), 0)
-        draw = ImageDraw.Draw(img)
+        canvas = self.canvas
+        canvas.clear()
         
         # Draw grid border
         border_x1 = self.GRID_OFFSET_X - 1
         border_y1 = self.GRID_OFFSET_Y - 1
         border_x2 = self.GRID_OFFSET_X + self.GRID_WIDTH * self.CELL_SIZE
         border_y2 = self.GRID_OFFSET_Y + self.GRID_HEIGHT * self.CELL_SIZE
-        draw.rectangle([border_x1, border_y1, border_x2, border_y2], outline=1, fill=0)
-        
-        # Collect all filled cells for batch drawing
-        filled_cells = []
+        canvas.rect_outline(border_x1, border_y1, border_x2, border_y2)
         
-        # Add placed pieces
-        for y in range(self.GRID_HEIGHT):
-            for x in range(self.GRID_WIDTH):
-                if self.grid[y][x]:
-                    filled_cells.append((x, y))
-        
-        # Add current piece
+        # Placed pieces plus the current piece, clipped to the visible area
+        cells = self.grid.copy()
         if self.current_piece:
-            for y in range(4):
-                for x in range(4):
-                    if self.current_piece['shape'][y][x]:
-                        grid_x = self.current_piece['x'] + x
-                        grid_y = self.current_piece['y'] + y
-                        
-                        # Only add if within visible area
-                        if (0 <= grid_x < self.GRID_WIDTH and 
-                            grid_y >= 0 and grid_y < self.GRID_HEIGHT):
-                            filled_cells.append((grid_x, grid_y))
-        
-        # Draw all filled cells in one go
-        for x, y in filled_cells:
-            pixel_x = self.GRID_OFFSET_X + x * self.CELL_SIZE
-            pixel_y = self.GRID_OFFSET_Y + y * self.CELL_SIZE
-            draw.rectangle([pixel_x, pixel_y, 
-                          pixel_x + self.CELL_SIZE - 1, 
-                          pixel_y + self.CELL_SIZE - 1], fill=1)
+            ys, xs = np.nonzero(self.current_piece['shape'])
+            ys = ys + self.current_piece['y']
+            xs = xs + self.current_piece['x']
+            visible = (xs >= 0) & (xs < self.GRID_WIDTH) & (ys >= 0) & (ys < self.GRID_HEIGHT)
+            cells[ys[visible], xs[visible]] = True
+        
+        # Draw all cells in one go
+        canvas.blit_cells(cells, self.GRID_OFFSET_X, self.GRID_OFFSET_Y, self.CELL_SIZE)
         
         # Draw score and level (right side)
         font = self.context["fonts"]["small"]
         score_x = self.GRID_OFFSET_X + self.GRID_WIDTH * self.CELL_SIZE + 3
         
-        score_text = f"Score:"
-        draw.text((score_x, 5), score_text, font=font, fill=1)
-        score_value = f"{self.score}"
-        draw.text((score_x, 12), score_value, font=font, fill=1)
+        canvas.draw_text(font, "Score:", score_x, 5)
+        canvas.draw_text(font, f"{self.score}", score_x, 12)
         
-        level_text = f"Level:"
-        draw.text((score_x, 22), level_text, font=font, fill=1)
-        level_value = f"{self.level}"
-        draw.text((score_x, 29), level_value, font=font, fill=1)
+        canvas.draw_text(font, "Level:", score_x, 22)
+        canvas.draw_text(font, f"{self.level}", score_x, 29)
         
-        lines_text = f"Lines:"
-        draw.text((score_x, 39), lines_text, font=font, fill=1)
-        lines_value = f"{self.lines_cleared}"
-        draw.text((score_x, 46), lines_value, font=font, fill=1)
+        canvas.draw_text(font, "Lines:", score_x, 39)
+        canvas.draw_text(font, f"{self.lines_cleared}", score_x, 46)
         
         # Draw next piece preview (left side)
         next_y = 5
         next_text = "Next:"
-        width = draw.textlength(next_text, font=font)
+        width = font.getlength(next_text)
         next_x = border_x1 - width - 1
-        draw.text((next_x, next_y), next_text, font=font, fill=1)
+        canvas.draw_text(font, next_text, next_x, next_y)
         
         # Draw next piece
         if self.next_piece:
-            for y in range(4):
-                for x in range(4):
-                    if self.next_piece['shape'][y][x]:
-                        pixel_x = next_x + x * 2
-                        pixel_y = next_y + 8 + y * 2
-                        draw.rectangle([pixel_x, pixel_y, pixel_x + 1, pixel_y + 1], fill=1)
+            canvas.blit_cells(self.next_piece['shape'], next_x, next_y + 8, 2)
 
         # Send to display
-        self.display_queue.put(("clear_base",))
-        self.display_queue.put(("draw_base_image", img, 0, 0))
+        canvas.present()
         
     def draw_game_over(self):
-        img = Image.new("1", (128, 64), 0)
-        draw = ImageDraw.Draw(img)
+        canvas = self.canvas
+        canvas.clear()
         
         font = self.context["fonts"]["bold"]
         small_font = self.context["fonts"]["default"]
@@ -329,29 +294,28 @@ class App(AppBase):
         # Game Over text
         game_over_text = "GAME OVER"
         text_width, text_height = self.context["get_text_size"](game_over_text, font)
-        draw.text((64 - text_width/2, y), game_over_text, font=font, fill=1)
+        canvas.draw_text(font, game_over_text, 64 - text_width/2, y)
         y += text_height + 2
         
         # Score
         score_text = f"Score: {self.score}"
         score_width, score_height = self.context["get_text_size"](score_text, small_font)
-        draw.text((64 - score_width/2, y), score_text, font=small_font, fill=1)
+        canvas.draw_text(small_font, score_text, 64 - score_width/2, y)
         y += score_height + 2
         
         # Level
         level_text = f"Level: {self.level} / {self.lines_cleared}"
         level_width, level_height = self.context["get_text_size"](level_text, small_font)
-        draw.text((64 - level_width/2, y), level_text, font=small_font, fill=1)
+        canvas.draw_text(small_font, level_text, 64 - level_width/2, y)
         y += level_height + 2
         
         # Instructions
         restart_text = "R: Retry / ESC: Exit"
         restart_width, restart_height = self.context["get_text_size"](restart_text, small_font)
-        draw.text((64 - restart_width/2, y), restart_text, font=small_font, fill=1)
+        canvas.draw_text(small_font, restart_text, 64 - restart_width/2, y)
         
         # Send to display
-        self.display_queue.put(("clear_base",))
-        self.display_queue.put(("draw_base_image", img, 0, 0))
+        canvas.present()
         
     def onkeyup(self, keycode):
         if self.state == self.PLAYING:
@@ -0,0 +1,206 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+
+class PlaybackRecord:
+    """
+    Timing for a single sound request, from the play_sfx/run_tts call to the
+    last block written to the output engine.
+
+    Lead is measured on the writer's side: the audio written so far minus the
+    wall time since the first write. Writes into aplay's pipe return as soon as
+    the pipe has room, so it is not the device's buffer fill. A write that
+    finds the lead below zero (Python fell behind realtime) counts as a late
+    write. Underruns are the xruns reported by the output engine itself (aplay's
+    "underrun!!!" messages).
+    """
+
+    def __init__(self, kind: str, label: str, requested_at: float, duration: Optional[float] = None):
+        self.kind = kind
+        self.label = label
+        self.requested_at = requested_at
+        self.duration = duration  # Length of the clip in seconds, when known up front
+        self.first_write_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.bytes_written = 0
+        self.seconds_written = 0.0
+        self.underruns = 0
+        self.late_writes = 0
+        self.lead_min_ms: Optional[float] = None
+        self.lead_max_ms = 0.0
+        self._lead_total_ms = 0.0
+        self._lead_samples = 0
+
+    @property
+    def start_latency_ms(self) -> Optional[float]:
+        if self.first_write_at is None:
+            return None
+        return (self.first_write_at - self.requested_at) * 1000.0
+
+    @property
+    def lead_avg_ms(self) -> Optional[float]:
+        if not self._lead_samples:
+            return None
+        return self._lead_total_ms / self._lead_samples
+
+    def position(self, now: Optional[float] = None) -> float:
+        """
+        Seconds of the clip heard so far: wall time since the first write, never
+        ahead of the audio actually written.
+        """
+        if self.first_write_at is None:
+            return 0.0
+        if self.finished_at is not None:
+            return self.seconds_written
+        now = time.monotonic() if now is None else now
+        return max(0.0, min(now - self.first_write_at, self.seconds_written))
+
+    def progress(self, now: Optional[float] = None) -> Optional[float]:
+        """Fraction of the clip heard so far (0-1), or None if the duration is unknown."""
+        if not self.duration:
+            return None
+        return min(1.0, self.position(now) / self.duration)
+
+    def before_write(self, now: Optional[float] = None) -> None:
+        """Call right before a block is handed to the output engine."""
+        now = time.monotonic() if now is None else now
+        if self.first_write_at is None:
+            self.first_write_at = now
+            return
+
+        lead_ms = (self.seconds_written - (now - self.first_write_at)) * 1000.0
+        if lead_ms < 0:
+            self.late_writes += 1
+        lead_ms = max(0.0, lead_ms)
+        self.lead_min_ms = lead_ms if self.lead_min_ms is None else min(self.lead_min_ms, lead_ms)
+        self.lead_max_ms = max(self.lead_max_ms, lead_ms)
+        self._lead_total_ms += lead_ms
+        self._lead_samples += 1
+
+    def after_write(self, nbytes: int, byte_rate: int) -> None:
+        """Call once a block has been accepted by the output engine."""
+        self.bytes_written += nbytes
+        if byte_rate > 0:
+            self.seconds_written += nbytes / byte_rate
+
+    def device_underrun(self) -> None:
+        """Call when the output engine reports an underrun (xrun) during this request."""
+        self.underruns += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "label": self.label,
+            "start_latency_ms": self.start_latency_ms,
+            "duration_s": self.seconds_written,
+            "bytes_written": self.bytes_written,
+            "lead_min_ms": self.lead_min_ms,
+            "lead_avg_ms": self.lead_avg_ms,
+            "lead_max_ms": self.lead_max_ms,
+            "late_writes": self.late_writes,
+            "underruns": self.underruns,
+        }
+
+
+class AudioStats:
+    """
+    Collects PlaybackRecords for recent sound requests and summarises them.
+    Summaries are available on demand and can be logged periodically.
+    """
+
+    def __init__(self, history: int = 128):
+        self._records: deque = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._total_requests = 0
+        self._total_underruns = 0
+        self._logged_requests = 0
+        self._log_thread: Optional[threading.Thread] = None
+
+    def begin(self, kind: str, label: str, requested_at: Optional[float] = None,
+              duration: Optional[float] = None) -> PlaybackRecord:
+        """Create a record for a request made at requested_at (time.monotonic())."""
+        record = PlaybackRecord(kind, label, time.monotonic() if requested_at is None else requested_at, duration)
+        with self._lock:
+            self._records.append(record)
+            self._total_requests += 1
+        return record
+
+    def finish(self, record: PlaybackRecord) -> None:
+        record.finished_at = time.monotonic()
+        with self._lock:
+            self._total_underruns += record.underruns
+
+    def playing(self, kind: Optional[str] = None) -> Optional[PlaybackRecord]:
+        """The newest unfinished record (of kind, if given), or None."""
+        with self._lock:
+            for record in reversed(self._records):
+                if record.finished_at is None and (kind is None or record.kind == kind):
+                    return record
+        return None
+
+    def recent(self, count: int = 10) -> List[Dict[str, Any]]:
+        """Return the most recent records as dicts, newest last."""
+        with self._lock:
+            records = list(self._records)[-count:]
+        return [record.as_dict() for record in records]
+
+    def summary(self, kind: Optional[str] = None) -> Dict[str, Any]:
+        """Latency percentiles, writer lead, late writes and underruns over the recorded history."""
+        with self._lock:
+            records = [r for r in self._records if kind is None or r.kind == kind]
+            total_requests = self._total_requests
+            total_underruns = self._total_underruns
+
+        latencies = sorted(r.start_latency_ms for r in records if r.start_latency_ms is not None)
+        lead_mins = [r.lead_min_ms for r in records if r.lead_min_ms is not None]
+        lead_avgs = [r.lead_avg_ms for r in records if r.lead_avg_ms is not None]
+
+        return {
+            "requests": len(records),
+            "total_requests": total_requests,
+            "latency_p50_ms": _percentile(latencies, 50),
+            "latency_p95_ms": _percentile(latencies, 95),
+            "latency_max_ms": latencies[-1] if latencies else None,
+            "lead_min_ms": min(lead_mins) if lead_mins else None,
+            "lead_avg_ms": sum(lead_avgs) / len(lead_avgs) if lead_avgs else None,
+            "late_writes": sum(r.late_writes for r in records),
+            "underruns": sum(r.underruns for r in records),
+            "total_underruns": total_underruns,
+        }
+
+    def format_summary(self) -> str:
+        s = self.summary()
+
+        def ms(value):
+            return "n/a" if value is None else f"{value:.0f}ms"
+
+        return (f"{s['requests']} requests, start latency p50 {ms(s['latency_p50_ms'])} "
+                f"p95 {ms(s['latency_p95_ms'])} max {ms(s['latency_max_ms'])}, "
+                f"writer lead min {ms(s['lead_min_ms'])} avg {ms(s['lead_avg_ms'])}, "
+                f"late writes {s['late_writes']}, underruns {s['underruns']}")
+
+    def start_logging(self, interval: float = 60.0) -> None:
+        """Log a summary every interval seconds, skipping intervals with no new requests."""
+        if self._log_thread and self._log_thread.is_alive():
+            return
+
+        def log_loop():
+            while True:
+                time.sleep(interval)
+                with self._lock:
+                    new_requests = self._total_requests - self._logged_requests
+                    self._logged_requests = self._total_requests
+                if new_requests:
+                    print(f"[Audio] {self.format_summary()}", flush=True)
+
+        self._log_thread = threading.Thread(target=log_loop, daemon=True, name="AudioStatsLog")
+        self._log_thread.start()
+
+
+def _percentile(sorted_values: List[float], percent: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round((percent / 100.0) * (len(sorted_values) - 1))))
+    return sorted_values[index]
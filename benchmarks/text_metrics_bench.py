@@ -0,0 +1,79 @@
+"""
+Compare the old get_text_size (new image + textbbox per call) with the glyph
+metrics cache on the proxi typing path: every keystroke re-runs set_screen,
+which measures the title, a space and each word of the line typed so far.
+
+    python benchmarks/text_metrics_bench.py [repeats]
+"""
+import os
+import sys
+import time
+
+from PIL import Image, ImageDraw, ImageFont
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from text_metrics import TextMetrics  # noqa: E402
+
+SENTENCES = [
+    "hello how are you today",
+    "can you please bring me a glass of water",
+    "I would like to go outside for a walk in the garden this afternoon",
+    "thank you [very] much",
+]
+
+
+def legacy_get_text_size(text, font):
+    """get_text_size as it was before the glyph cache"""
+    if not text:
+        return 0, 0
+    temp_img = Image.new("1", (1, 1))
+    temp_draw = ImageDraw.Draw(temp_img)
+    bbox = temp_draw.textbbox((0, 0), text, font=font)
+    return bbox[2] - bbox[0], bbox[3] - bbox[1]
+
+
+def typing_calls(sentence):
+    """The get_text_size calls set_screen makes for each prefix typed"""
+    calls = []
+    for end in range(1, len(sentence) + 1):
+        line = sentence[:end]
+        calls.append("Input")
+        for word in line.split(" "):
+            calls.append(" ")
+            calls.append(word)
+        calls.append(line.split(" ")[-1])  # cursor position on the last line
+    return calls
+
+
+def run(measure, font, calls, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for text in calls:
+            measure(text, font)
+    return time.perf_counter() - start
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    fonts = {
+        "small": ImageFont.truetype(os.path.join(ROOT, "assets", "pixel.ttf"), 4),
+        "default": ImageFont.truetype(os.path.join(ROOT, "assets", "DejaVuSans.ttf"), 12),
+    }
+    calls = [text for sentence in SENTENCES for text in typing_calls(sentence)]
+
+    for name, font in fonts.items():
+        metrics = TextMetrics()
+        mismatches = sum(metrics.size(text, font) != legacy_get_text_size(text, font) for text in calls)
+        legacy = run(legacy_get_text_size, font, calls, repeats)
+        cached = run(metrics.size, font, calls, repeats)
+        n = len(calls) * repeats
+        print(f"[Bench] {name}: {n} calls, legacy {legacy / n * 1e6:.1f}us/call, "
+              f"cached {cached / n * 1e6:.1f}us/call ({legacy / cached:.1f}x), mismatches {mismatches}",
+              flush=True)
+        print(f"[Bench] {name}: {metrics.stats()}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import hashlib
+import math
+import os
+import sys
+
+import numpy as np
+
+from framebuffer import rasterize_text
+
+# Printable ASCII and Latin-1
+DEFAULT_CHARS = "".join(chr(c) for c in range(32, 127)) + "".join(chr(c) for c in range(160, 256))
+
+
+class BitmapFont:
+    """
+    A TTF font pre-rasterized to 1-bit glyphs, for small pixel fonts such as
+    pixel.ttf at size 4 where FreeType would otherwise run on every draw.
+
+    Every glyph is a cell exactly one advance wide in a single atlas
+    (rows x columns bool array). A string is the concatenation of its glyph
+    cells, so rendering is one column gather from the atlas. The output matches
+    ImageDraw.text on a mode "1" image pixel for pixel, including how FreeType
+    snaps fractional positions. Only fonts without kerning qualify. Glyphs
+    whose ink overhangs their cell are left out, and text using them is drawn
+    through FreeType as before.
+    """
+
+    def __init__(self, atlas, top, chars, starts, advances, source=""):
+        self.atlas = atlas
+        self.top = int(top)  # Atlas row 0 relative to the text origin
+        self.source = source
+        self._columns = {char: np.arange(start, start + advance)
+                         for char, start, advance in zip(chars, starts.tolist(), advances.tolist())}
+        self._advances = dict(zip(chars, advances.tolist()))
+        self._chars = frozenset(chars)
+
+    @classmethod
+    def compile(cls, font, chars=DEFAULT_CHARS):
+        """Rasterize chars with a PIL FreeTypeFont"""
+        cells = []
+        for char in chars:
+            advance = font.getlength(char, mode="1")
+            if advance != int(advance):
+                continue
+            glyph = rasterize_text(font, char)
+            if glyph is None:
+                xs = ys = np.zeros(0, dtype=int)
+            else:
+                bits, gx, gy = glyph
+                ys, xs = np.nonzero(bits)
+                xs, ys = xs + gx, ys + gy
+                if xs.min() < 0 or xs.max() >= advance:
+                    continue  # Overhangs its cell
+            cells.append((char, int(advance), xs, ys))
+
+        inked = [ys for _, _, _, ys in cells if len(ys)]
+        top = min(int(ys.min()) for ys in inked) if inked else 0
+        bottom = max(int(ys.max()) + 1 for ys in inked) if inked else 0
+        advances = np.array([advance for _, advance, _, _ in cells], dtype=np.int32)
+        starts = np.concatenate(([0], np.cumsum(advances)[:-1])).astype(np.int32)
+        atlas = np.zeros((bottom - top, int(advances.sum())), dtype=bool)
+        for (char, advance, xs, ys), start in zip(cells, starts):
+            atlas[ys - top, xs + start] = True
+        return cls(atlas, top, "".join(char for char, _, _, _ in cells), starts, advances, font_fingerprint(font))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data["atlas"], data["top"], str(data["chars"]), data["starts"], data["advances"],
+                       str(data["source"]))
+
+    def save(self, path):
+        chars = "".join(self._columns)
+        starts = np.array([columns[0] if len(columns) else 0 for columns in self._columns.values()], dtype=np.int32)
+        advances = np.array([self._advances[char] for char in chars], dtype=np.int32)
+        with open(path, "wb") as f:
+            np.savez_compressed(f, atlas=self.atlas, top=self.top, chars=np.array(chars),
+                                starts=starts, advances=advances, source=np.array(self.source))
+
+    def covers(self, text):
+        return self._chars.issuperset(text)
+
+    def getlength(self, text):
+        return sum(self._advances[char] for char in text)
+
+    def text_bits(self, text, x=0, y=0):
+        """Same contract as framebuffer.text_bits; every char must be covered"""
+        if not text or not self.atlas.size:
+            return None
+        bits = self.atlas[:, np.concatenate([self._columns[char] for char in text])]
+        if not bits.any():
+            return None
+        # FreeType places the origin on the 1/64 pixel grid, x rounding half up and y half down
+        return bits, (math.floor(x * 64) + 32) >> 6, ((math.floor(y * 64) + 31) >> 6) + self.top
+
+
+def font_fingerprint(font):
+    """Identifies a TTF file and size, to tell whether a saved bitmap font is stale"""
+    with open(font.path, "rb") as f:
+        digest = hashlib.sha1(f.read()).hexdigest()
+    return f"{os.path.basename(font.path)}:{font.size}:{digest}"
+
+
+def load_or_compile(font, path):
+    """Load the bitmap font saved at path if it was compiled from font, else compile and save it"""
+    fingerprint = font_fingerprint(font)
+    if os.path.isfile(path):
+        try:
+            bitmap = BitmapFont.load(path)
+            if bitmap.source == fingerprint:
+                return bitmap
+            print(f"[Font] {path} is stale, recompiling", flush=True)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[Font] Could not load {path}: {e}", flush=True)
+
+    bitmap = BitmapFont.compile(font)
+    try:
+        bitmap.save(path)
+    except OSError as e:
+        print(f"[Font] Could not save {path}: {e}", flush=True)
+    return bitmap
+
+
+if __name__ == "__main__":
+    # python bitmap_font.py assets/pixel.ttf 4 assets/pixel_4.npz
+    from PIL import ImageFont
+
+    ttf, size, out = sys.argv[1], int(sys.argv[2]), sys.argv[3]
+    compiled = BitmapFont.compile(ImageFont.truetype(ttf, size))
+    compiled.save(out)
+    print(f"[Font] {len(compiled._chars)} glyphs, atlas {compiled.atlas.shape} -> {out}", flush=True)
@@ -0,0 +1,169 @@
+import queue
+import threading
+
+import numpy as np
+
+from framebuffer import combine, image_bits, text_bits
+
+PRESENT_TIMEOUT = 1.0  # Seconds to wait for room on a full display queue
+
+
+class Canvas:
+    """
+    A writable 1-bit pixel buffer an app draws into directly, for games and other
+    screens that redraw every frame.
+
+    pixels is a (height, width) bool NumPy array owned by the app; write to it
+    with slicing or the helpers below, then call present(). present() copies the
+    dirty region into a preallocated snapshot and queues a single present_canvas
+    command. The display thread packs only that region into the layer, so no
+    images are allocated per frame and the app never touches the live layer.
+    """
+
+    def __init__(self, display_queue, width, height, layer="base"):
+        self.display_queue = display_queue
+        self.width = width
+        self.height = height
+        self.layer = layer
+        # Overlay presents (volume bars, status) take the queue's priority lane
+        self._command = "present_overlay_canvas" if layer == "overlay" else "present_canvas"
+        self.pixels = np.zeros((height, width), dtype=bool)
+
+        self._snapshot = np.zeros_like(self.pixels)
+        self._lock = threading.Lock()
+        # Region written since the last present(), and region presented but not yet drawn
+        self._dirty = (0, 0, width, height)
+        self._presented = None
+
+    # --- Drawing --- #
+
+    def clear(self):
+        self.pixels.fill(False)
+        self.mark_dirty(0, 0, self.width, self.height)
+
+    def fill_rect(self, x0, y0, x1, y1, value=True):
+        """Fill the rectangle with inclusive corners (like ImageDraw.rectangle)"""
+        x0, y0 = max(0, int(x0)), max(0, int(y0))
+        x1, y1 = min(self.width, int(x1) + 1), min(self.height, int(y1) + 1)
+        if x0 < x1 and y0 < y1:
+            self.pixels[y0:y1, x0:x1] = value
+            self.mark_dirty(x0, y0, x1, y1)
+
+    def rect_outline(self, x0, y0, x1, y1, value=True):
+        """One pixel rectangle outline with inclusive corners"""
+        self.fill_rect(x0, y0, x1, y0, value)
+        self.fill_rect(x0, y1, x1, y1, value)
+        self.fill_rect(x0, y0, x0, y1, value)
+        self.fill_rect(x1, y0, x1, y1, value)
+
+    def blit_cells(self, cells, x, y, cell_size, cell_fill=None):
+        """
+        Draw a 2D grid of cells (bool array, rows x cols) with its top-left at (x, y),
+        each cell cell_size pixels square. Set cells are filled, clear cells are erased.
+
+        Uses one strided slice assignment per pixel offset inside a cell
+        (cell_size ** 2 assignments in total) instead of a rectangle per cell.
+        cell_fill optionally limits the drawn part of each cell, e.g. 2 for a
+        one-pixel gap between 3px cells.
+        """
+        cells = np.asarray(cells, dtype=bool)
+        rows, cols = cells.shape
+        x, y = int(x), int(y)
+        fill = cell_size if cell_fill is None else cell_fill
+        for dy in range(cell_size):
+            row_start, row_slice = self._strided(y + dy, rows, cell_size, self.height)
+            if row_slice is None:
+                continue
+            for dx in range(cell_size):
+                col_start, col_slice = self._strided(x + dx, cols, cell_size, self.width)
+                if col_slice is None:
+                    continue
+                target = self.pixels[row_start::cell_size, col_start::cell_size]
+                target = target[:row_slice.stop - row_slice.start, :col_slice.stop - col_slice.start]
+                target[...] = cells[row_slice, col_slice] if dy < fill and dx < fill else False
+        self.mark_dirty(x, y, x + cols * cell_size, y + rows * cell_size)
+
+    def draw_text(self, font, text, x, y, fill=True):
+        glyphs = text_bits(font, text, x, y)
+        if glyphs is None:
+            return
+        bits, gx, gy = glyphs
+        self.blit(bits, gx, gy, "or" if fill else "clear")
+
+    def blit(self, bits, x, y, op="or"):
+        """Combine a bool pixel array at (x, y); op as for Framebuffer.blit"""
+        combine(self.pixels, bits, x, y, op)
+        self.mark_dirty(x, y, x + bits.shape[1], y + bits.shape[0])
+
+    def paste(self, img, x, y, masked=True):
+        """Draw a PIL image; masked pastes only turn pixels on, unmasked ones replace the area"""
+        self.blit(image_bits(img), x, y, "or" if masked else "copy")
+
+    # --- Presenting --- #
+
+    def mark_dirty(self, x0, y0, x1, y1):
+        """Add a half-open region written directly through pixels to the next present()"""
+        x0, y0 = max(0, int(x0)), max(0, int(y0))
+        x1, y1 = min(self.width, int(x1)), min(self.height, int(y1))
+        if x0 >= x1 or y0 >= y1:
+            return
+        self._dirty = _union(self._dirty, (x0, y0, x1, y1))
+
+    def present(self, region=None):
+        """
+        Show what has been drawn. region (x0, y0, x1, y1, half-open) adds to the
+        area marked by the drawing helpers; with neither, the whole canvas is sent.
+        """
+        if region is not None:
+            self.mark_dirty(*region)
+        dirty = self._dirty or (0, 0, self.width, self.height)
+        self._dirty = None
+
+        x0, y0, x1, y1 = dirty
+        with self._lock:
+            self._snapshot[y0:y1, x0:x1] = self.pixels[y0:y1, x0:x1]
+            pending = self._presented is not None
+            self._presented = _union(self._presented, dirty)
+        # One queued command covers any number of presents until the display thread draws it
+        if not pending:
+            try:
+                self.display_queue.put((self._command, self), timeout=PRESENT_TIMEOUT)
+            except queue.Full:
+                # Dropped: send the region again with the next present
+                with self._lock:
+                    region, self._presented = self._presented, None
+                if region is not None:
+                    self.mark_dirty(*region)
+
+    def draw_to(self, layer):
+        """
+        Copy the presented region into a Framebuffer (called on the display thread).
+        Returns the region drawn (x0, y0, x1, y1, half-open), or None.
+        """
+        with self._lock:
+            region = self._presented
+            self._presented = None
+            if region is None:
+                return None
+            x0, y0, x1, y1 = region
+            layer.blit(self._snapshot[y0:y1, x0:x1], x0, y0, "copy")
+        return region
+
+    @staticmethod
+    def _strided(start, count, step, limit):
+        """First on-screen index and source slice for count items placed every step pixels from start"""
+        first = 0
+        if start < 0:
+            first = -start // step + (1 if -start % step else 0)
+        last = min(count, (limit - start + step - 1) // step) if start < limit else 0
+        if first >= last:
+            return None, None
+        return start + first * step, slice(first, last)
+
+
+def _union(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])
@@ -0,0 +1,205 @@
+import queue
+import threading
+import time
+from collections import deque
+
+# Commands that only touch the overlay layer (volume bars, status icons) jump the queue
+PRIORITY_COMMANDS = {
+    "draw_overlay_text", "draw_overlay_image", "clear_overlay_area",
+    "draw_overlay_rects", "draw_overlay_pixels", "draw_overlay_lines", "draw_overlay_texts",
+    "toggle_overlay_area", "present_overlay_canvas",
+}
+
+# Commands that draw onto a layer, and the commands that overwrite that whole layer.
+# A queued full-layer command makes every earlier undrawn draw on the same layer pointless.
+LAYER_COMMANDS = {
+    "draw_base_text": "base",
+    "draw_base_image": "base",
+    "clear_base_area": "base",
+    "draw_base_rects": "base",
+    "draw_base_pixels": "base",
+    "draw_base_lines": "base",
+    "draw_base_texts": "base",
+    "toggle_base_area": "base",
+    "clear_base": "base",
+    "replace_base_image": "base",
+    "show_screen": "base",
+    "clear_base_2": "base_2",
+}
+FULL_LAYER_COMMANDS = {
+    "set_screen": "base",
+    "show_screen": "base",
+    "clear_base": "base",
+    "replace_base_image": "base",
+    "clear_base_2": "base_2",
+}
+
+
+class DisplayCommandQueue:
+    """
+    Bounded queue of display commands with the same put/get interface as queue.Queue.
+
+    - Queuing a full-layer command (e.g. replace_base_image) supersedes older undrawn
+      commands for that layer, so fast producers never build up a backlog of frames.
+    - Overlay commands go in a high-priority lane that is always drained first.
+    - When the queue is full, put() waits up to put_timeout seconds for the display
+      thread to catch up and then drops the command (raising queue.Full only for
+      non-blocking puts or an explicit timeout). The consumer thread itself never
+      blocks on put (it would wait on itself).
+    """
+
+    def __init__(self, maxsize=256, put_timeout=1.0):
+        self.maxsize = maxsize
+        self.put_timeout = put_timeout
+        self._priority = deque()
+        self._normal = deque()
+        # Queued entries per layer, so they can be superseded without a scan
+        self._layer_entries = {}
+        self._depth = 0
+        self._cond = threading.Condition()
+        self._consumer = None
+
+        # Accounting
+        self.put_count = 0
+        self.superseded = 0
+        self.dropped = 0
+        self.max_depth = 0
+
+    def put(self, cmd, block=True, timeout=None):
+        with self._cond:
+            if self._depth >= self.maxsize and threading.current_thread() is not self._consumer:
+                if block:
+                    deadline = time.monotonic() + (self.put_timeout if timeout is None else timeout)
+                    while self._depth >= self.maxsize:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0 or not self._cond.wait(remaining):
+                            break
+                if self._depth >= self.maxsize:
+                    self.dropped += 1
+                    print(f"[Display Queue] Full, dropping command: {cmd[0]}", flush=True)
+                    # Plain put() calls from apps never raise, like an unbounded queue.Queue
+                    if not block or timeout is not None:
+                        raise queue.Full
+                    return
+
+            self.put_count += 1
+            name = cmd[0]
+            if name in PRIORITY_COMMANDS:
+                self._priority.append(cmd)
+            else:
+                layer = FULL_LAYER_COMMANDS.get(name)
+                if layer is not None:
+                    self._supersede(layer)
+                # Entries are one-item lists so superseded commands can be blanked in place
+                entry = [cmd]
+                self._normal.append(entry)
+                layer = LAYER_COMMANDS.get(name)
+                if layer is not None:
+                    self._layer_entries.setdefault(layer, []).append(entry)
+
+            self._depth += 1
+            self.max_depth = max(self.max_depth, self._depth)
+            self._cond.notify_all()
+
+    def put_nowait(self, cmd):
+        self.put(cmd, block=False)
+
+    def get(self, block=True, timeout=None):
+        with self._cond:
+            self._consumer = threading.current_thread()
+            if block:
+                deadline = None if timeout is None else time.monotonic() + timeout
+                while not self._depth:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            if not self._depth:
+                raise queue.Empty
+
+            if self._priority:
+                cmd = self._priority.popleft()
+            else:
+                cmd = None
+                while cmd is None:
+                    entry = self._normal.popleft()
+                    cmd = entry[0]
+                layer = LAYER_COMMANDS.get(cmd[0])
+                if layer is not None:
+                    self._layer_entries[layer].remove(entry)
+
+            self._depth -= 1
+            self._cond.notify_all()
+            return cmd
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def drain(self, cmd, handle, frame_due):
+        """
+        Apply cmd with handle(), then every command that was queued behind it when the
+        drain started, so they land in one frame. Commands that arrive during the drain
+        are applied too until frame_due() says a frame should go out, so a producer
+        that keeps the queue busy delays a frame by one drain at most. Returns False
+        as soon as handle() does (an exit command).
+        """
+        backlog = self.qsize()
+        while cmd is not None:
+            if not handle(cmd):
+                return False
+            backlog -= 1
+            if backlog < 0 and frame_due():
+                break
+            try:
+                cmd = self.get_nowait()
+            except queue.Empty:
+                cmd = None
+        return True
+
+    def qsize(self):
+        with self._cond:
+            return self._depth
+
+    def empty(self):
+        return self.qsize() == 0
+
+    def stats(self):
+        """Current depth and lifetime put/supersede/drop counts"""
+        with self._cond:
+            return {
+                "depth": self._depth,
+                "priority_depth": len(self._priority),
+                "max_depth": self.max_depth,
+                "maxsize": self.maxsize,
+                "put": self.put_count,
+                "superseded": self.superseded,
+                "dropped": self.dropped,
+            }
+
+    def _supersede(self, layer):
+        entries = self._layer_entries.get(layer)
+        if not entries:
+            return
+        for entry in entries:
+            entry[0] = None
+        self.superseded += len(entries)
+        self._depth -= len(entries)
+        entries.clear()
+        self._collapse_empty_frames()
+        # Superseded entries are skipped by get(); compact them if the consumer is stalled
+        if len(self._normal) > 2 * self.maxsize:
+            self._normal = deque(entry for entry in self._normal if entry[0] is not None)
+
+    def _collapse_empty_frames(self):
+        """Drop queued begin_frame/commit_frame pairs left with nothing between them"""
+        kept = []
+        for entry in self._normal:
+            cmd = entry[0]
+            if cmd is None:
+                continue
+            if cmd[0] == "commit_frame" and kept and kept[-1][0][0] == "begin_frame":
+                kept.pop()[0] = None
+                entry[0] = None
+                self._depth -= 2
+                continue
+            kept.append(entry)
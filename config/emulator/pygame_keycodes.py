@@ -0,0 +1,48 @@
+# pygame.key.name() -> Linux KEY_* names, for keys whose name isn't just the
+# letter or digit (those become KEY_<NAME>)
+PYGAME_TO_LINUX_KEYCODE = {
+    'space': 'KEY_SPACE',
+    'tab': 'KEY_TAB',
+    'return': 'KEY_ENTER',
+    'enter': 'KEY_ENTER',  # Keypad enter
+    'backspace': 'KEY_BACKSPACE',
+    'delete': 'KEY_DELETE',
+    'escape': 'KEY_ESC',
+    'home': 'KEY_HOME',
+    'end': 'KEY_END',
+    'page up': 'KEY_PAGEUP',
+    'page down': 'KEY_PAGEDOWN',
+
+    '-': 'KEY_MINUS',
+    '=': 'KEY_EQUAL',
+    '[': 'KEY_LEFTBRACE',
+    ']': 'KEY_RIGHTBRACE',
+    ';': 'KEY_SEMICOLON',
+    "'": 'KEY_APOSTROPHE',
+    ',': 'KEY_COMMA',
+    '.': 'KEY_DOT',
+    '/': 'KEY_SLASH',
+    '`': 'KEY_GRAVE',
+    '\\': 'KEY_BACKSLASH',
+
+    # Modifiers
+    'left shift': 'KEY_LEFTSHIFT',
+    'right shift': 'KEY_LEFTSHIFT',
+    'left ctrl': 'KEY_LEFTCTRL',
+    'right ctrl': 'KEY_RIGHTCTRL',
+    'left alt': 'KEY_LEFTALT',
+    'right alt': 'KEY_RIGHTALT',
+
+    # arrow keys
+    'up': 'KEY_UP',
+    'down': 'KEY_DOWN',
+    'left': 'KEY_LEFT',
+    'right': 'KEY_RIGHT',
+
+    # Desktop stand-ins for the device keyboard's media keys
+    'f1': 'KEY_HOMEPAGE',
+    'f9': 'KEY_BRIGHTNESSDOWN',
+    'f10': 'KEY_BRIGHTNESSUP',
+    'f11': 'KEY_VOLUMEDOWN',
+    'f12': 'KEY_VOLUMEUP',
+}
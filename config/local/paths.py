@@ -0,0 +1,15 @@
+import os
+
+# Paths inside the checkout, for running on a development or build machine
+# (PROXITALK_DISPLAY=headless). Put the piper binary and voice model in piper/.
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PIPER_BIN = os.path.join(ROOT, "piper", "piper")
+MODEL_PATH = os.path.join(ROOT, "piper", "en_GB-cori-medium.onnx")
+CACHE_DIR = os.path.join(ROOT, "piper_cache")
+APPS_DIR = os.path.join(ROOT, "apps")
+ICON_DIR = os.path.join(ROOT, "assets", "icons")
+FONT_PATH = os.path.join(ROOT, "assets", "DejaVuSans.ttf")
+FONT_BOLD_PATH = os.path.join(ROOT, "assets", "DejaVuSans-Bold.ttf")
+FONT_SMALL_PATH = os.path.join(ROOT, "assets", "pixel.ttf")
+AUTOCOMPLETE_PATH = os.path.join(ROOT, "config", "autocomplete_words.txt")
@@ -4,6 +4,6 @@ CACHE_DIR = "/home/dietpi/piper_cache"
 APPS_DIR = "/home/dietpi/apps"
 ICON_DIR = "/home/dietpi/icons"
 FONT_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
-FONT_PATH_BOLD = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
+FONT_BOLD_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
 FONT_SMALL_PATH = "/usr/share/fonts/truetype/dejavu/pixel.ttf"
 AUTOCOMPLETE_PATH = "/home/dietpi/autocomplete_words.txt"
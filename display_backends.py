@@ -0,0 +1,545 @@
+import queue
+import struct
+import sys
+import threading
+import time
+
+import numpy as np
+
+from display_commands import TimingStats
+from framebuffer import pack_image, unpack_bits
+from scripted_input import KEY_DOWN, KEY_UP, KeyEvent
+
+# SSD1306/SSD1309 addressing commands (horizontal addressing mode)
+SET_COLUMN_ADDRESS = 0x21
+SET_PAGE_ADDRESS = 0x22
+# Normal / inverted display (inversion is done by the controller, no frame resend)
+SET_NORMAL_DISPLAY = 0xA6
+SET_INVERSE_DISPLAY = 0xA7
+# Command bytes needed to open one address window
+WINDOW_COMMAND_BYTES = 6
+
+
+class LumaDisplayWrapper:
+    """
+    Display interface over a luma.oled SSD1309 device.
+
+    Keeps a shadow of the last transmitted frame and only sends the 8-row pages
+    and column ranges that changed, using the controller's column/page address
+    windows. Only the device's command()/data() methods are used for frames, so
+    any object with those (and width/height) can stand in for the hardware.
+    """
+
+    def __init__(self, device):
+        self.device = device
+        self.width = device.width
+        self.height = device.height
+        self.pages = self.height // 8
+        self._colstart = getattr(device, "_colstart", 0)
+        self._shadow = None
+
+        # Transfer accounting (command + data payload bytes)
+        self.frames = 0
+        self.bytes_sent = 0
+        self.last_frame_bytes = 0
+        self.full_frame_bytes = WINDOW_COMMAND_BYTES + self.width * self.pages
+
+    def fill(self, color):
+        """Clear the display with the specified color (0 or 255)"""
+        self.frame(np.full((self.pages, self.width), 0xFF if color else 0x00, dtype=np.uint8))
+
+    def show(self):
+        """Update the display - no-op as image() transmits immediately"""
+        pass
+
+    def image(self, img):
+        """Display a PIL image on the device, sending only what changed"""
+        self.frame(pack_image(img))
+
+    def frame(self, pages):
+        """Display a (pages, width) uint8 frame already packed in page order (see framebuffer)"""
+        sent = 0
+        for page_start, page_end, col_start, col_end in self._changed_windows(pages):
+            self.device.command(
+                SET_COLUMN_ADDRESS, self._colstart + col_start, self._colstart + col_end,
+                SET_PAGE_ADDRESS, page_start, page_end)
+            data = pages[page_start:page_end + 1, col_start:col_end + 1].ravel().tolist()
+            self.device.data(data)
+            sent += WINDOW_COMMAND_BYTES + len(data)
+
+        if self._shadow is None:
+            self._shadow = pages.copy()
+        else:
+            np.copyto(self._shadow, pages)
+        self.frames += 1
+        self.bytes_sent += sent
+        self.last_frame_bytes = sent
+
+    def stats(self):
+        """Bytes sent over the bus, overall and for the last frame"""
+        return {
+            "frames": self.frames,
+            "bytes_sent": self.bytes_sent,
+            "last_frame_bytes": self.last_frame_bytes,
+            "full_frame_bytes": self.full_frame_bytes,
+        }
+
+    def _changed_windows(self, pages):
+        """Return (page_start, page_end, col_start, col_end) windows covering every change"""
+        if self._shadow is None:
+            return [(0, self.pages - 1, 0, self.width - 1)]
+
+        changed = pages != self._shadow
+        windows = []
+        for page in np.flatnonzero(changed.any(axis=1)).tolist():
+            columns = np.flatnonzero(changed[page])
+            col_start, col_end = int(columns[0]), int(columns[-1])
+
+            if windows and windows[-1][1] == page - 1:
+                # Merge with the window above if that is cheaper than opening a new one
+                prev_start, prev_end, prev_col_start, prev_col_end = windows[-1]
+                union_start = min(prev_col_start, col_start)
+                union_end = max(prev_col_end, col_end)
+                separate = ((prev_end - prev_start + 1) * (prev_col_end - prev_col_start + 1)
+                            + WINDOW_COMMAND_BYTES + (col_end - col_start + 1))
+                merged = (page - prev_start + 1) * (union_end - union_start + 1)
+                if merged <= separate:
+                    windows[-1] = (prev_start, page, union_start, union_end)
+                    continue
+
+            windows.append((page, page, col_start, col_end))
+        return windows
+
+    def stop(self):
+        """Cleanup the display"""
+        self.device.cleanup()
+
+    def contrast(self, level):
+        """Set contrast"""
+        self.device.contrast(level)
+
+    def invert(self, flag):
+        """Invert the panel in the controller; the frame buffer is left untouched"""
+        self.device.command(SET_INVERSE_DISPLAY if flag else SET_NORMAL_DISPLAY)
+
+
+class HeadlessDisplay:
+    """
+    Display interface kept in memory, for running without a panel (build
+    boxes, automated performance and regression runs).
+
+    frame() stores the packed frame and show() "displays" it. With a FrameLog
+    every shown frame is recorded with its timestamp. pixels() returns what
+    the panel would show now, inversion included.
+    """
+
+    def __init__(self, width, height, frame_log=None):
+        self.width = width
+        self.height = height
+        self.pages = height // 8
+        self.frame_log = frame_log
+        self._frame = np.zeros((self.pages, width), dtype=np.uint8)
+        self._inverted = False
+        self._contrast = 255
+        self._lock = threading.Lock()
+        self.frames = 0
+        self.shows = 0
+
+    def fill(self, color):
+        with self._lock:
+            self._frame.fill(0xFF if color else 0x00)
+        self.show()
+
+    def image(self, img):
+        self.frame(pack_image(img))
+
+    def frame(self, pages):
+        """Take a (pages, width) uint8 frame packed in page order"""
+        with self._lock:
+            np.copyto(self._frame, pages)
+            self.frames += 1
+
+    def show(self):
+        with self._lock:
+            self.shows += 1
+            if self.frame_log is not None:
+                self.frame_log.write(self._shown(), self._contrast, self._inverted)
+
+    def contrast(self, level):
+        with self._lock:
+            self._contrast = max(0, min(255, int(level)))
+
+    def invert(self, flag):
+        with self._lock:
+            self._inverted = bool(flag)
+        self.show()
+
+    def pixels(self):
+        """The shown frame as a (height, width) bool array"""
+        with self._lock:
+            return unpack_bits(self._shown())
+
+    def stats(self):
+        with self._lock:
+            stats = {"frames": self.frames, "shows": self.shows}
+            if self.frame_log is not None:
+                stats["log"] = self.frame_log.stats()
+            return stats
+
+    def stop(self):
+        if self.frame_log is not None:
+            self.frame_log.close()
+
+    def _shown(self):
+        # Inversion is a single XOR over the packed frame, as on the panel
+        return self._frame ^ 0xFF if self._inverted else self._frame
+
+
+class PygameDisplay:
+    """
+    Display interface drawn in a pygame window, for running on a desktop
+    (Windows or Linux). Keys pressed in the window are the input; see keyboard().
+
+    Frames are unpacked into an 8-bit surface whose palette holds the two
+    pixel colours, then scaled into a preallocated surface of the window's
+    size, so presenting allocates no surfaces. Inversion and contrast only
+    change the palette. The window presents at most fps frames a second (only
+    the newest frame is kept); set_fps() lets it follow the display thread,
+    so game timing on a desktop matches the device.
+    """
+
+    def __init__(self, width, height, scale=4, fps=30.0, keymap=None, title="ProxiTalk Emulated Display"):
+        self.width = width
+        self.height = height
+        self.scale = scale
+        self.fps = fps
+        self.keymap = keymap or {}
+        self.title = title
+        self._latest = np.zeros((height // 8, width), dtype=np.uint8)
+        self._shown = np.zeros_like(self._latest)
+        self._has_frame = False
+        self._inverted = False
+        self._contrast = 255
+        self._palette_changed = True
+        self._lock = threading.Lock()
+        self._keys = queue.Queue()
+        self._stop_event = threading.Event()
+
+        self.presented = 0
+        self.superseded = 0
+        self.present_timing = TimingStats()
+
+        # pygame is set up and polled on this thread only
+        self._thread = threading.Thread(target=self._run, daemon=True, name="Emulator")
+        self._thread.start()
+
+    def fill(self, color):
+        self.frame(np.full_like(self._latest, 0xFF if color else 0x00))
+
+    def image(self, img):
+        self.frame(pack_image(img))
+
+    def frame(self, pages):
+        """Take a (pages, width) uint8 frame packed in page order"""
+        with self._lock:
+            if self._has_frame:
+                self.superseded += 1
+            np.copyto(self._latest, pages)
+            self._has_frame = True
+
+    def show(self):
+        """No-op: the window presents the newest frame at its own rate"""
+        pass
+
+    def contrast(self, level):
+        with self._lock:
+            self._contrast = max(0, min(255, int(level)))
+            self._palette_changed = True
+
+    def invert(self, flag):
+        with self._lock:
+            self._inverted = bool(flag)
+            self._palette_changed = True
+
+    def set_fps(self, fps):
+        self.fps = max(1.0, float(fps))
+
+    def keyboard(self):
+        """An input device (read_loop()) yielding the window's key events until it is closed"""
+        return PygameKeyboard(self._keys)
+
+    def stats(self):
+        with self._lock:
+            stats = self.present_timing.as_dict()
+            stats.update({"fps": self.fps, "presented": self.presented, "superseded": self.superseded})
+            return stats
+
+    def stop(self):
+        self._stop_event.set()
+        self._thread.join(timeout=1.0)
+
+    def _palette(self):
+        # The panel's contrast only dims it; keep the dimmest setting visible
+        level = 64 + self._contrast * 191 // 255
+        off, on = (0, 0, 0), (level, level, level)
+        return [on, off] if self._inverted else [off, on]
+
+    def _run(self):
+        import pygame
+
+        pygame.display.init()
+        size = (self.width * self.scale, self.height * self.scale)
+        window = pygame.display.set_mode(size)
+        pygame.display.set_caption(self.title)
+        surface = pygame.Surface((self.width, self.height), depth=8)
+        scaled = pygame.Surface(size, depth=8)
+        clock = pygame.time.Clock()
+
+        while not self._stop_event.is_set():
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self._stop_event.set()
+                elif event.type in (pygame.KEYDOWN, pygame.KEYUP):
+                    state = KEY_DOWN if event.type == pygame.KEYDOWN else KEY_UP
+                    self._keys.put(KeyEvent(self._keycode(pygame.key.name(event.key)), state))
+
+            with self._lock:
+                fresh = self._has_frame
+                if fresh:
+                    np.copyto(self._shown, self._latest)
+                    self._has_frame = False
+                palette = self._palette() if self._palette_changed else None
+                self._palette_changed = False
+
+            if fresh or palette:
+                start = time.perf_counter()
+                if palette:
+                    surface.set_palette(palette)
+                    scaled.set_palette(palette)
+                if fresh:
+                    pygame.surfarray.blit_array(surface, unpack_bits(self._shown).T.view(np.uint8))
+                    pygame.transform.scale(surface, size, scaled)
+                window.blit(scaled, (0, 0))
+                pygame.display.flip()
+                with self._lock:
+                    self.presented += 1
+                    self.present_timing.record((time.perf_counter() - start) * 1000.0)
+
+            clock.tick(self.fps)
+
+        self._keys.put(None)  # Ends keyboard().read_loop()
+        pygame.display.quit()
+
+    def _keycode(self, name):
+        return self.keymap.get(name) or "KEY_" + name.upper().replace(" ", "")
+
+
+class PygameKeyboard:
+    """Key events from a PygameDisplay window, shaped like an evdev device"""
+
+    name = "Emulator window"
+
+    def __init__(self, events):
+        self._events = events
+        self.finished = False
+
+    def read_loop(self):
+        while True:
+            event = self._events.get()
+            if event is None:
+                self.finished = True
+                return
+            yield event
+
+
+# --- Frame Log --- #
+
+FRAME_LOG_MAGIC = b"PXFL"
+FRAME_LOG_VERSION = 1
+FRAME_LOG_HEADER = struct.Struct("<4sBHH")     # magic, version, width, height
+FRAME_RECORD = struct.Struct("<dBB")           # seconds since the log opened, contrast, flags
+FLAG_INVERTED = 0x01
+FLAG_REPEAT = 0x02  # Same pixels as the previous record; no frame data follows
+
+
+class FrameLog:
+    """
+    A compact binary log of shown frames: each record is a timestamp, the
+    contrast and the 1-bit frame in the panel's page order (width * height / 8
+    bytes). A frame identical to the one before is stored as a 10 byte record
+    with no pixels, so an idle screen costs almost nothing. Read it back with
+    read_frame_log().
+    """
+
+    def __init__(self, path, width, height):
+        self.path = path
+        self._file = open(path, "wb")
+        self._file.write(FRAME_LOG_HEADER.pack(FRAME_LOG_MAGIC, FRAME_LOG_VERSION, width, height))
+        self._start = time.monotonic()
+        self._last = None
+        self.records = 0
+        self.repeats = 0
+        self.bytes_written = FRAME_LOG_HEADER.size
+
+    def write(self, pages, contrast=255, inverted=False):
+        if self._file is None:
+            return
+        flags = FLAG_INVERTED if inverted else 0
+        repeat = self._last is not None and np.array_equal(pages, self._last)
+        if repeat:
+            flags |= FLAG_REPEAT
+        self._file.write(FRAME_RECORD.pack(time.monotonic() - self._start, contrast, flags))
+        self.bytes_written += FRAME_RECORD.size
+        if repeat:
+            self.repeats += 1
+        else:
+            data = np.ascontiguousarray(pages, dtype=np.uint8).tobytes()
+            self._file.write(data)
+            self.bytes_written += len(data)
+            self._last = pages.copy()
+        self.records += 1
+
+    def stats(self):
+        return {"records": self.records, "repeats": self.repeats, "bytes_written": self.bytes_written}
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def read_frame_log(path):
+    """Yield (seconds, pages, contrast, inverted) for every record in a FrameLog file"""
+    with open(path, "rb") as f:
+        magic, version, width, height = FRAME_LOG_HEADER.unpack(f.read(FRAME_LOG_HEADER.size))
+        if magic != FRAME_LOG_MAGIC or version != FRAME_LOG_VERSION:
+            raise ValueError(f"{path} is not a version {FRAME_LOG_VERSION} frame log")
+        frame_bytes = width * height // 8
+        pages = np.zeros((height // 8, width), dtype=np.uint8)
+        while True:
+            record = f.read(FRAME_RECORD.size)
+            if len(record) < FRAME_RECORD.size:
+                return
+            seconds, contrast, flags = FRAME_RECORD.unpack(record)
+            if not flags & FLAG_REPEAT:
+                data = f.read(frame_bytes)
+                if len(data) < frame_bytes:
+                    return  # Cut off mid-frame (the run was killed)
+                pages = np.frombuffer(data, dtype=np.uint8).reshape(height // 8, width)
+            yield seconds, pages, contrast, bool(flags & FLAG_INVERTED)
+
+
+class FrameTransmitter:
+    """
+    Sends composited frames to a display on a dedicated thread, so a slow bus
+    write never holds up drawing.
+
+    The compositor fills a back buffer from back_buffer() and hands it over with
+    submit(); the transmitter sends it as the front buffer. A frame submitted
+    while another is still being sent waits in a pending slot, and a newer
+    submit replaces it (the stale one is counted as superseded). Three buffers
+    cover back + pending + front, so the compositor never waits on the bus.
+    """
+
+    def __init__(self, disp, shape):
+        self.disp = disp
+        self._free = [np.zeros(shape, dtype=np.uint8) for _ in range(3)]
+        self._pending = None
+        self._sending = False
+        self._stopped = False
+        self._cond = threading.Condition()
+
+        self.transmit = TimingStats()
+        self.superseded = 0
+
+        self._thread = threading.Thread(target=self._run, daemon=True, name="DisplayTransmit")
+        self._thread.start()
+
+    def back_buffer(self):
+        """A buffer that is neither queued nor being sent; pass it to submit() when filled"""
+        with self._cond:
+            return self._free.pop()
+
+    def submit(self, frame):
+        with self._cond:
+            if self._pending is not None:
+                self._free.append(self._pending)
+                self.superseded += 1
+            self._pending = frame
+            self._cond.notify()
+
+    def flush(self, timeout=1.0):
+        """Wait until everything submitted has been sent"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._pending is not None or self._sending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stop(self):
+        self.flush()
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self._thread.join(timeout=1.0)
+
+    def stats(self):
+        with self._cond:
+            stats = self.transmit.as_dict()
+            stats["superseded"] = self.superseded
+            return stats
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                front, self._pending = self._pending, None
+                self._sending = True
+
+            start = time.perf_counter()
+            try:
+                self.disp.frame(front)
+                self.disp.show()
+            except Exception as e:
+                print(f"[Display] Frame transmit failed: {e}", flush=True)
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+
+            with self._cond:
+                self.transmit.record(elapsed_ms)
+                self._free.append(front)
+                self._sending = False
+                self._cond.notify_all()
+
+
+if __name__ == "__main__":
+    # python display_backends.py frames.log [png_dir]
+    import os
+
+    from PIL import Image
+
+    path = sys.argv[1]
+    out_dir = sys.argv[2] if len(sys.argv) > 2 else None
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    count = changed = 0
+    first = last = None
+    previous = None
+    for index, (seconds, pages, contrast, inverted) in enumerate(read_frame_log(path)):
+        count += 1
+        first = seconds if first is None else first
+        last = seconds
+        if pages is not previous:
+            changed += 1
+            previous = pages
+            if out_dir:
+                bits = unpack_bits(pages)
+                Image.fromarray(bits.astype(np.uint8) * 255, "L").save(f"{out_dir}/frame_{index:06d}.png")
+    duration = (last - first) if count > 1 else 0.0
+    rate = f", {(count - 1) / duration:.1f} fps" if duration > 0 else ""
+    print(f"[FrameLog] {count} frames ({changed} changed) over {duration:.2f}s{rate}", flush=True)
@@ -0,0 +1,115 @@
+import inspect
+import time
+
+
+class TimingStats:
+    """Call count and execution time of one operation (a display command, a frame stage)"""
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms = 0.0
+
+    def record(self, elapsed_ms):
+        self.calls += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.last_ms = elapsed_ms
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "total_ms": self.total_ms,
+            "avg_ms": self.total_ms / self.calls if self.calls else None,
+            "max_ms": self.max_ms,
+            "last_ms": self.last_ms,
+        }
+
+
+class CommandStats(TimingStats):
+    """Timing for one display command plus its bad-call counters"""
+
+    def __init__(self):
+        super().__init__()
+        self.malformed = 0
+        self.errors = 0
+
+    def as_dict(self):
+        stats = super().as_dict()
+        stats["malformed"] = self.malformed
+        stats["errors"] = self.errors
+        return stats
+
+
+class DisplayCommandRegistry:
+    """
+    Maps display command names to handler functions.
+
+    A command is a tuple ("name", *args). The args are checked against the
+    handler's signature before it runs, so a caller sending the wrong number of
+    arguments is counted and logged instead of crashing the display thread.
+    Unknown commands are counted by name. Handlers may return False to stop the
+    display thread (see "exit").
+    """
+
+    # Only the first few bad calls per command are logged, the counters keep going
+    LOG_LIMIT = 3
+
+    def __init__(self):
+        self._handlers = {}
+        self._stats = {}
+        self.unknown = {}
+
+    def register(self, name, handler=None):
+        """Register handler for name; usable as a decorator: @registry.register("clear_base")"""
+        def decorator(func):
+            self._handlers[name] = (func, inspect.signature(func))
+            self._stats[name] = CommandStats()
+            return func
+        return decorator(handler) if handler is not None else decorator
+
+    def names(self):
+        return sorted(self._handlers)
+
+    def dispatch(self, cmd):
+        """Run a command. Returns the handler's result, or None if it was not run."""
+        name, args = cmd[0], cmd[1:]
+        entry = self._handlers.get(name)
+        if entry is None:
+            count = self.unknown.get(name, 0) + 1
+            self.unknown[name] = count
+            if count <= self.LOG_LIMIT:
+                print(f"[Display] Unknown command: {name!r}", flush=True)
+            return None
+
+        handler, signature = entry
+        stats = self._stats[name]
+        try:
+            signature.bind(*args)
+        except TypeError as e:
+            stats.malformed += 1
+            if stats.malformed <= self.LOG_LIMIT:
+                print(f"[Display] Malformed {name} command ({len(args)} args): {e}", flush=True)
+            return None
+
+        start = time.perf_counter()
+        try:
+            return handler(*args)
+        except Exception as e:
+            stats.errors += 1
+            if stats.errors <= self.LOG_LIMIT:
+                print(f"[Display] {name} failed: {e}", flush=True)
+            return None
+        finally:
+            stats.record((time.perf_counter() - start) * 1000.0)
+
+    def stats(self):
+        """Per-command timing plus unknown/malformed/error totals"""
+        commands = {name: stats.as_dict() for name, stats in self._stats.items() if stats.calls or stats.malformed}
+        return {
+            "commands": commands,
+            "unknown": dict(self.unknown),
+            "malformed": sum(stats.malformed for stats in self._stats.values()),
+            "errors": sum(stats.errors for stats in self._stats.values()),
+        }
@@ -0,0 +1,122 @@
+import math
+import time
+
+
+class Timer:
+    # period is in seconds, so it survives a change of tick interval
+    __slots__ = ("key", "tick", "command", "period")
+
+    def __init__(self, key, tick, command, period):
+        self.key = key
+        self.tick = tick
+        self.command = command
+        self.period = period
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel for display commands, driven by the display loop.
+
+    Time is divided into ticks of one frame interval, counted from a fixed
+    origin. Deadlines are rounded up to the next tick, so timers only ever
+    fire on frame boundaries and never cause a wakeup of their own between
+    frames. Timers are keyed: scheduling an existing key replaces it.
+    Nothing here is thread-safe; it is only used from the display thread.
+    """
+
+    def __init__(self, tick_interval, slots=64):
+        self.tick_interval = tick_interval
+        self.slots = [[] for _ in range(slots)]
+        self.origin = time.monotonic()
+        self.current = 0  # Last tick that has been expired
+        self._timers = {}
+
+    def tick_at(self, t):
+        """Index of the tick at or before monotonic time t"""
+        # The epsilon keeps a wakeup at exactly tick_time(n) from landing on n - 1
+        return int((t - self.origin) / self.tick_interval + 1e-6)
+
+    def tick_time(self, tick):
+        return self.origin + tick * self.tick_interval
+
+    def next_tick_time(self, t):
+        """First tick boundary strictly after t"""
+        return self.tick_time(self.tick_at(t) + 1)
+
+    def set_tick_interval(self, tick_interval, now=None):
+        """Change the tick length (e.g. a new frame rate), keeping each timer's deadline"""
+        now = time.monotonic() if now is None else now
+        deadlines = [(timer, self.tick_time(timer.tick)) for timer in self._timers.values()]
+        self.tick_interval = tick_interval
+        self.origin = now
+        self.current = 0
+        for slot in self.slots:
+            slot.clear()
+        for timer, deadline in deadlines:
+            self._insert(timer, max(1, math.ceil((deadline - now) / tick_interval)))
+
+    def schedule(self, key, delay, command, period=None, now=None):
+        """Run command after delay seconds, then every period seconds if given"""
+        now = time.monotonic() if now is None else now
+        self.cancel(key)
+        tick = max(self.current + 1, math.ceil((now + delay - self.origin) / self.tick_interval))
+        timer = Timer(key, tick, command, period)
+        self._timers[key] = timer
+        self._place(timer)
+
+    def cancel(self, key):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            self.slots[timer.tick % len(self.slots)].remove(timer)
+        return timer is not None
+
+    def active(self, key):
+        return key in self._timers
+
+    def next_deadline(self):
+        """Monotonic time of the earliest pending timer, or None"""
+        if not self._timers:
+            return None
+        return self.tick_time(min(timer.tick for timer in self._timers.values()))
+
+    def expire(self, now=None):
+        """Advance to now and return the commands of every timer that came due, in order"""
+        now = time.monotonic() if now is None else now
+        target = self.tick_at(now)
+        if target <= self.current:
+            return []
+        if target - self.current > len(self.slots):
+            # Long gap (idle or a stalled loop): settle every due timer in one pass
+            # instead of walking each tick, and don't replay missed periodic firings
+            fired = sorted((timer for timer in self._timers.values() if timer.tick <= target),
+                           key=lambda timer: timer.tick)
+            self.current = target
+            return [self._fire(timer) for timer in fired]
+
+        due = []
+        while self.current < target:
+            self.current += 1
+            slot = self.slots[self.current % len(self.slots)]
+            # Timers in this slot with a later tick are whole revolutions away
+            for timer in [timer for timer in slot if timer.tick <= self.current]:
+                due.append(self._fire(timer))
+        return due
+
+    def keys(self):
+        return list(self._timers)
+
+    def _fire(self, timer):
+        self.slots[timer.tick % len(self.slots)].remove(timer)
+        if timer.period:
+            timer.tick = self.current + max(1, round(timer.period / self.tick_interval))
+            self._place(timer)
+        else:
+            del self._timers[timer.key]
+        return timer.command
+
+    def _insert(self, timer, ticks_from_now):
+        timer.tick = self.current + ticks_from_now
+        self._place(timer)
+
+    def _place(self, timer):
+        self.slots[timer.tick % len(self.slots)].append(timer)
@@ -0,0 +1,111 @@
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+
+from PIL import ImageFont
+
+
+class FontRegistry:
+    """
+    Shared PIL fonts by (family, size, weight), loaded on first use.
+
+    families maps a family name to {weight: TTF path}. Every app asking for the
+    same font gets the same instance. Fonts that have not been used recently are
+    dropped once the estimated memory of the loaded set passes memory_cap bytes;
+    pinned fonts are never dropped. Each face is estimated at the size of its
+    font file (FreeType keeps the face data in memory).
+    """
+
+    def __init__(self, families, memory_cap=4 * 1024 * 1024):
+        self.families = families
+        self.memory_cap = memory_cap
+        self._fonts = OrderedDict()  # (family, size, weight) -> (font, estimated bytes), oldest first
+        self._pinned = set()
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.evictions = 0
+
+    def get_font(self, family, size, weight="regular"):
+        key = (family, int(size), weight)
+        with self._lock:
+            entry = self._fonts.get(key)
+            if entry is not None:
+                self._fonts.move_to_end(key)
+                return entry[0]
+
+            path = self._path(family, weight)
+            font = ImageFont.truetype(path, key[1])
+            self._fonts[key] = (font, os.path.getsize(path))
+            self.loads += 1
+            self._evict()
+            return font
+
+    def pin(self, family, size, weight="regular"):
+        """Load a font and keep it loaded (fonts the system itself draws with)"""
+        font = self.get_font(family, size, weight)
+        with self._lock:
+            self._pinned.add((family, int(size), weight))
+        return font
+
+    def loaded(self):
+        with self._lock:
+            return list(self._fonts)
+
+    def memory(self):
+        with self._lock:
+            return sum(estimate for _, estimate in self._fonts.values())
+
+    def stats(self):
+        with self._lock:
+            return {
+                "loaded": len(self._fonts),
+                "pinned": len(self._pinned),
+                "memory": sum(estimate for _, estimate in self._fonts.values()),
+                "memory_cap": self.memory_cap,
+                "loads": self.loads,
+                "evictions": self.evictions,
+            }
+
+    def _path(self, family, weight):
+        weights = self.families.get(family)
+        if weights is None:
+            raise ValueError(f"Unknown font family {family!r} (have {', '.join(sorted(self.families))})")
+        path = weights.get(weight)
+        if path is None:
+            raise ValueError(f"Font family {family!r} has no {weight!r} weight (have {', '.join(sorted(weights))})")
+        return path
+
+    def _evict(self):
+        memory = sum(estimate for _, estimate in self._fonts.values())
+        newest = next(reversed(self._fonts))
+        for key in list(self._fonts):
+            if memory <= self.memory_cap:
+                break
+            # The font just asked for stays even if it alone is over the cap
+            if key in self._pinned or key == newest:
+                continue
+            font, estimate = self._fonts.pop(key)
+            memory -= estimate
+            self.evictions += 1
+            print(f"[Font] Evicted {key[0]} {key[2]} {key[1]}", flush=True)
+
+
+class NamedFonts(Mapping):
+    """
+    The context["fonts"] dict: role names ("small", "bold", ...) mapped to
+    (family, size, weight), each loaded from the registry when first looked up.
+    """
+
+    def __init__(self, registry, names):
+        self.registry = registry
+        self.names = names
+
+    def __getitem__(self, name):
+        return self.registry.get_font(*self.names[name])
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
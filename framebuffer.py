@@ -0,0 +1,277 @@
+import numpy as np
+from PIL import Image, ImageDraw
+
+
+def pack_bits(bits):
+    """
+    Pack a boolean (height, width) pixel array into SSD1309 page order: a
+    (height // 8, width) uint8 array where bit n of [page, x] is pixel (x, page * 8 + n).
+    """
+    return np.packbits(bits, axis=0, bitorder="little")
+
+
+def unpack_bits(pages):
+    """Inverse of pack_bits: (pages, width) uint8 -> (pages * 8, width) bool"""
+    return np.unpackbits(pages, axis=0, bitorder="little").view(bool)
+
+
+def image_bits(img):
+    """Boolean pixel array for a PIL image (non-zero pixels are on)"""
+    if img.mode != "1":
+        img = img.convert("1")
+    return np.asarray(img, dtype=bool)
+
+
+def pack_image(img):
+    """Pack a full-screen PIL image into page order (height must be a multiple of 8)"""
+    return pack_bits(image_bits(img))
+
+
+# PIL font -> BitmapFont drawn in its place (see bitmap_font.py)
+_bitmap_fonts = {}
+
+
+def use_bitmap_font(font, bitmap):
+    """Render text in font from the pre-rasterized bitmap font instead of FreeType"""
+    _bitmap_fonts[font] = bitmap
+
+
+def text_bits(font, text, x=0, y=0):
+    """Render text to (bits, x, y) for blitting, or None if nothing would be drawn"""
+    if not text:
+        return None
+    bitmap = _bitmap_fonts.get(font)
+    if bitmap is not None and bitmap.covers(text):
+        return bitmap.text_bits(text, x, y)
+    return rasterize_text(font, text, x, y)
+
+
+def rasterize_text(font, text, x=0, y=0):
+    """text_bits through FreeType"""
+    if not text:
+        return None
+    left, top, right, bottom = font.getbbox(text)
+    if right <= left or bottom <= top:
+        return None
+    # Keep the fractional part of the position so glyphs rasterize exactly as
+    # ImageDraw.text would, with a margin for glyphs that overhang the origin
+    ix, iy = int(x), int(y)
+    margin_x, margin_y = max(0, -left) + 1, max(0, -top) + 1
+    glyphs = Image.new("1", (right + margin_x + 1, bottom + margin_y + 1))
+    ImageDraw.Draw(glyphs).text((margin_x + x - ix, margin_y + y - iy), text, font=font, fill=1)
+    return image_bits(glyphs), ix - margin_x, iy - margin_y
+
+
+def combine(dst, bits, x, y, op="or"):
+    """
+    Combine a boolean pixel array into the boolean array dst at (x, y), clipped to dst.
+    op is "or" (set), "copy" (replace), "clear" (unset) or "xor" (toggle).
+    """
+    x, y = int(x), int(y)
+    height, width = bits.shape
+    x0, y0 = max(0, x), max(0, y)
+    x1, y1 = min(dst.shape[1], x + width), min(dst.shape[0], y + height)
+    if x0 >= x1 or y0 >= y1:
+        return
+    src = bits[y0 - y:y1 - y, x0 - x:x1 - x]
+    target = dst[y0:y1, x0:x1]
+    if op == "or":
+        target |= src
+    elif op == "copy":
+        target[...] = src
+    elif op == "clear":
+        target &= ~src
+    elif op == "xor":
+        target ^= src
+    else:
+        raise ValueError(f"Unknown blit op: {op}")
+
+
+class Framebuffer:
+    """
+    A 1-bit layer held packed in SSD1309 page order (see pack_bits).
+
+    Drawing operations only unpack the pages they touch, so most commands work
+    on a few hundred bytes. Layers are combined with NumPy bitwise ops and the
+    packed result can be handed straight to the display device.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.pages = np.zeros((height // 8, width), dtype=np.uint8)
+
+    def clear(self):
+        self.pages.fill(0)
+
+    def replace(self, img):
+        """Replace the whole layer with an image (smaller images are placed at 0, 0)"""
+        if img.size == (self.width, self.height):
+            self.pages[:] = pack_image(img)
+        else:
+            self.clear()
+            self.paste(img, 0, 0, masked=False)
+
+    def copy_from(self, other):
+        np.copyto(self.pages, other.pages)
+
+    def fill_rect(self, x0, y0, x1, y1, value=1):
+        """Set or clear the rectangle with inclusive corners (like ImageDraw.rectangle)"""
+        clipped = self._clip(int(x0), int(y0), int(x1) + 1, int(y1) + 1)
+        if clipped is None:
+            return
+        x0, y0, x1, y1 = clipped
+        page_start, rows = self._rows(y0, y1)
+        offset = page_start * 8
+        rows[y0 - offset:y1 - offset, x0:x1] = bool(value)
+        self._store(page_start, rows)
+
+    def toggle_rect(self, x0, y0, x1, y1):
+        """Invert the rectangle with inclusive corners"""
+        clipped = self._clip(int(x0), int(y0), int(x1) + 1, int(y1) + 1)
+        if clipped is None:
+            return
+        x0, y0, x1, y1 = clipped
+        page_start, rows = self._rows(y0, y1)
+        offset = page_start * 8
+        rows[y0 - offset:y1 - offset, x0:x1] ^= True
+        self._store(page_start, rows)
+
+    def paste(self, img, x=0, y=0, masked=True):
+        """
+        Draw a PIL image at (x, y). Masked pastes only turn pixels on (the image is
+        its own mask); unmasked pastes replace the covered area.
+        """
+        self.blit(image_bits(img), x, y, "or" if masked else "copy")
+
+    def draw_text(self, font, text, x=0, y=0, fill=1):
+        """Rasterize text with a PIL font; fill=0 clears the glyph pixels instead"""
+        glyphs = text_bits(font, text, x, y)
+        if glyphs is not None:
+            self.blit(*glyphs, "or" if fill else "clear")
+
+    def blit(self, bits, x, y, op="or"):
+        """
+        Combine a boolean pixel array into the layer at (x, y).
+        op is "or" (set), "copy" (replace), "clear" (unset) or "xor" (toggle).
+        """
+        x, y = int(x), int(y)
+        height, width = bits.shape
+        clipped = self._clip(x, y, x + width, y + height)
+        if clipped is None:
+            return
+        page_start, rows = self._rows(clipped[1], clipped[3])
+        combine(rows, bits, x, y - page_start * 8, op)
+        self._store(page_start, rows)
+
+    # --- Batch primitives: many shapes, one unpack/pack of the touched pages --- #
+
+    def fill_rects(self, rects, value=1):
+        """Fill an (N, 4) array of inclusive (x0, y0, x1, y1) rectangles"""
+        rects = np.asarray(rects, dtype=np.int32).reshape(-1, 4)
+        if not len(rects):
+            return
+        x0 = np.clip(rects[:, 0], 0, self.width)
+        y0 = np.clip(rects[:, 1], 0, self.height)
+        x1 = np.clip(rects[:, 2] + 1, 0, self.width)
+        y1 = np.clip(rects[:, 3] + 1, 0, self.height)
+        keep = (x0 < x1) & (y0 < y1)
+        if not keep.any():
+            return
+        x0, y0, x1, y1 = x0[keep], y0[keep], x1[keep], y1[keep]
+
+        page_start, rows = self._rows(int(y0.min()), int(y1.max()))
+        offset = page_start * 8
+        value = bool(value)
+        for rx0, ry0, rx1, ry1 in zip(x0.tolist(), (y0 - offset).tolist(), x1.tolist(), (y1 - offset).tolist()):
+            rows[ry0:ry1, rx0:rx1] = value
+        self._store(page_start, rows)
+
+    def set_pixels(self, points, value=1):
+        """Set or clear an (N, 2) array of (x, y) pixels"""
+        points = np.asarray(points, dtype=np.int32).reshape(-1, 2)
+        xs, ys = points[:, 0], points[:, 1]
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        xs, ys = xs[inside], ys[inside]
+        if not len(xs):
+            return
+        page_start, rows = self._rows(int(ys.min()), int(ys.max()) + 1)
+        rows[ys - page_start * 8, xs] = bool(value)
+        self._store(page_start, rows)
+
+    def draw_lines(self, lines, value=1):
+        """Draw an (N, 4) array of one-pixel (x0, y0, x1, y1) line segments"""
+        lines = np.asarray(lines, dtype=np.int32).reshape(-1, 4)
+        if not len(lines):
+            return
+        self.set_pixels(line_points(lines), value)
+
+    def draw_texts(self, runs, fill=1):
+        """Draw a sequence of (font, text, x, y) runs"""
+        blits = [glyphs for glyphs in (text_bits(*run) for run in runs) if glyphs is not None]
+        if not blits:
+            return
+        y0 = max(0, min(y for _, _, y in blits))
+        y1 = min(self.height, max(y + bits.shape[0] for bits, _, y in blits))
+        if y0 >= y1:
+            return
+        page_start, rows = self._rows(y0, y1)
+        offset = page_start * 8
+        for bits, x, y in blits:
+            combine(rows, bits, x, y - offset, "or" if fill else "clear")
+        self._store(page_start, rows)
+
+    def to_image(self):
+        """Render the layer as a mode "1" PIL image"""
+        bits = unpack_bits(self.pages)
+        return Image.fromarray(bits.astype(np.uint8) * 255, "L").convert("1")
+
+    def _clip(self, x0, y0, x1, y1):
+        """Clip a half-open rectangle to the layer; None if nothing is left"""
+        x0, y0 = max(0, x0), max(0, y0)
+        x1, y1 = min(self.width, x1), min(self.height, y1)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        return x0, y0, x1, y1
+
+    def _rows(self, y0, y1):
+        """Unpack the pages covering rows [y0, y1) into a writable bool array"""
+        page_start = y0 // 8
+        page_end = (y1 - 1) // 8 + 1
+        return page_start, unpack_bits(self.pages[page_start:page_end])
+
+    def _store(self, page_start, rows):
+        packed = pack_bits(rows)
+        self.pages[page_start:page_start + packed.shape[0]] = packed
+
+
+def line_points(lines):
+    """
+    All (x, y) pixels on an (N, 4) array of line segments, the same ones ImageDraw.line
+    draws: Pillow's Bresenham walk from (x0, y0) along the major axis, plus the end point
+    """
+    x0, y0, x1, y1 = (lines[:, i].astype(np.int64) for i in range(4))
+    dx, dy = np.abs(x1 - x0), np.abs(y1 - y0)
+    major = np.maximum(dx, dy)
+    counts = major + 1
+    segment = np.repeat(np.arange(len(lines)), counts)
+    step = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    # Minor axis steps taken by the time step major steps are done; the error term
+    # rounds halves away from the start point
+    major = major[segment]
+    minor = np.minimum(dx, dy)[segment]
+    minor_steps = (2 * minor * step + major) // np.maximum(2 * major, 1)
+    x_major = (dx > dy)[segment]
+    xs = x0[segment] + np.where(x1 < x0, -1, 1)[segment] * np.where(x_major, step, minor_steps)
+    ys = y0[segment] + np.where(y1 < y0, -1, 1)[segment] * np.where(x_major, minor_steps, step)
+    return np.stack((xs, ys), axis=1).astype(np.int32)
+
+
+def composite(layers, out, invert=False):
+    """OR the layers' packed pages into out, optionally inverting with one XOR"""
+    np.bitwise_or(layers[0].pages, layers[1].pages, out=out)
+    for layer in layers[2:]:
+        np.bitwise_or(out, layer.pages, out=out)
+    if invert:
+        np.bitwise_xor(out, 0xFF, out=out)
+    return out
@@ -7,9 +7,13 @@ import math
 import queue
 import select
 import atexit
+import mmap
+import wave
+import weakref
 import re
 import platform
-from PIL import Image, ImageDraw, ImageFont
+import numpy as np
+from PIL import Image, ImageDraw
 
 # --- Constants --- #
 
@@ -19,157 +23,66 @@ IS_WINDOWS = platform.system() == "Windows"
 I2C_PORT = 1        # I2C port (usually 1 on Raspberry Pi)
 I2C_ADDRESS = 0x3C  # Common I2C address for SSD1306 displays
 
-if IS_WINDOWS:
+# Display backend: "luma" (the SSD1309 panel), "emulator" (a pygame window) or
+# "headless" (in memory, for build machines and automated runs)
+DISPLAY_BACKEND = os.environ.get("PROXITALK_DISPLAY", "emulator" if IS_WINDOWS else "luma").lower()
+# Headless only: log every shown frame here (read it back with display_backends.read_frame_log)
+FRAME_LOG_PATH = os.environ.get("PROXITALK_FRAME_LOG")
+# Headless only: key script to run instead of a keyboard ("-" or unset reads stdin)
+INPUT_SCRIPT = os.environ.get("PROXITALK_INPUT")
+
+if DISPLAY_BACKEND == "headless" or (DISPLAY_BACKEND == "emulator" and not IS_WINDOWS):
+    from config.local.paths import PIPER_BIN, MODEL_PATH, CACHE_DIR, APPS_DIR, ICON_DIR, AUTOCOMPLETE_PATH
+    from config.local.paths import FONT_PATH, FONT_SMALL_PATH, FONT_BOLD_PATH
+elif IS_WINDOWS:
     from config.emulator.paths import PIPER_BIN, MODEL_PATH, CACHE_DIR, APPS_DIR, ICON_DIR, AUTOCOMPLETE_PATH
     from config.emulator.paths import FONT_PATH, FONT_SMALL_PATH, FONT_BOLD_PATH
 else:
     from config.paths import PIPER_BIN, MODEL_PATH, CACHE_DIR, APPS_DIR, ICON_DIR, AUTOCOMPLETE_PATH
     from config.paths import FONT_PATH, FONT_SMALL_PATH, FONT_BOLD_PATH
     
-# -- Emulator Setup --- #
+# --- Display and Input Setup --- #
 
-def is_admin():
-    if not IS_WINDOWS:
-        return True  # Assume admin on non-Windows
-    try:
-        import ctypes
-        return ctypes.windll.shell32.IsUserAnAdmin()
-    except:
-        return False
-
-if IS_WINDOWS:
-    # use the keyboard module or mock input
-    import keyboard
+if DISPLAY_BACKEND == "headless":
+    from scripted_input import ScriptedInputDevice, categorize, ecodes
+elif DISPLAY_BACKEND == "emulator":
+    # Keys come from the emulator window's events
+    from scripted_input import categorize, ecodes
 else:
     import evdev
     from evdev import InputDevice, categorize, ecodes
 
 if IS_WINDOWS:
     import pygame
-    import threading
-    import io
-    import wave
-
-    class EmulatedDisplay:
-        def __init__(self, width, height, scale=4):
-            self.width = width
-            self.height = height
-            self.scale = scale
-            self._image = Image.new("1", (width, height))
-            self._inverted = False
-
-            # pygame init done in thread
-            self._update_lock = threading.Lock()
-            self._pending_image = None
-            self._stop_event = threading.Event()
-
-            self._thread = threading.Thread(target=self._run_pygame_loop, daemon=True)
-            self._thread.start()
 
-        def fill(self, color):
-            with self._update_lock:
-                self._image.paste(255 if color else 0, [0, 0, self.width, self.height])
-                self._pending_image = self._image.copy()
+if DISPLAY_BACKEND == "emulator":
+    from display_backends import PygameDisplay
+    from config.emulator.pygame_keycodes import PYGAME_TO_LINUX_KEYCODE
 
-        def contrast(self, level):
-            # No-op: pygame does not emulate contrast/brightness easily
-            pass
+    # Window frame rate; by default it follows set_display_fps (the display thread's rate)
+    EMULATOR_FPS = os.environ.get("PROXITALK_EMULATOR_FPS")
+    EMULATOR_SCALE = int(os.environ.get("PROXITALK_EMULATOR_SCALE", "4"))
 
-        def invert(self, flag):
-            with self._update_lock:
-                self._inverted = flag
-                if flag:
-                    self._image = Image.eval(self._image, lambda px: 255 - px)
-                else:
-                    # If toggling invert off, re-paste to reset image (assuming original kept elsewhere)
-                    # Here just invert again for demo (better keep original)
-                    self._image = Image.eval(self._image, lambda px: 255 - px)
-                self._pending_image = self._image.copy()
-
-        def image(self, img):
-            with self._update_lock:
-                self._image = img.copy()
-                if self._inverted:
-                    self._image = Image.eval(self._image, lambda px: 255 - px)
-                self._pending_image = self._image.copy()
-
-        def show(self):
-            with self._update_lock:
-                self._pending_image = self._image.copy()
-
-        def _run_pygame_loop(self):
-            pygame.init()
-            self.screen = pygame.display.set_mode((self.width * self.scale, self.height * self.scale))
-            pygame.display.set_caption("ProxiTalk Emulated Display")
-            clock = pygame.time.Clock()
-
-            while not self._stop_event.is_set():
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        self._stop_event.set()
-
-                with self._update_lock:
-                    if self._pending_image:
-                        img = self._pending_image
-                        size = img.size
-
-                        # Convert to RGB for pygame compatibility
-                        img_rgb = img.convert("RGB")
-                        data = img_rgb.tobytes()
-                        surface = pygame.image.fromstring(data, size, "RGB")
-                        surface = pygame.transform.scale(surface, (self.width * self.scale, self.height * self.scale))
-                        self.screen.blit(surface, (0, 0))
-                        pygame.display.flip()
-                        self._pending_image = None
-
-                clock.tick(12)  # Limit to 12 FPS
-
-        def stop(self):
-            self._stop_event.set()
-            self._thread.join()
-            pygame.quit()
+    disp = PygameDisplay(128, 64, scale=EMULATOR_SCALE, fps=float(EMULATOR_FPS or 30.0),
+                         keymap=PYGAME_TO_LINUX_KEYCODE)
+elif DISPLAY_BACKEND == "headless":
+    from display_backends import HeadlessDisplay, FrameLog
 
-    # Replace real display with emulated one
-    disp = EmulatedDisplay(128, 64)
-else:
+    frame_log = FrameLog(FRAME_LOG_PATH, 128, 64) if FRAME_LOG_PATH else None
+    disp = HeadlessDisplay(128, 64, frame_log)
+    print(f"[Display] Headless{f', logging frames to {FRAME_LOG_PATH}' if frame_log else ''}", flush=True)
+elif DISPLAY_BACKEND == "luma":
     from luma.core.interface.serial import i2c
     from luma.oled.device import ssd1309
+    from display_backends import LumaDisplayWrapper
     
     # Create I2C interface and SSD1309 device
     serial = i2c(port=I2C_PORT, address=I2C_ADDRESS)
     luma_device = ssd1309(serial)
     
-    # Create compatibility wrapper for luma.oled
-    class LumaDisplayWrapper:
-        def __init__(self, device):
-            self.device = device
-            self.width = device.width
-            self.height = device.height
-            
-        def fill(self, color):
-            """Clear the display with the specified color (0 or 255)"""
-            # Create a blank image and display it
-            blank_image = Image.new("1", (self.width, self.height), color)
-            self.device.display(blank_image)
-            
-        def show(self):
-            """Update the display - no-op for luma.oled as display() handles this"""
-            pass
-            
-        def image(self, img):
-            """Display a PIL image on the device"""
-            self.device.display(img)
-            
-        def stop(self):
-            """Cleanup the display"""
-            self.device.cleanup()
-            
-        def contrast(self, level):
-            """Set contrast - luma.oled does not support this directly"""
-            self.device.contrast(level)
-            pass
-    
     disp = LumaDisplayWrapper(luma_device)
+else:
+    raise SystemExit(f"Unknown PROXITALK_DISPLAY {DISPLAY_BACKEND!r} (use luma, emulator or headless)")
 
 disp.contrast(255)
 
@@ -294,24 +207,35 @@ speaking_icon = load_base_icon("notes")
 
 # --- Audio Playback --- #
 
-def play_sfx_internal(path: str):
+from audio_stats import AudioStats
+
+# Per-request start latency, writer lead and underrun tracking
+audio_stats = AudioStats()
+
+def play_sfx_internal(path: str, requested_at: float = None):
     if not os.path.isfile(path):
         print(f"[Audio] File not found: {path}", flush=True)
         return
 
+    record = audio_stats.begin("sfx", os.path.basename(path), requested_at)
     try:
         if IS_WINDOWS:
             sound = pygame.mixer.Sound(path)
+            sound.set_volume(volume_service.software_gain)
+            record.before_write()
             channel = sound.play()
             while channel.get_busy():
                 pygame.time.wait(10)
         else:
-            subprocess.call(["aplay", path])
+            play_wav_file(path, record)
     except Exception as e:
         print(f"[Audio] Error playing wav file '{path}': {e}", flush=True)
+    finally:
+        audio_stats.finish(record)
         
 def play_sfx(path: str):
-    threading.Thread(target=play_sfx_internal, args=(path,), daemon=True).start()
+    requested_at = time.monotonic()
+    threading.Thread(target=play_sfx_internal, args=(path, requested_at), daemon=True).start()
 
 
 # --- Music --- #
@@ -346,7 +270,7 @@ class MusicManager:
         try:
             while not self._stop_event.is_set() and self.is_playing:
                 sound = pygame.mixer.Sound(path)
-                sound.set_volume(self.volume)
+                sound.set_volume(self.volume * volume_service.software_gain)
                 channel = sound.play()
                 
                 # Wait for the sound to finish or stop event
@@ -388,6 +312,112 @@ def set_music_volume(volume: float):
     music_manager.set_volume(volume)
 
 
+# --- Volume --- #
+
+class VolumeService:
+    """
+    Applies output volume changes without blocking the caller.
+    Rapid changes are coalesced so only the latest value reaches the mixer, which
+    is driven through one long-lived `amixer -s` helper. When there is no hardware
+    control (or on the emulator) the level is applied as a software gain instead.
+    """
+    def __init__(self, control="PCM"):
+        self.control = control
+        self.volume = 100
+        self.software_gain = 1.0
+        self.hardware = None  # Unknown until the worker has probed the mixer
+        self._helper = None
+        self._pending = None
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="VolumeService")
+        self._thread.start()
+
+    def set_volume(self, percent):
+        """Request a new volume (0-100). Returns immediately."""
+        with self._cond:
+            self._pending = max(0, min(100, int(percent)))
+            self._cond.notify()
+
+    def get_volume(self):
+        return self.volume
+
+    def _run(self):
+        self.hardware = self._probe_hardware()
+        print(f"[Volume] Using {'mixer control ' + self.control if self.hardware else 'software gain'}", flush=True)
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                percent = self._pending
+                self._pending = None
+            self._apply(percent)
+
+    def _probe_hardware(self):
+        if IS_WINDOWS:
+            return False
+        try:
+            result = subprocess.run(["amixer", "sget", self.control],
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            return result.returncode == 0
+        except OSError:
+            return False
+
+    def _apply(self, percent):
+        self.volume = percent
+        if self.hardware and self._write_helper(f"sset {self.control} {percent}%\n"):
+            self.software_gain = 1.0
+        else:
+            self.software_gain = percent / 100.0
+
+    def _write_helper(self, line):
+        # Restart the helper once if it has died since the last write
+        for _ in range(2):
+            if self._helper is None or self._helper.poll() is not None:
+                try:
+                    self._helper = subprocess.Popen(
+                        ["amixer", "-q", "-s"],
+                        stdin=subprocess.PIPE,
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL
+                    )
+                except OSError as e:
+                    print(f"[Volume] Failed to start amixer: {e}", flush=True)
+                    return False
+            try:
+                self._helper.stdin.write(line.encode("ascii"))
+                self._helper.stdin.flush()
+                return True
+            except OSError:
+                self._helper = None
+        return False
+
+    def close(self):
+        if self._helper and self._helper.poll() is None:
+            try:
+                self._helper.stdin.close()
+                self._helper.wait(timeout=1)
+            except Exception as e:
+                print(f"[Volume] Cleanup error: {e}", flush=True)
+
+# Global volume service
+volume_service = VolumeService()
+atexit.register(lambda: volume_service.close())
+
+def set_volume(percent):
+    volume_service.set_volume(percent)
+
+def apply_software_gain(block, gain, sample_width=2):
+    """Scale a block of S16 (or U8) samples by gain, copying only when attenuation is needed"""
+    if gain >= 1.0:
+        return block
+    if sample_width == 1:
+        # U8 is centred on 128
+        samples = np.frombuffer(block, dtype=np.uint8).astype(np.float32)
+        return ((samples - 128.0) * gain + 128.0).astype(np.uint8).tobytes()
+    samples = np.frombuffer(block, dtype="<i2", count=len(block) // 2)
+    return (samples * gain).astype("<i2").tobytes()
+
+
 # --- Piper TTS --- #
 
 if IS_WINDOWS:
@@ -490,13 +520,19 @@ else:
                 print("Piper stderr:", line.decode(errors="ignore"), flush=True)
 
         def start_process(self):
-            self.process = subprocess.Popen(
-                [self.piper_path, "--sentence_silence", "0.1", "--model", self.model_path, "--output-raw"],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                bufsize=0
-            )
+            try:
+                self.process = subprocess.Popen(
+                    [self.piper_path, "--sentence_silence", "0.1", "--model", self.model_path, "--output-raw"],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    bufsize=0
+                )
+            except OSError as e:
+                # Keep running without speech (e.g. no piper on a build machine)
+                print(f"[Piper] Failed to start: {e}", flush=True)
+                self.process = None
+                return
             threading.Thread(target=self._drain_stderr, daemon=True).start()
 
         def synthesize(self, text):
@@ -504,6 +540,8 @@ else:
                 if not self.process or self.process.poll() is not None:
                     print("Piper process not running. Restarting.")
                     self.start_process()
+                    if not self.process:
+                        return b''
 
                 try:
                     self.process.stdin.write(text.encode('utf-8') + b'\n')
@@ -549,23 +587,42 @@ else:
 
 # --- Display Setup --- #
 
+from command_queue import DisplayCommandQueue
+
 draw_lock = threading.RLock()
-display_queue = queue.Queue()
+display_queue = DisplayCommandQueue()
 
 width = disp.width
 height = disp.height
 
-# Create layered images
-base_layer = Image.new("1", (width, height))        # Static screen content
-base_layer_2 = Image.new("1", (width, height))      # Alternative static content (e.g., clock)
-overlay_layer = Image.new("1", (width, height))     # Temporary overlays (icons, cursors)
-composite_layer = Image.new("1", (width, height))   # Final image sent to display
+from framebuffer import Framebuffer, composite
+
+# Layers are packed 1-bit framebuffers in the panel's page order
+base_layer = Framebuffer(width, height)        # Static screen content
+base_layer_2 = Framebuffer(width, height)      # Alternative static content (e.g., clock)
+overlay_layer = Framebuffer(width, height)     # Temporary overlays (icons, cursors)
+
+# Compositing fills a back buffer under draw_lock; the transmitter thread sends it to
+# the panel as the front buffer with no lock held, so drawing continues during bus writes
+from display_backends import FrameTransmitter
+from display_commands import TimingStats
+
+frame_transmitter = FrameTransmitter(disp, base_layer.pages.shape)
+composite_timing = TimingStats()   # draw_lock hold time per frame
 
-# Drawing contexts for each layer
-base_draw = ImageDraw.Draw(base_layer)
-base_draw_2 = ImageDraw.Draw(base_layer_2)
-overlay_draw = ImageDraw.Draw(overlay_layer)
-composite_draw = ImageDraw.Draw(composite_layer)
+# Shared context for text measurement only
+measure_draw = ImageDraw.Draw(Image.new("1", (1, 1)))
+
+# Glyph-cached text sizes for get_text_size
+from text_metrics import TextMetrics
+
+text_metrics = TextMetrics()
+
+# Word wrap shared by the set_screen command and AppBase.set_screen, cached per text
+from text_layout import TextLayoutEngine
+from scroll_view import ScrollView
+
+text_layout = TextLayoutEngine(text_metrics.width)
 
 # Font setup
 padding = 2
@@ -588,15 +645,34 @@ def load_fonts():
 
 load_fonts()
 
-bodyFontSize = 12
+# Fonts are loaded on first use and shared between apps; apps can ask for any size
+# with context["get_font"](family, size, weight)
+from font_registry import FontRegistry, NamedFonts
+
+font_registry = FontRegistry({
+    "sans": {"regular": FONT_PATH, "bold": FONT_BOLD_PATH},
+    "pixel": {"regular": FONT_SMALL_PATH},
+})
 
-font = ImageFont.truetype(FONT_PATH, bodyFontSize)
-fontBold = ImageFont.truetype(FONT_BOLD_PATH, bodyFontSize)
+# Role names in context["fonts"]
+FONT_NAMES = {
+    "small": ("pixel", 4, "regular"),
+    "default": ("sans", 12, "regular"),
+    "bold": ("sans", 12, "bold"),
+    "large": ("sans", 24, "regular"),
+    "large_bold": ("sans", 24, "bold"),
+}
 
-fontLargeSize = 24
-fontLarge = ImageFont.truetype(FONT_PATH, fontLargeSize)
-fontLargeBold = ImageFont.truetype(FONT_BOLD_PATH, fontLargeSize)
-fontSmall = ImageFont.truetype(FONT_SMALL_PATH, 4)
+# The system draws set_screen text with the small font, so it always stays loaded
+fontSmall = font_registry.pin(*FONT_NAMES["small"])
+
+# Small text is blitted from pre-rasterized glyphs instead of going through FreeType.
+# The compiled font ships in assets/ and is rebuilt there if FONT_SMALL_PATH changes.
+from bitmap_font import load_or_compile
+from framebuffer import use_bitmap_font
+
+SMALL_BITMAP_FONT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "pixel_4.npz")
+use_bitmap_font(fontSmall, load_or_compile(fontSmall, SMALL_BITMAP_FONT_PATH))
 
 # --- Render composite display --- #
 # Track if display needs updating to avoid unnecessary redraws
@@ -607,13 +683,13 @@ def update_display(force=False):
     if not display_dirty and not force:
         return
         
+    frame = frame_transmitter.back_buffer()
     with draw_lock:
-        composite_layer.paste(base_layer)
-        composite_layer.paste(base_layer_2, (0, 0), base_layer_2)
-        composite_layer.paste(overlay_layer, (0, 0), overlay_layer)
-        disp.image(composite_layer)
-        disp.show()
+        start = time.perf_counter()
+        composite((base_layer, base_layer_2, overlay_layer), frame)
         display_dirty = False
+        composite_timing.record((time.perf_counter() - start) * 1000.0)
+    frame_transmitter.submit(frame)
 
 def mark_display_dirty():
     global display_dirty
@@ -621,53 +697,6 @@ def mark_display_dirty():
 
 # --- Display Functions (modified to use layers) --- #
 
-# Wrap text to fit screen width with caching
-_text_wrap_cache = {}
-
-def wrap_text_by_pixel_width(text, font, max_width):
-    # Use cache key to avoid recalculating same text
-    cache_key = (text, font, max_width)
-    if cache_key in _text_wrap_cache:
-        return _text_wrap_cache[cache_key]
-    
-    words = text.split(' ')
-    lines = []
-    current_line = ""
-
-    for word in words:
-        test_line = current_line + (" " if current_line else "") + word
-        width = base_draw.textlength(test_line, font=font)
-        if width <= max_width:
-            current_line = test_line
-        else:
-            if current_line:
-                lines.append(current_line)
-            # Only do character-by-character if word is actually too long
-            word_width = base_draw.textlength(word, font=font)
-            if word_width > max_width:
-                partial_word = ""
-                for char in word:
-                    test_partial = partial_word + char
-                    if base_draw.textlength(test_partial, font=font) <= max_width:
-                        partial_word = test_partial
-                    else:
-                        lines.append(partial_word)
-                        partial_word = char
-                if partial_word:
-                    current_line = partial_word
-            else:
-                current_line = word
-
-    if current_line:
-        lines.append(current_line)
-
-    # Cache result (limit cache size to prevent memory bloat)
-    if len(_text_wrap_cache) > 100:
-        _text_wrap_cache.clear()
-    _text_wrap_cache[cache_key] = lines
-    
-    return lines
-
 # Cursor state management
 cursor_width = 0  # Width of the cursor in pixels
 cursor_height = bodyLineHeight + 1
@@ -680,50 +709,94 @@ current_app_cursor_enabled = False  # Current app's cursor preference (default t
 cursor_state_changed = False  # Track if cursor state needs updating
 last_cursor_visible_state = False  # Track last visible state to avoid redundant updates
 
+# Body of the last set_screen command's screen, while that screen is still shown
+screen_view = None
+# Scroll views shown on the base layer (set_screen bodies, an app's own views) that
+# nothing has drawn over yet
+base_views = weakref.WeakSet()
+
+def detach_base_views(region=None):
+    """
+    Detach the base layer scroll views that overlap region (x0, y0, x1, y1, half-open),
+    or all of them, because something else has been drawn there: a late scroll (e.g.
+    following a TTS clip) must not paint them back over it.
+    """
+    global screen_view
+    for view in list(base_views):
+        if region is None or (view.x < region[2] and region[0] < view.x + view.width
+                              and view.y < region[3] and region[1] < view.y + view.height):
+            view.detach()
+            base_views.discard(view)
+    if screen_view is not None and screen_view.detached:
+        screen_view = None
+
+def show_base_view(view):
+    """Track a scroll view that is now shown on the base layer"""
+    if view is not None and view.layer != "overlay" and not view.detached:
+        base_views.add(view)
+
 def display_set_screen(title, text):
-    global lastDrawX, lastDrawY, prevDrawX, prevDrawY
+    global lastDrawX, lastDrawY, prevDrawX, prevDrawY, screen_view
     with draw_lock:
-        base_draw.rectangle((0, 0, width, height), outline=0, fill=0)
+        detach_base_views()
+        base_layer.clear()
         # Clear the cursor layer as well when setting a new screen
-        base_draw_2.rectangle((0, 0, width, height), outline=0, fill=0)
+        base_layer_2.clear()
         
-        wrapped_lines = wrap_text_by_pixel_width(text, fontSmall, width-4)
-        title_width = math.ceil(base_draw.textlength(title, fontSmall))
+        title_width = math.ceil(measure_draw.textlength(title, fontSmall))
         title_top = top
         title_height = fontSmall.getsize(title)[1]
-        base_draw.text((x + width/2 - title_width/2, title_top), title, font=fontSmall, fill=255)
+        base_layer.draw_text(fontSmall, title, x + width/2 - title_width/2, title_top)
 
+        # The body is rendered whole and scrolls (scroll_screen, or along with the TTS
+        # clip reading it) instead of being cut off at the bottom of the screen
         startY = top + title_height + padding
-        max_lines = (height - startY) // bodyLineHeight
-        for i in range(min(len(wrapped_lines), max_lines)):
-            base_draw.text((x, startY + i * bodyLineHeight), wrapped_lines[i], font=fontSmall, fill=255)
+        screen_view = ScrollView(display_queue, text_layout, get_text_size, fontSmall, x, startY,
+                                 width, height - startY, line_pitch=bodyLineHeight, wrap_width=width-4)
+        layout = screen_view.set_text(text, markup=False)
+        screen_view.draw_to(base_layer)
+        show_base_view(screen_view)
+        for i in range(min(len(layout.lines), screen_view.visible_lines)):
             # Store previous position before updating
             prevDrawY = lastDrawY
             prevDrawX = lastDrawX
             # Update cursor position
             lastDrawY = startY + i * bodyLineHeight
-            lastDrawX = base_draw.textlength(wrapped_lines[i], font=fontSmall)
+            lastDrawX = layout.widths[i]
         mark_display_dirty()
-        # Force immediate update for screen changes to prevent black screens
-        update_display(force=True)
 
 def display_draw_text(layer, font, text, x=0, y=0):
     with draw_lock:
-        layer.text((x, y), text, font=font, fill=255)
+        layer.draw_text(font, text, x, y)
         mark_display_dirty()
 
 def display_draw_icon(layer, icon_img, x=0, y=height - 8):
     with draw_lock:
         # Icon should already be converted to mode "1" from cache
-        if icon_img and icon_img.mode != "1":
-            icon_img = icon_img.convert("1")
         if icon_img:
-            layer.paste(icon_img, (x, y), icon_img)
+            layer.paste(icon_img, x, y)
+        mark_display_dirty()
+
+def display_replace_layer(layer, img):
+    """Swap a complete image into a layer in one step (no clear, no mask)"""
+    with draw_lock:
+        layer.replace(img)
         mark_display_dirty()
 
 def display_clear_area(layer, x=0, y=0, width=128, height=64):
     with draw_lock:
-        layer.rectangle((x, y, x + width, y + height), fill=0)
+        layer.fill_rect(x, y, x + width, y + height, 0)
+        mark_display_dirty()
+
+def display_toggle_area(layer, x=0, y=0, width=128, height=64):
+    with draw_lock:
+        layer.toggle_rect(x, y, x + width, y + height)
+        mark_display_dirty()
+
+def display_draw_batch(draw, *args):
+    """Run one batch primitive (a Framebuffer fill_rects/set_pixels/draw_lines/draw_texts)"""
+    with draw_lock:
+        draw(*args)
         mark_display_dirty()
 
 def display_draw_blinking_cursor(x, y, isOn):
@@ -735,26 +808,26 @@ def display_draw_blinking_cursor(x, y, isOn):
         # Clear previous cursor position if position changed
         if (int(x) != int(prevDrawX) or int(y) != int(prevDrawY)) and cursor_should_be_visible:
             # Clear old cursor position
-            base_draw_2.rectangle((int(prevDrawX)+2, int(prevDrawY), int(prevDrawX)+3, int(prevDrawY)+cursor_height), fill=0)
+            base_layer_2.fill_rect(int(prevDrawX)+2, int(prevDrawY), int(prevDrawX)+3, int(prevDrawY)+cursor_height, 0)
             prevDrawX = x
             prevDrawY = y
         
         # Only update if state actually changed or forced by isOn parameter
         if cursor_should_be_visible != last_cursor_visible_state or cursor_state_changed:
             if cursor_should_be_visible:
-                color = 255 if isOn else 0
-                base_draw_2.rectangle((int(x) + 1, int(y), int(x) + 1 + cursor_width, int(y) + cursor_height), fill=color)
+                color = 1 if isOn else 0
+                base_layer_2.fill_rect(int(x) + 1, int(y), int(x) + 1 + cursor_width, int(y) + cursor_height, color)
             else:
                 # Clear cursor area when disabled
-                base_draw_2.rectangle((int(x) + 1, int(y), int(x) + 1 + cursor_width, int(y) + cursor_height), fill=0)
+                base_layer_2.fill_rect(int(x) + 1, int(y), int(x) + 1 + cursor_width, int(y) + cursor_height, 0)
             
             last_cursor_visible_state = cursor_should_be_visible
             cursor_state_changed = False
             mark_display_dirty()
         elif cursor_should_be_visible:
             # Only blink if cursor is visible
-            color = 255 if isOn else 0
-            base_draw_2.rectangle((int(x) + 1, int(y), int(x) + 1 + cursor_width, int(y) + cursor_height), fill=color)
+            color = 1 if isOn else 0
+            base_layer_2.fill_rect(int(x) + 1, int(y), int(x) + 1 + cursor_width, int(y) + cursor_height, color)
             mark_display_dirty()
 
 def set_cursor_enabled(enabled):
@@ -776,7 +849,7 @@ def set_app_cursor_enabled(enabled):
         # If disabling cursor, immediately clear the cursor area
         if not enabled:
             with draw_lock:
-                base_draw_2.rectangle((0, 0, width, height), outline=0, fill=0)
+                base_layer_2.clear()
                 mark_display_dirty()
 
 def set_cursor_position(x, y):
@@ -794,89 +867,352 @@ def clear_cursor_area():
     global lastDrawX, lastDrawY, prevDrawX, prevDrawY
     with draw_lock:
         # Clear current cursor position
-        base_draw_2.rectangle((int(lastDrawX)+1, int(lastDrawY), int(lastDrawX)+1+cursor_width, int(lastDrawY)+cursor_height), fill=0)
+        base_layer_2.fill_rect(int(lastDrawX)+1, int(lastDrawY), int(lastDrawX)+1+cursor_width, int(lastDrawY)+cursor_height, 0)
         # Clear previous cursor position if different
         if prevDrawX != lastDrawX or prevDrawY != lastDrawY:
-            base_draw_2.rectangle((int(prevDrawX)+1, int(prevDrawY), int(prevDrawX)+1+cursor_width, int(prevDrawY)+cursor_height), fill=0)
+            base_layer_2.fill_rect(int(prevDrawX)+1, int(prevDrawY), int(prevDrawX)+1+cursor_width, int(prevDrawY)+cursor_height, 0)
         mark_display_dirty()
 
 # --- Display Thread --- #
 
+# Frames are composited and pushed to the panel at most this often
+DISPLAY_TARGET_FPS = 30.0
+CURSOR_BLINK_INTERVAL = 0.5
+# An open frame transaction older than this is committed anyway (e.g. the app crashed mid-frame)
+FRAME_TRANSACTION_TIMEOUT = 0.5
+
+# Nesting depth of begin_frame/commit_frame; nothing is pushed while a frame is open
+open_frames = 0
+frame_opened_at = 0.0
+
+from display_timers import TimerWheel
+
+# Timed display commands (cursor blink, overlay auto-clear, app animations). The wheel
+# ticks once per frame, so timers fire on frame boundaries of the display loop.
+display_timers = TimerWheel(1.0 / DISPLAY_TARGET_FPS)
+CURSOR_BLINK_TIMER = "cursor_blink"
+cursor_blink_on = False
+
+def set_display_target_fps(fps):
+    """Change the maximum rate at which frames are pushed to the panel"""
+    global DISPLAY_TARGET_FPS
+    DISPLAY_TARGET_FPS = max(1.0, float(fps))
+    if DISPLAY_BACKEND == "emulator" and not EMULATOR_FPS:
+        # The window keeps pace with the device rate, so game timing can be profiled on a desktop
+        disp.set_fps(DISPLAY_TARGET_FPS)
+
+def get_display_stats():
+    """Command queue depth/supersede/drop counts and, where available, bus transfer stats"""
+    stats = {
+        "queue": display_queue.stats(),
+        "commands": display_commands.stats(),
+        "lock_hold": composite_timing.as_dict(),
+        "transmit": frame_transmitter.stats(),
+        "text_metrics": text_metrics.stats(),
+        "text_layout": text_layout.stats(),
+        "fonts": font_registry.stats(),
+        "widgets": widget_stats(),
+    }
+    if hasattr(disp, "stats"):
+        stats["transfer"] = disp.stats()
+    return stats
+
+# --- Display Commands --- #
+
+from display_commands import DisplayCommandRegistry
+from canvas import Canvas
+from widgets import Screen as WidgetScreen
+
+display_commands = DisplayCommandRegistry()
+command = display_commands.register
+
+# Area of the status icon drawn by draw_icon, so clear_icon removes exactly that
+status_icon_area = None
+
+@command("draw_base_text")
+def cmd_draw_base_text(font, text, x, y):
+    display_draw_text(base_layer, font, text, x, y)
+
+@command("draw_overlay_text")
+def cmd_draw_overlay_text(font, text, x, y):
+    display_draw_text(overlay_layer, font, text, x, y)
+
+@command("draw_base_image")
+def cmd_draw_base_image(img, x, y):
+    display_draw_icon(base_layer, img, x, y)
+
+@command("draw_overlay_image")
+def cmd_draw_overlay_image(img, x, y):
+    display_draw_icon(overlay_layer, img, x, y)
+
+@command("replace_base_image")
+def cmd_replace_base_image(img):
+    detach_base_views()
+    display_replace_layer(base_layer, img)
+
+@command("show_screen")
+def cmd_show_screen(pages, cursor=None, view=None):
+    """
+    A whole base layer rasterized by the sender (AppBase.set_screen), plus the text
+    cursor position and the scroll view of the screen's body, if any
+    """
+    detach_base_views()
+    show_base_view(view)
+    with draw_lock:
+        np.copyto(base_layer.pages, pages)
+        mark_display_dirty()
+    if cursor is not None:
+        clear_cursor_area()
+        set_cursor_position(*cursor)
+
+# Batch primitives: one message carries many shapes as coordinate arrays/lists,
+# rasterized with a single unpack/pack of the touched pages
+
+@command("draw_base_rects")
+def cmd_draw_base_rects(rects, fill=1):
+    display_draw_batch(base_layer.fill_rects, rects, fill)
+
+@command("draw_overlay_rects")
+def cmd_draw_overlay_rects(rects, fill=1):
+    display_draw_batch(overlay_layer.fill_rects, rects, fill)
+
+@command("draw_base_pixels")
+def cmd_draw_base_pixels(points, fill=1):
+    display_draw_batch(base_layer.set_pixels, points, fill)
+
+@command("draw_overlay_pixels")
+def cmd_draw_overlay_pixels(points, fill=1):
+    display_draw_batch(overlay_layer.set_pixels, points, fill)
+
+@command("draw_base_lines")
+def cmd_draw_base_lines(lines, fill=1):
+    display_draw_batch(base_layer.draw_lines, lines, fill)
+
+@command("draw_overlay_lines")
+def cmd_draw_overlay_lines(lines, fill=1):
+    display_draw_batch(overlay_layer.draw_lines, lines, fill)
+
+@command("draw_base_texts")
+def cmd_draw_base_texts(runs, fill=1):
+    display_draw_batch(base_layer.draw_texts, runs, fill)
+
+@command("draw_overlay_texts")
+def cmd_draw_overlay_texts(runs, fill=1):
+    display_draw_batch(overlay_layer.draw_texts, runs, fill)
+
+@command("present_canvas")
+@command("present_overlay_canvas")
+def cmd_present_canvas(canvas):
+    """Copy the region an app presented from its Canvas into the canvas's layer"""
+    layer = overlay_layer if canvas.layer == "overlay" else base_layer
+    with draw_lock:
+        region = canvas.draw_to(layer)
+        if region:
+            mark_display_dirty()
+    if region and layer is base_layer:
+        detach_base_views(region)
+
+def create_canvas(layer="base"):
+    """Direct pixel access for apps that redraw every frame (see canvas.Canvas)"""
+    return Canvas(display_queue, width, height, layer)
+
+# Live widget screens, for the per-frame dirty area in get_display_stats
+widget_screens = weakref.WeakSet()
+
+def create_widget_screen(layer="base"):
+    """Root of a retained widget tree; only widgets that changed are redrawn (see widgets.Screen)"""
+    screen = WidgetScreen(display_queue, width, height, get_text_size, fontSmall, layer)
+    widget_screens.add(screen)
+    return screen
+
+def widget_stats():
+    """Rendered frames and dirty pixels across every widget screen"""
+    screens = list(widget_screens)
+    frames = sum(screen.frames for screen in screens)
+    total_area = sum(screen.total_area for screen in screens)
+    return {
+        "screens": len(screens),
+        "frames": frames,
+        "total_area": total_area,
+        "avg_area": total_area / frames if frames else None,
+        "max_area": max((screen.max_area for screen in screens), default=0),
+    }
+
+@command("set_screen")
+def cmd_set_screen(title, text):
+    display_set_screen(title, text)
+
+@command("present_scroll_view")
+def cmd_present_scroll_view(view):
+    """Copy a ScrollView's visible window into its layer (queued by the view when it scrolls; detached views draw nothing)"""
+    layer = overlay_layer if view.layer == "overlay" else base_layer
+    with draw_lock:
+        if view.draw_to(layer):
+            mark_display_dirty()
+    show_base_view(view)
+
+@command("scroll_screen")
+def cmd_scroll_screen(lines):
+    """Scroll the body of the last set_screen screen by lines (negative scrolls up)"""
+    if screen_view is not None:
+        screen_view.scroll_lines(lines)
+
+@command("follow_tts")
+def cmd_follow_tts(view=None, progress=None):
+    """Scroll view (default: the set_screen body) as far through its text as the playing TTS clip has got"""
+    view = view or screen_view
+    if view is None or view.detached:
+        return
+    if progress is None:
+        progress = get_tts_progress()
+    if progress is not None:
+        view.follow(progress)
+
+@command("draw_icon")
+def cmd_draw_icon(img, x=0, y=height - 8):
+    """Status icon (searching, generating, speaking) on the overlay, replacing the previous one"""
+    global status_icon_area
+    cmd_clear_icon()
+    display_draw_icon(overlay_layer, img, x, y)
+    status_icon_area = (x, y, img.width, img.height)
+
+@command("clear_icon")
+def cmd_clear_icon():
+    global status_icon_area
+    if status_icon_area:
+        x, y, w, h = status_icon_area
+        display_clear_area(overlay_layer, x, y, w - 1, h - 1)
+        status_icon_area = None
+
+@command("toggle_base_area")
+def cmd_toggle_base_area(x, y, width, height):
+    display_toggle_area(base_layer, x, y, width, height)
+
+@command("toggle_overlay_area")
+def cmd_toggle_overlay_area(x, y, width, height):
+    display_toggle_area(overlay_layer, x, y, width, height)
+
+@command("schedule_timer")
+def cmd_schedule_timer(key, delay, command, period=None):
+    """Run a display command after delay seconds (and every period seconds); replaces key"""
+    display_timers.schedule(key, delay, command, period)
+
+@command("cancel_timer")
+def cmd_cancel_timer(key):
+    display_timers.cancel(key)
+
+@command("blink_cursor")
+def cmd_blink_cursor():
+    global cursor_blink_on
+    cursor_blink_on = not cursor_blink_on
+    display_draw_blinking_cursor(lastDrawX, lastDrawY, cursor_blink_on)
+
+def sync_cursor_blink():
+    """Keep the periodic blink timer running only while the cursor is visible"""
+    cursor_should_be_visible = cursor_enabled and current_app_cursor_enabled
+    if cursor_should_be_visible and not display_timers.active(CURSOR_BLINK_TIMER):
+        display_timers.schedule(CURSOR_BLINK_TIMER, 0, ("blink_cursor",), period=CURSOR_BLINK_INTERVAL)
+    elif not cursor_should_be_visible and display_timers.active(CURSOR_BLINK_TIMER):
+        display_timers.cancel(CURSOR_BLINK_TIMER)
+
+@command("begin_frame")
+def cmd_begin_frame():
+    global open_frames, frame_opened_at
+    if open_frames == 0:
+        frame_opened_at = time.monotonic()
+    open_frames += 1
+
+@command("commit_frame")
+def cmd_commit_frame():
+    global open_frames
+    open_frames = max(0, open_frames - 1)
+
+@command("clear_base")
+def cmd_clear_base():
+    detach_base_views()
+    display_clear_area(base_layer, 0, 0, 128, 64)
+
+@command("clear_base_2")
+def cmd_clear_base_2():
+    display_clear_area(base_layer_2, 0, 0, 128, 64)
+
+@command("clear_base_area")
+def cmd_clear_base_area(x, y, width, height):
+    display_clear_area(base_layer, x, y, width, height)
+
+@command("clear_overlay_area")
+def cmd_clear_overlay_area(x, y, width, height):
+    display_clear_area(overlay_layer, x, y, width, height)
+
+@command("draw_cursor")
+def cmd_draw_cursor(x, y, isOn):
+    display_draw_blinking_cursor(x, y, isOn)
+
+command("set_cursor_enabled", set_cursor_enabled)
+command("set_app_cursor_enabled", set_app_cursor_enabled)
+command("set_cursor_position", set_cursor_position)
+command("clear_cursor_area", clear_cursor_area)
+
+@command("exit")
+def cmd_exit():
+    print("[Display Thread] Exiting on exit command", flush=True)
+    return False
+
+def handle_display_command(cmd):
+    """Apply a single display command to the layers. Returns False on exit."""
+    return display_commands.dispatch(cmd) is not False
+
 def display_thread_func():
+    global open_frames
     print("[Display Thread] Started", flush=True)
-    is_cursor_on = False
-    last_cursor_update = 0
-    last_display_update = 0
+    next_frame = time.monotonic()
 
     try:
         while True:
-            timeout = 0.1
+            # Sleep until a command arrives, or until the next timer / pending frame is due
+            deadlines = []
+            if open_frames:
+                deadlines.append(frame_opened_at + FRAME_TRANSACTION_TIMEOUT)
+            elif display_dirty or cursor_state_changed:
+                deadlines.append(next_frame)
+            timer_deadline = display_timers.next_deadline()
+            if timer_deadline is not None:
+                deadlines.append(timer_deadline)
+            timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
 
             try:
                 cmd = display_queue.get(timeout=timeout)
             except queue.Empty:
                 cmd = None
 
-            if cmd:
-                # print(f"[Display] Command received: {cmd}", flush=True)
-                match cmd[0]:
-                    case "draw_base_text":
-                        _, font, text, x, y = cmd
-                        display_draw_text(base_draw, font, text, x, y)
-                    case "draw_overlay_text":
-                        _, font, text, x, y = cmd
-                        display_draw_text(overlay_draw, font, text, x, y)
-                    case "draw_base_image":
-                        _, img, x, y = cmd
-                        display_draw_icon(base_layer, img, x, y)
-                    case "draw_overlay_image":
-                        _, img, x, y = cmd
-                        display_draw_icon(overlay_layer, img, x, y)
-                    case "clear_base":
-                        display_clear_area(base_draw, 0, 0, 128, 64)
-                        # Force immediate update for full screen clears
-                        update_display(force=True)
-                    case "clear_base_2":
-                        display_clear_area(base_draw_2, 0, 0, 128, 64)
-                        # Force immediate update for cursor layer clears
-                        update_display(force=True)
-                    case "clear_base_area":
-                        _, x, y, width, height = cmd
-                        display_clear_area(base_draw, x, y, width, height)
-                    case "clear_overlay_area":
-                        _, x, y, width, height = cmd
-                        display_clear_area(overlay_draw, x, y, width, height)
-                    case "draw_cursor":
-                        _, x, y, isOn = cmd
-                        display_draw_blinking_cursor(x, y, isOn)
-                    case "set_cursor_enabled":
-                        _, enabled = cmd
-                        set_cursor_enabled(enabled)
-                    case "set_app_cursor_enabled":
-                        _, enabled = cmd
-                        set_app_cursor_enabled(enabled)
-                    case "set_cursor_position":
-                        _, x, y = cmd
-                        set_cursor_position(x, y)
-                    case "clear_cursor_area":
-                        clear_cursor_area()
-                    case "exit":
-                        print("[Display Thread] Exiting on exit command", flush=True)
-                        break
+            # Apply the queued backlog so it lands in a single frame
+            if cmd is not None and not display_queue.drain(
+                    cmd, handle_display_command,
+                    lambda: display_dirty and not open_frames and time.monotonic() >= next_frame):
+                return
 
-            now = time.time()
-            # Cursor blinking - only if cursor is enabled and visible
-            cursor_should_be_visible = cursor_enabled and current_app_cursor_enabled
-            if cursor_should_be_visible and now - last_cursor_update > 0.5:
-                is_cursor_on = not is_cursor_on
-                display_draw_blinking_cursor(lastDrawX, lastDrawY, is_cursor_on)
-                last_cursor_update = now
-            elif cursor_state_changed:
+            # Pick up frame rate changes made from other threads
+            if display_timers.tick_interval != 1.0 / DISPLAY_TARGET_FPS:
+                display_timers.set_tick_interval(1.0 / DISPLAY_TARGET_FPS)
+
+            # Run due timers (cursor blinking among them)
+            sync_cursor_blink()
+            now = time.monotonic()
+            for timer_cmd in display_timers.expire(now):
+                if not handle_display_command(timer_cmd):
+                    return
+            if cursor_state_changed:
                 # Handle cursor state changes immediately
                 display_draw_blinking_cursor(lastDrawX, lastDrawY, False)
-            
-            update_display()
-            last_display_update = now
+
+            if open_frames and now - frame_opened_at >= FRAME_TRANSACTION_TIMEOUT:
+                print("[Display Thread] Frame transaction timed out, committing", flush=True)
+                open_frames = 0
+
+            # Composite and transmit at most once per frame, never in the middle of an open one
+            if display_dirty and not open_frames and now >= next_frame:
+                update_display()
+                next_frame = display_timers.next_tick_time(now)
 
     except Exception as e:
         print(f"[Display Thread] Crashed with exception: {e}", flush=True)
@@ -908,52 +1244,203 @@ def hash_text(text):
 if IS_WINDOWS:
     pygame.mixer.init(frequency=22050, size=-16, channels=1)
 
-def wrap_raw_audio_as_wav(raw_bytes, sample_rate=22050):
-    buffer = io.BytesIO()
-    with wave.open(buffer, 'wb') as wav_file:
-        wav_file.setnchannels(1)
-        wav_file.setsampwidth(2)  # 16-bit
-        wav_file.setframerate(sample_rate)
-        wav_file.writeframes(raw_bytes)
-    buffer.seek(0)
-    return buffer
-
-def play_audio_sync(audio_bytes):
+# Bytes handed to the output engine per write (~186ms of 22050Hz S16 mono)
+AUDIO_BLOCK_SIZE = 8192
+
+def iter_audio_blocks(buffer, block_size=AUDIO_BLOCK_SIZE):
+    """Yield zero-copy memoryview slices of buffer, block_size bytes at a time"""
+    with memoryview(buffer) as view:
+        for offset in range(0, len(view), block_size):
+            yield view[offset:offset + block_size]
+
+APLAY_FORMATS = {1: "U8", 2: "S16_LE"}
+# aplay start delay (-R, microseconds); tune against get_audio_stats() latency/underruns
+APLAY_START_DELAY_US = 400
+
+def start_aplay(args, record=None, **kwargs):
+    """
+    Start aplay with its stderr read on a thread. Each "underrun!!!" it reports is
+    counted on record; other messages are passed on to the log. Returns the
+    process and the reader thread (join it after the process ends).
+    """
+    proc = subprocess.Popen(["aplay"] + args, stderr=subprocess.PIPE, **kwargs)
+
+    def read_errors():
+        for line in proc.stderr:
+            message = line.decode("utf-8", "replace").strip()
+            if "underrun" in message:
+                if record:
+                    record.device_underrun()
+            elif message:
+                print(f"[Audio] aplay: {message}", flush=True)
+
+    reader = threading.Thread(target=read_errors, daemon=True, name="AplayErrors")
+    reader.start()
+    return proc, reader
+
+def play_audio_blocks(blocks, sample_rate=22050, channels=1, sample_width=2, record=None):
+    """Stream raw PCM blocks into the output engine (Windows expects the mixer's format)"""
+    byte_rate = sample_rate * channels * sample_width
     if IS_WINDOWS:
         try:
-            wav_buf = wrap_raw_audio_as_wav(audio_bytes)
-            sound = pygame.mixer.Sound(wav_buf)
-            channel = sound.play()
-            while channel.get_busy():
+            channel = None
+            playing = []  # Keep queued sounds alive until the mixer is done with them
+            for block in blocks:
+                sound = pygame.mixer.Sound(buffer=block)
+                sound.set_volume(volume_service.software_gain)
+                if channel is None:
+                    if record:
+                        record.before_write()
+                    channel = sound.play()
+                    playing = [sound]
+                    if record:
+                        record.after_write(len(block), byte_rate)
+                    continue
+                # The channel holds one queued sound; wait for that slot to free up
+                while channel.get_queue() is not None:
+                    pygame.time.wait(5)
+                if record:
+                    record.before_write()
+                channel.queue(sound)
+                playing = playing[-1:] + [sound]
+                if record:
+                    record.after_write(len(block), byte_rate)
+            while channel is not None and channel.get_busy():
                 pygame.time.wait(10)
         except Exception as e:
             print(f"[Audio] Pygame playback error: {e}", flush=True)
     else:
         try:
-            proc = subprocess.Popen([
-                "timeout", "5",
-                "aplay", "-R", "400", "-r", "22050", "-f", "S16_LE", "-t", "raw", "-"
-            ], stdin=subprocess.PIPE)
-            proc.communicate(input=audio_bytes)
+            # aplay ends at the end of its input, so clips of any length play in full
+            proc, reader = start_aplay([
+                "-R", str(APLAY_START_DELAY_US), "-r", str(sample_rate), "-c", str(channels),
+                "-f", APLAY_FORMATS[sample_width], "-t", "raw", "-"
+            ], record, stdin=subprocess.PIPE)
+            try:
+                for block in blocks:
+                    block = apply_software_gain(block, volume_service.software_gain, sample_width)
+                    if record:
+                        record.before_write()
+                    proc.stdin.write(block)
+                    if record:
+                        record.after_write(len(block), byte_rate)
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass  # aplay exited early
+            proc.wait()
+            reader.join(timeout=1.0)
         except Exception as e:
             print(f"[Audio] aplay error: {e}", flush=True)
 
-def run_tts(text, background=False):
+def play_audio_sync(audio_bytes, record=None):
+    play_audio_blocks(iter_audio_blocks(audio_bytes), record=record)
+
+def open_pcm_wav(path):
+    """Open a WAV file whose frames can be streamed as U8/S16 PCM, or return None"""
+    try:
+        wav = wave.open(path, "rb")
+    except (wave.Error, EOFError):
+        return None  # e.g. float or WAVE_FORMAT_EXTENSIBLE files
+    if wav.getsampwidth() not in APLAY_FORMATS:
+        wav.close()
+        return None
+    return wav
+
+def play_wav_file(path, record=None):
+    """
+    Play a WAV file. aplay reads the file itself unless software gain is needed,
+    in which case 8/16-bit PCM frames are streamed through the gain in blocks.
+    Other formats play without gain.
+    """
+    wav = open_pcm_wav(path) if volume_service.software_gain < 1.0 else None
+    if wav is None:
+        if record:
+            record.before_write()
+        proc, reader = start_aplay([path], record)
+        proc.wait()
+        reader.join(timeout=1.0)
+        return
+
+    with wav:
+        frame_size = wav.getsampwidth() * wav.getnchannels()
+        frames_per_block = max(1, AUDIO_BLOCK_SIZE // frame_size)
+
+        def blocks():
+            while True:
+                chunk = wav.readframes(frames_per_block)
+                if not chunk:
+                    return
+                yield chunk
+
+        play_audio_blocks(blocks(), wav.getframerate(), wav.getnchannels(), wav.getsampwidth(), record)
+
+def play_audio_file(path, record=None):
+    """Play a cached raw clip straight from a memory map, one block at a time"""
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                blocks = iter_audio_blocks(mapped)
+                try:
+                    play_audio_blocks(blocks, record=record)
+                finally:
+                    # Release the memoryview before the map is closed
+                    blocks.close()
+    except Exception as e:
+        print(f"[Audio] Error playing cached clip '{path}': {e}", flush=True)
+
+def get_audio_stats():
+    """Summary of recent sound start latencies, writer lead, late writes and underruns"""
+    return audio_stats.summary()
+
+# Piper's raw output (and so the cached .raw clips): 22050Hz mono S16
+TTS_BYTE_RATE = 22050 * 1 * 2
+# While a clip plays, the text it reads is scrolled along with it this often
+TTS_SCROLL_TIMER = "tts_scroll"
+TTS_SCROLL_INTERVAL = 0.1
+
+def get_tts_progress():
+    """Fraction (0-1) of the playing TTS clip heard so far, or None when none is playing"""
+    record = audio_stats.playing("tts")
+    return record.progress() if record is not None else None
+
+def play_tts_clip(play, source, record, follow=False, scroll_view=None):
+    """
+    Play a TTS clip and wait for it. With follow, scroll_view (by default the
+    set_screen body) scrolls through the text along with the clip.
+    """
+    if follow:
+        display_queue.put(("schedule_timer", TTS_SCROLL_TIMER, 0, ("follow_tts", scroll_view), TTS_SCROLL_INTERVAL))
+    play_thread = threading.Thread(target=play, args=(source, record))
+    play_thread.start()
+    play_thread.join()
+    audio_stats.finish(record)
+    if follow:
+        display_queue.put(("cancel_timer", TTS_SCROLL_TIMER))
+        # End on the last line even if the final timer tick came before the clip ended
+        display_queue.put(("follow_tts", scroll_view, 1.0))
+
+def run_tts(text, background=False, scroll_view=None):
+    """
+    Speak text, from the cache if it was spoken before. Unless background, the text
+    is shown on a set_screen screen that scrolls along with the speech; an app
+    showing the text itself can pass its own ScrollView to have that scrolled.
+    """
     if not text.strip():
         return
+    follow = not background or scroll_view is not None
     
+    requested_at = time.monotonic()
     cached_file = os.path.join(CACHE_DIR, hash_text(text) + ".raw")
 
     if os.path.exists(cached_file):
-        with open(cached_file, "rb") as f:
-            audio_data = f.read()
-
         if not background:
             display_queue.put(("set_screen", "Cached", text))
             display_queue.put(("draw_icon", speaking_icon, 0, height - 8))
-        play_thread = threading.Thread(target=play_audio_sync, args=(audio_data,))
-        play_thread.start()
-        play_thread.join()
+        duration = os.path.getsize(cached_file) / TTS_BYTE_RATE
+        record = audio_stats.begin("tts", "cached", requested_at, duration)
+        play_tts_clip(play_audio_file, cached_file, record, follow, scroll_view)
         if not background:
             display_queue.put(("clear_icon",))
 
@@ -975,9 +1462,9 @@ def run_tts(text, background=False):
                 if not background:
                     display_queue.put(("set_screen", "Talking", text))
                     display_queue.put(("draw_icon", speaking_icon, 0, height - 8))
-                play_thread = threading.Thread(target=play_audio_sync, args=(raw_audio,))
-                play_thread.start()
-                play_thread.join()
+                # Latency for a cache miss includes synthesis time
+                record = audio_stats.begin("tts", "generated", requested_at, len(raw_audio) / TTS_BYTE_RATE)
+                play_tts_clip(play_audio_sync, raw_audio, record, follow, scroll_view)
                 if not background:
                     display_queue.put(("clear_icon",))
             else:
@@ -1010,55 +1497,13 @@ def find_keyboard():
     return None
 
 
-if IS_WINDOWS:
-    import keyboard
-    from config.emulator.win_keycodes import WIN_TO_LINUX_KEYCODE
-
-    class ecodes:
-        EV_KEY = 1
-
-    EV_KEY = ecodes.EV_KEY
-    KEY_DOWN = 1
-    KEY_UP = 0
-
-    class EvdevLikeEvent:
-        def __init__(self, kb_event):
-            self.type = EV_KEY
-            self.code = kb_event.scan_code
-            self.value = KEY_DOWN if kb_event.event_type == "down" else KEY_UP
-            self.name = kb_event.name
-
-    class KeyEvent:
-        # Similar to evdev.KeyEvent
-        def __init__(self, event):
-            self.event = event
-            self.scancode = event.code
-            self.keystate = event.value  # 1=down, 0=up
-
-        @property
-        def keycode(self):
-            # Map the Windows keyboard event name to Linux KEY_* string
-            keyname = self.event.name.lower()
-            return WIN_TO_LINUX_KEYCODE.get(keyname, self.event.name.upper())
-        
-        def __repr__(self):
-            return f"<KeyEvent keycode={self.keycode} keystate={self.keystate}>"
-
-    def categorize(event):
-        # Only handle EV_KEY events for now
-        if event.type == EV_KEY:
-            return KeyEvent(event)
-        return event
-
-    class WindowsInputDevice:
-        def read_loop(self):
-            while True:
-                kb_event = keyboard.read_event()
-                if kb_event.event_type in ("down", "up"):
-                    yield EvdevLikeEvent(kb_event)
-
+if DISPLAY_BACKEND == "headless":
     def wait_for_keyboard():
-        return WindowsInputDevice()
+        print(f"[Input] Reading keys from {INPUT_SCRIPT if INPUT_SCRIPT not in (None, '-') else 'stdin'}", flush=True)
+        return ScriptedInputDevice(INPUT_SCRIPT)
+elif DISPLAY_BACKEND == "emulator":
+    def wait_for_keyboard():
+        return disp.keyboard()
 else:
     import evdev
     def wait_for_keyboard(max_retries=24, retry_delay=2.5):
@@ -1078,29 +1523,18 @@ else:
 
         return None
 
-# Utility function for getting text dimensions using modern getbbox method
+# Text dimensions from the shared glyph metrics cache (same results as textbbox)
 def get_text_size(text, font):
-    """
-    Get text width and height using the modern getbbox method.
-    Returns (width, height) tuple for compatibility with the old textsize method.
-    """
-    # Handle None or empty text
-    if not text:
-        return 0, 0
-        
-    from PIL import ImageDraw
-    # Create a temporary image to get text bbox
-    temp_img = Image.new("1", (1, 1))
-    temp_draw = ImageDraw.Draw(temp_img)
-    bbox = temp_draw.textbbox((0, 0), text, font=font)
-    width = bbox[2] - bbox[0]
-    height = bbox[3] - bbox[1]
-    return width, height
+    """Returns (width, height) of text's bounding box, (0, 0) for empty text"""
+    return text_metrics.size(text, font)
 
 def main():
     # Start display thread
     disp_thread = threading.Thread(target=display_thread_func, daemon=True)
     disp_thread.start()
+
+    # Periodic audio latency/underrun summaries in the log
+    audio_stats.start_logging()
     
     # Ensure required files and folders exist
     if not os.path.exists(CACHE_DIR):
@@ -1127,7 +1561,8 @@ def main():
     keys_pressed = set()
     
     context = {
-        "emulator": IS_WINDOWS,
+        "emulator": DISPLAY_BACKEND == "emulator",
+        "display_backend": DISPLAY_BACKEND,
         "display": disp,
         "screen_width": width,
         "screen_height": height,
@@ -1140,14 +1575,14 @@ def main():
             "play_music": play_music,
             "stop_music": stop_music,
             "set_music_volume": set_music_volume,
+            "set_volume": set_volume,
+            "get_volume": volume_service.get_volume,
+            "get_stats": get_audio_stats,
+            "get_recent_stats": audio_stats.recent,
+            "get_tts_progress": get_tts_progress,
         },
-        "fonts": {
-            "small": fontSmall,
-            "default": font,
-            "bold": fontBold,
-            "large": fontLarge,
-            "large_bold": fontLargeBold,
-        },
+        "fonts": NamedFonts(font_registry, FONT_NAMES),
+        "get_font": font_registry.get_font,
         "apps": {
             "all": apps,
             "load": load_app_instance,
@@ -1160,7 +1595,12 @@ def main():
             "clear_area": lambda: display_queue.put(("clear_cursor_area",)),
             "clear_layer": lambda: display_queue.put(("clear_base_2",)),  # Clear entire cursor layer
         },
+        "set_display_fps": set_display_target_fps,
+        "get_display_stats": get_display_stats,
+        "create_canvas": create_canvas,
+        "create_widget_screen": create_widget_screen,
         "get_text_size": get_text_size,
+        "text_layout": text_layout,
         "hash_text": hash_text,
         "FONT_PATH": FONT_PATH,
         "CACHE_DIR": CACHE_DIR,
@@ -1232,6 +1672,10 @@ def main():
                     time.sleep(1)
                 else:
                     raise  # Only ignore known disconnection errors
+
+            if getattr(dev, "finished", False):
+                print(f"[Input] {dev.name} finished", flush=True)
+                break
     except KeyboardInterrupt:
         print("Exiting on KeyboardInterrupt...")
     finally:
@@ -1239,10 +1683,9 @@ def main():
         if 'app_manager' in locals():
             app_manager.stop_all_apps()
         
-        # Clean up display
+        # Clean up display once the last frame has gone out
+        frame_transmitter.stop()
         disp.stop()  # Call our wrapper's stop method which calls cleanup()
 
 if __name__ == "__main__":
-    if not is_admin():
-        print("⚠️ This script needs to be run as Administrator on Windows.")
     main()
\ No newline at end of file
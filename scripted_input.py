@@ -0,0 +1,86 @@
+import sys
+import time
+
+EV_KEY = 1
+KEY_UP = 0
+KEY_DOWN = 1
+
+
+class ecodes:
+    EV_KEY = EV_KEY
+
+
+class KeyEvent:
+    """An already categorized key event, shaped like evdev's KeyEvent"""
+
+    type = EV_KEY
+
+    def __init__(self, keycode, keystate):
+        self.keycode = keycode
+        self.keystate = keystate
+        self.value = keystate
+
+    def __repr__(self):
+        return f"<KeyEvent keycode={self.keycode} keystate={self.keystate}>"
+
+
+def categorize(event):
+    return event
+
+
+class ScriptedInputDevice:
+    """
+    Key input read from a script (a file, or stdin when typed or piped), for
+    headless runs. One instruction per line:
+
+        KEY_A                   press and release (a bare "a" means KEY_A)
+        KEY_LEFTSHIFT+KEY_A     hold the keys in order, release them in reverse
+        down KEY_X / up KEY_X   only press or only release
+        wait 0.5                pause for that many seconds
+        quit                    end the input (as does the end of the script)
+
+    Blank lines and lines starting with # are skipped. key_delay is the pause
+    after every key event, so app threads see presses in real time.
+    """
+
+    name = "Scripted input"
+
+    def __init__(self, source=None, key_delay=0.05):
+        self.source = source
+        self.key_delay = key_delay
+        self.finished = False
+
+    def read_loop(self):
+        if self.source in (None, "-"):
+            yield from self._run(sys.stdin)
+        else:
+            with open(self.source, encoding="utf-8") as f:
+                yield from self._run(f)
+        self.finished = True
+
+    def _run(self, lines):
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            words = line.split()
+            action = words[0].lower()
+            if action == "quit":
+                return
+            if action == "wait":
+                time.sleep(float(words[1]) if len(words) > 1 else 1.0)
+                continue
+            if action in ("down", "up") and len(words) > 1:
+                events = [KeyEvent(_keycode(words[1]), KEY_DOWN if action == "down" else KEY_UP)]
+            else:
+                keys = [_keycode(key) for key in line.replace(" ", "").split("+")]
+                events = [KeyEvent(key, KEY_DOWN) for key in keys]
+                events += [KeyEvent(key, KEY_UP) for key in reversed(keys)]
+            for event in events:
+                yield event
+                time.sleep(self.key_delay)
+
+
+def _keycode(name):
+    name = name.strip().upper()
+    return name if name.startswith("KEY_") else "KEY_" + name
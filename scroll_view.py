@@ -0,0 +1,190 @@
+import queue
+import threading
+
+import numpy as np
+
+from canvas import PRESENT_TIMEOUT
+from framebuffer import Framebuffer, unpack_bits
+from text_layout import TextLayout, draw_layout
+
+SCROLL_KEYS = {"KEY_UP": -1, "KEY_DOWN": 1}
+PAGE_KEYS = {"KEY_PAGEUP": -1, "KEY_PAGEDOWN": 1}
+
+
+class ScrollView:
+    """
+    Text that may be taller than the area it is shown in.
+
+    set_text() lays out the whole text (no line limit) and rasterizes it once
+    into an off-screen strip as tall as the text. The viewport shows height
+    rows of the strip from offset down, so scrolling only copies a different
+    window of the strip into the layer: no relayout, no text drawing.
+    Lines in the text ("\\n") start new paragraphs.
+
+    Like Canvas, scrolls from any thread queue at most one present_scroll_view
+    command until the display thread has drawn it (with draw_to). Once a newer
+    screen has replaced the view, detach() it so late scrolls (e.g. the last
+    step of following a TTS clip) are not drawn over that screen.
+    """
+
+    def __init__(self, display_queue, layout_engine, get_text_size, font, x, y, width, height,
+                 line_pitch=6, wrap_width=None, layer="base"):
+        self.display_queue = display_queue
+        self.layout_engine = layout_engine
+        self.get_text_size = get_text_size
+        self.font = font
+        self.x, self.y = x, y
+        self.width, self.height = width, height
+        self.line_pitch = line_pitch
+        self.wrap_width = width if wrap_width is None else wrap_width
+        self.layer = layer
+
+        self.layout = TextLayout((), (), False)
+        self.content_height = 0
+        self._strip = Framebuffer(width, _round_up(height, 8))
+        self._offset = 0
+        self._lock = threading.Lock()
+        self._dirty = True     # The window changed since it was last drawn
+        self._queued = False   # A present_scroll_view command is waiting
+        self.detached = False  # Replaced on screen; never drawn again
+
+    # --- Content --- #
+
+    def set_text(self, text, markup=True):
+        """Lay out and rasterize text, and scroll back to the top (call present() to show it)"""
+        lines, widths = [], []
+        for paragraph in text.split("\n"):
+            layout = self.layout_engine.layout(paragraph, self.font, self.wrap_width, markup=markup)
+            lines.extend(layout.lines)
+            widths.extend(layout.widths)
+        layout = TextLayout(tuple(lines), tuple(widths), False)
+
+        # Highlights and descenders reach below the last line's pitch, so leave a margin
+        # and measure the real height from the ink
+        strip = Framebuffer(self.width, _round_up(max(self.height, (len(lines) + 2) * self.line_pitch), 8))
+        if markup:
+            draw_layout(strip, layout, self.font, 0, 0, self.line_pitch, self.get_text_size)
+        else:
+            # Plain text goes down a line at a time, each line as one string
+            strip.draw_texts([(self.font, line, 0, row * self.line_pitch)
+                              for row, line in enumerate(layout.line_texts()) if line.strip()])
+        inked = np.flatnonzero(strip.pages.any(axis=1))
+        content_height = 0
+        if len(inked):
+            last_page = int(inked[-1])
+            rows = unpack_bits(strip.pages[last_page:last_page + 1]).any(axis=1)
+            content_height = last_page * 8 + int(np.flatnonzero(rows)[-1]) + 1
+
+        with self._lock:
+            self.layout = layout
+            self.content_height = content_height
+            self._strip = strip
+            self._offset = 0
+            self._dirty = True
+        return layout
+
+    @property
+    def offset(self):
+        return self._offset
+
+    @property
+    def max_offset(self):
+        return max(0, self.content_height - self.height)
+
+    @property
+    def visible_lines(self):
+        """Lines that fit in the viewport at once"""
+        return max(1, self.height // self.line_pitch)
+
+    def at_end(self):
+        return self._offset >= self.max_offset
+
+    # --- Scrolling --- #
+
+    def scroll_to(self, offset):
+        """Show the strip from row offset (clamped); returns True if the view moved"""
+        offset = max(0, min(self.max_offset, int(offset)))
+        with self._lock:
+            if offset == self._offset:
+                return False
+            self._offset = offset
+            self._dirty = True
+        self.present()
+        return True
+
+    def scroll_by(self, pixels):
+        return self.scroll_to(self._offset + pixels)
+
+    def scroll_lines(self, count):
+        """Scroll by whole lines, snapping the top of the view to a line"""
+        line = -(-self._offset // self.line_pitch) if count < 0 else self._offset // self.line_pitch
+        return self.scroll_to((line + count) * self.line_pitch)
+
+    def page(self, count):
+        """Scroll by count screens, keeping one line of the last screen in view"""
+        return self.scroll_lines(count * max(1, self.visible_lines - 1))
+
+    def follow(self, progress):
+        """
+        Scroll to a fraction (0-1) of the way through the text, e.g. how much of a
+        clip reading it has played. The line being read moves from the top of the
+        view to the bottom as the view moves from the start to the end.
+        """
+        return self.scroll_to(round(max(0.0, min(1.0, progress)) * self.max_offset))
+
+    def handle_key(self, keycode):
+        """Up/Down scroll a line, Page Up/Down a screen; returns True if the key was used"""
+        if keycode in SCROLL_KEYS:
+            self.scroll_lines(SCROLL_KEYS[keycode])
+        elif keycode in PAGE_KEYS:
+            self.page(PAGE_KEYS[keycode])
+        else:
+            return False
+        return True
+
+    # --- Presenting --- #
+
+    def window(self):
+        """The visible rows of the strip as a (height, width) bool array"""
+        offset = self._offset
+        page_start = offset // 8
+        page_end = (offset + self.height - 1) // 8 + 1
+        rows = unpack_bits(self._strip.pages[page_start:page_end])
+        top = offset - page_start * 8
+        return rows[top:top + self.height]
+
+    def detach(self):
+        """Stop drawing the view, for when another screen has replaced it"""
+        with self._lock:
+            self.detached = True
+            self._dirty = False
+
+    def present(self):
+        """Queue the view to be drawn (one command until the display thread gets to it)"""
+        with self._lock:
+            if self.detached:
+                return
+            self._dirty = True
+            if self._queued:
+                return
+            self._queued = True
+        try:
+            self.display_queue.put(("present_scroll_view", self), timeout=PRESENT_TIMEOUT)
+        except queue.Full:
+            # Dropped: the next present queues it again
+            with self._lock:
+                self._queued = False
+
+    def draw_to(self, layer):
+        """Copy the visible window into a Framebuffer if it changed; returns True if drawn"""
+        with self._lock:
+            self._queued = False
+            if not self._dirty or self.detached:
+                return False
+            self._dirty = False
+            layer.blit(self.window(), self.x, self.y, "copy")
+        return True
+
+
+def _round_up(value, multiple):
+    return -(-value // multiple) * multiple
@@ -0,0 +1,26 @@
+import os
+import sys
+
+import pytest
+
+# The modules live at the top of the checkout, not in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="module")
+def proxitalk():
+    """The display side of proxitalk on the in-memory display"""
+    os.environ["PROXITALK_DISPLAY"] = "headless"
+    import proxitalk
+    proxitalk.set_app_cursor_enabled(True)
+    return proxitalk
+
+
+class Applied:
+    """A display queue whose commands are applied straight to proxitalk's layers"""
+
+    def __init__(self, proxitalk):
+        self.proxitalk = proxitalk
+
+    def put(self, command, block=True, timeout=None):
+        self.proxitalk.handle_display_command(command)
@@ -0,0 +1,30 @@
+from audio_stats import AudioStats
+
+
+def test_writer_lead_and_late_writes():
+    stats = AudioStats()
+    record = stats.begin("tts", "clip", requested_at=9.9)
+    record.before_write(now=10.0)
+    record.after_write(44100, 44100)   # 1 s of audio written at once
+    record.before_write(now=10.25)     # 0.75 s ahead of the wall clock
+    record.after_write(44100, 44100)
+    record.before_write(now=12.5)      # 0.5 s behind: Python fell behind realtime
+    stats.finish(record)
+
+    assert round(record.start_latency_ms) == 100
+    assert record.lead_min_ms == 0.0
+    assert record.lead_max_ms == 750.0
+    assert record.late_writes == 1
+    assert record.underruns == 0
+
+
+def test_underruns_come_from_the_output_engine():
+    stats = AudioStats()
+    record = stats.begin("sfx", "beep")
+    record.device_underrun()
+    record.device_underrun()
+    stats.finish(record)
+    summary = stats.summary()
+    assert summary["underruns"] == summary["total_underruns"] == 2
+    assert summary["late_writes"] == 0
+    assert "underruns 2" in stats.format_summary()
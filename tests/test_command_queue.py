@@ -0,0 +1,179 @@
+import queue
+
+import pytest
+
+import canvas
+import scroll_view
+from command_queue import DisplayCommandQueue
+from framebuffer import Framebuffer
+
+
+def drain(q):
+    names = []
+    while not q.empty():
+        names.append(q.get_nowait()[0])
+    return names
+
+
+def test_full_layer_command_supersedes_earlier_draws_on_that_layer():
+    q = DisplayCommandQueue()
+    q.put(("draw_base_text", None, "a", 0, 0))
+    q.put(("clear_base_2",))
+    q.put(("draw_base_rects", [(0, 0, 1, 1)]))
+    q.put(("set_cursor_position", 1, 1))
+    q.put(("replace_base_image", None))
+    q.put(("draw_base_text", None, "b", 0, 0))
+    assert q.qsize() == 4
+    assert drain(q) == ["clear_base_2", "set_cursor_position", "replace_base_image", "draw_base_text"]
+    assert q.stats()["superseded"] == 2
+
+
+def test_full_layer_commands_supersede_each_other():
+    q = DisplayCommandQueue()
+    for _ in range(10):
+        q.put(("show_screen", None, None))
+    assert drain(q) == ["show_screen"]
+    assert q.stats()["superseded"] == 9
+
+
+def test_overlay_commands_jump_the_queue():
+    q = DisplayCommandQueue()
+    q.put(("draw_base_text", None, "a", 0, 0))
+    q.put(("draw_overlay_rects", [(0, 0, 1, 1)]))
+    q.put(("set_cursor_position", 1, 1))
+    q.put(("clear_overlay_area", 0, 0, 1, 1))
+    assert drain(q) == ["draw_overlay_rects", "clear_overlay_area", "draw_base_text", "set_cursor_position"]
+
+
+def test_emptied_frames_are_collapsed():
+    q = DisplayCommandQueue()
+    q.put(("begin_frame",))
+    q.put(("draw_base_text", None, "a", 0, 0))
+    q.put(("commit_frame",))
+    q.put(("begin_frame",))
+    q.put(("clear_base",))
+    q.put(("commit_frame",))
+    # The first frame only held a superseded draw, so nothing of it is left
+    assert drain(q) == ["begin_frame", "clear_base", "commit_frame"]
+
+
+def test_full_queue_drops_instead_of_growing():
+    q = DisplayCommandQueue(maxsize=2, put_timeout=0.01)
+    q.put(("draw_base_text", None, "a", 0, 0))
+    q.put(("draw_base_text", None, "b", 0, 0))
+    with pytest.raises(queue.Full):
+        q.put_nowait(("draw_base_text", None, "c", 0, 0))
+    # A plain put waits put_timeout, then drops without raising
+    q.put(("draw_base_text", None, "d", 0, 0))
+    stats = q.stats()
+    assert stats["depth"] == 2
+    assert stats["dropped"] == 2
+    assert stats["max_depth"] == 2
+
+
+def test_consumer_can_always_put():
+    q = DisplayCommandQueue(maxsize=1, put_timeout=0.01)
+    q.put(("draw_base_text", None, "a", 0, 0))
+    q.put(("draw_base_text", None, "b", 0, 0))
+    assert q.get()[2] == "a"
+    # The thread that called get() is the consumer; its puts never wait or drop
+    q.put(("draw_base_text", None, "c", 0, 0))
+    q.put(("draw_base_text", None, "d", 0, 0))
+    assert q.qsize() == 2
+    assert q.stats()["dropped"] == 1
+
+
+def test_get_times_out_on_empty_queue():
+    q = DisplayCommandQueue()
+    with pytest.raises(queue.Empty):
+        q.get(timeout=0.01)
+    with pytest.raises(queue.Empty):
+        q.get_nowait()
+
+
+def test_drain_applies_the_whole_backlog_even_when_a_frame_is_due():
+    q = DisplayCommandQueue()
+    q.put(("clear_base",))
+    q.put(("draw_base_text", None, "a", 0, 0))
+    applied = []
+
+    def handle(cmd):
+        applied.append(cmd[0])
+        return True
+
+    # An idle display's next frame is already in the past
+    assert q.drain(q.get(), handle, lambda: True)
+    assert applied == ["clear_base", "draw_base_text"]
+
+
+def test_drain_cuts_off_later_arrivals_once_a_frame_is_due():
+    q = DisplayCommandQueue()
+    q.put(("draw_base_text", None, "a", 0, 0))
+    frame_due = False
+    applied = []
+
+    def handle(cmd):
+        # A busy producer queues another command every time one is applied
+        applied.append(cmd[2])
+        if len(applied) < 10:
+            q.put(("draw_base_text", None, str(len(applied)), 0, 0))
+        return True
+
+    assert q.drain(q.get(), handle, lambda: frame_due)
+    assert applied == ["a"] + [str(i) for i in range(1, 10)]
+
+    applied.clear()
+    frame_due = True
+    q.put(("draw_base_text", None, "b", 0, 0))
+    assert q.drain(q.get(), handle, lambda: frame_due)
+    assert applied == ["b"]
+    assert q.qsize() == 1
+
+
+def test_drain_stops_on_exit():
+    q = DisplayCommandQueue()
+    q.put(("exit",))
+    q.put(("clear_base",))
+    assert not q.drain(q.get(), lambda cmd: cmd[0] != "exit", lambda: False)
+    assert q.qsize() == 1
+
+
+def full_queue(monkeypatch):
+    monkeypatch.setattr(canvas, "PRESENT_TIMEOUT", 0.01)
+    monkeypatch.setattr(scroll_view, "PRESENT_TIMEOUT", 0.01)
+    q = DisplayCommandQueue(maxsize=1)
+    q.put(("set_cursor_position", 0, 0))
+    return q
+
+
+def test_canvas_presents_again_after_a_dropped_present(monkeypatch):
+    q = full_queue(monkeypatch)
+    c = canvas.Canvas(q, 16, 8)
+    c.present()
+    c.fill_rect(0, 0, 3, 3)
+    c.present()
+    assert q.stats()["dropped"] == 2
+    drain(q)
+    c.present()
+    assert drain(q) == ["present_canvas"]
+    layer = Framebuffer(16, 8)
+    # The dropped presents are not lost: the whole canvas is drawn
+    assert c.draw_to(layer) == (0, 0, 16, 8)
+
+
+def test_scroll_view_presents_again_after_a_dropped_present(monkeypatch):
+    q = full_queue(monkeypatch)
+    view = scroll_view.ScrollView(q, None, lambda text, font: (4 * len(text), 6), None, 0, 0, 16, 8)
+    view.present()
+    assert q.stats()["dropped"] == 1
+    drain(q)
+    view.present()
+    assert drain(q) == ["present_scroll_view"]
+
+
+def test_overlay_canvas_presents_jump_the_queue():
+    q = DisplayCommandQueue()
+    q.put(("draw_base_text", None, "a", 0, 0))
+    canvas.Canvas(q, 16, 8).present()
+    canvas.Canvas(q, 16, 8, layer="overlay").present()
+    assert drain(q) == ["present_overlay_canvas", "draw_base_text", "present_canvas"]
@@ -0,0 +1,113 @@
+import numpy as np
+
+from display_backends import (SET_COLUMN_ADDRESS, SET_PAGE_ADDRESS, WINDOW_COMMAND_BYTES,
+                              LumaDisplayWrapper)
+
+
+class FakeDevice:
+    """Stands in for a luma.oled device, recording what would go over the bus"""
+
+    width = 128
+    height = 64
+
+    def __init__(self):
+        self.calls = []
+
+    def command(self, *cmd):
+        self.calls.append(("command", cmd))
+
+    def data(self, data):
+        self.calls.append(("data", list(data)))
+
+    def windows(self):
+        """(page_start, page_end, col_start, col_end) of every address window opened"""
+        return [(cmd[4], cmd[5], cmd[1], cmd[2]) for kind, cmd in self.calls
+                if kind == "command" and cmd[0] == SET_COLUMN_ADDRESS and cmd[3] == SET_PAGE_ADDRESS]
+
+
+def blank():
+    return np.zeros((8, 128), dtype=np.uint8)
+
+
+def shown(device):
+    """Wrapper and fake device with a blank frame already sent"""
+    display = LumaDisplayWrapper(device)
+    display.frame(blank())
+    device.calls.clear()
+    return display
+
+
+def test_first_frame_is_sent_whole():
+    device = FakeDevice()
+    display = LumaDisplayWrapper(device)
+    display.frame(blank())
+    assert device.windows() == [(0, 7, 0, 127)]
+    assert len(device.calls[1][1]) == 8 * 128
+    assert display.last_frame_bytes == display.full_frame_bytes == WINDOW_COMMAND_BYTES + 8 * 128
+
+
+def test_unchanged_frame_sends_nothing():
+    device = FakeDevice()
+    display = shown(device)
+    display.frame(blank())
+    assert device.calls == []
+    assert display.last_frame_bytes == 0
+
+
+def test_single_pixel_sends_one_byte_window():
+    device = FakeDevice()
+    display = shown(device)
+    pages = blank()
+    pages[3, 40] = 0x01
+    display.frame(pages)
+    assert device.windows() == [(3, 3, 40, 40)]
+    assert device.calls[1] == ("data", [0x01])
+    assert display.last_frame_bytes == WINDOW_COMMAND_BYTES + 1
+
+
+def test_adjacent_pages_are_merged():
+    device = FakeDevice()
+    display = shown(device)
+    pages = blank()
+    pages[2, 10:13] = 0xFF
+    pages[3, 11:14] = 0xFF
+    display.frame(pages)
+    assert device.windows() == [(2, 3, 10, 13)]
+    assert display.last_frame_bytes == WINDOW_COMMAND_BYTES + 2 * 4
+
+
+def test_distant_columns_stay_separate():
+    device = FakeDevice()
+    display = shown(device)
+    pages = blank()
+    pages[2, 0] = 0xFF
+    pages[3, 100:128] = 0xFF
+    display.frame(pages)
+    # One 2 x 128 window would cost more than two windows and their commands
+    assert device.windows() == [(2, 2, 0, 0), (3, 3, 100, 127)]
+    assert display.last_frame_bytes == 2 * WINDOW_COMMAND_BYTES + 1 + 28
+
+
+def test_stats_add_up_bytes_per_frame():
+    device = FakeDevice()
+    display = LumaDisplayWrapper(device)
+    display.frame(blank())
+    display.frame(blank())
+    pages = blank()
+    pages[0, 0] = 0x80
+    display.frame(pages)
+    assert display.stats() == {
+        "frames": 3,
+        "bytes_sent": display.full_frame_bytes + WINDOW_COMMAND_BYTES + 1,
+        "last_frame_bytes": WINDOW_COMMAND_BYTES + 1,
+        "full_frame_bytes": WINDOW_COMMAND_BYTES + 8 * 128,
+    }
+    sent = sum(len(args) for kind, args in device.calls)
+    assert sent == display.stats()["bytes_sent"]
+
+
+def test_invert_is_a_controller_command():
+    device = FakeDevice()
+    display = shown(device)
+    display.invert(True)
+    assert device.calls == [("command", (0xA7,))]
@@ -0,0 +1,88 @@
+from display_timers import TimerWheel
+
+
+def wheel(tick_interval=0.1, slots=8):
+    """A wheel whose ticks count from time 0, so tests can pass their own now"""
+    timers = TimerWheel(tick_interval, slots)
+    timers.origin = 0.0
+    return timers
+
+
+def test_timer_fires_on_the_first_tick_at_or_after_its_deadline():
+    timers = wheel()
+    timers.schedule("a", 0.25, ("a",), now=0.0)
+    assert timers.next_deadline() == timers.tick_time(3)
+    assert timers.expire(now=0.29) == []
+    assert timers.expire(now=0.3) == [("a",)]
+    assert not timers.active("a")
+    assert timers.expire(now=1.0) == []
+
+
+def test_timers_fire_in_deadline_order():
+    timers = wheel()
+    timers.schedule("late", 0.3, ("late",), now=0.0)
+    timers.schedule("early", 0.1, ("early",), now=0.0)
+    timers.schedule("middle", 0.2, ("middle",), now=0.0)
+    assert timers.expire(now=0.5) == [("early",), ("middle",), ("late",)]
+
+
+def test_scheduling_a_key_again_replaces_it():
+    timers = wheel()
+    timers.schedule("a", 0.1, ("first",), now=0.0)
+    timers.schedule("a", 0.3, ("second",), now=0.0)
+    assert timers.keys() == ["a"]
+    assert timers.expire(now=0.2) == []
+    assert timers.expire(now=0.3) == [("second",)]
+
+
+def test_cancel():
+    timers = wheel()
+    timers.schedule("a", 0.1, ("a",), now=0.0)
+    assert timers.cancel("a")
+    assert not timers.cancel("a")
+    assert timers.next_deadline() is None
+    assert timers.expire(now=1.0) == []
+
+
+def test_periodic_timer_repeats_until_cancelled():
+    timers = wheel()
+    timers.schedule("blink", 0, ("blink",), period=0.2, now=0.0)
+    fired = [len(timers.expire(now=tick / 10)) for tick in range(1, 8)]
+    assert fired == [1, 0, 1, 0, 1, 0, 1]
+    timers.cancel("blink")
+    assert timers.expire(now=2.0) == []
+
+
+def test_timers_more_than_a_revolution_away_wait_their_turn():
+    timers = wheel(slots=8)
+    timers.schedule("far", 1.0, ("far",), now=0.0)  # Tick 10 shares slot 2 with tick 2
+    assert timers.expire(now=0.5) == []
+    assert timers.expire(now=1.0) == [("far",)]
+
+
+def test_long_stall_fires_each_due_timer_once():
+    timers = wheel(slots=8)
+    timers.schedule("blink", 0.1, ("blink",), period=0.1, now=0.0)
+    timers.schedule("once", 0.5, ("once",), now=0.0)
+    # Far more ticks than slots have passed: missed periodic firings are not replayed
+    assert timers.expire(now=5.0) == [("blink",), ("once",)]
+    assert timers.active("blink")
+    assert timers.next_deadline() == timers.tick_time(51)
+
+
+def test_new_tick_interval_keeps_deadlines():
+    timers = wheel(tick_interval=0.1)
+    timers.schedule("a", 1.0, ("a",), now=0.0)
+    timers.set_tick_interval(0.25, now=0.4)
+    # Still due at 1.0, rounded up to the next 0.25 s tick from the new origin
+    assert 1.0 <= timers.next_deadline() < 1.0 + 0.25
+    assert timers.expire(now=1.0) == []
+    assert timers.expire(now=timers.next_deadline()) == [("a",)]
+
+
+def test_new_tick_interval_keeps_periods():
+    timers = wheel(tick_interval=1 / 30)
+    timers.schedule("blink", 0.5, ("blink",), period=0.5, now=0.0)
+    timers.set_tick_interval(1 / 60, now=0.0)
+    fired = [t / 60 for t in range(1, 121) if timers.expire(now=t / 60)]
+    assert fired == [0.5, 1.0, 1.5, 2.0]
@@ -0,0 +1,46 @@
+import numpy as np
+from PIL import Image, ImageDraw
+
+from framebuffer import Framebuffer, pack_image, unpack_bits
+
+
+def pillow_lines(lines):
+    img = Image.new("1", (128, 64), 0)
+    draw = ImageDraw.Draw(img)
+    for line in lines:
+        draw.line(tuple(int(v) for v in line), fill=1)
+    return np.array(img)
+
+
+def test_batch_lines_match_imagedraw_line():
+    rng = np.random.default_rng(35)
+    # Segments in every direction, many partly or wholly off screen
+    lines = rng.integers(-40, 170, size=(3000, 4))
+    for line in lines:
+        layer = Framebuffer(128, 64)
+        layer.draw_lines([line])
+        assert np.array_equal(unpack_bits(layer.pages), pillow_lines([line])), line
+
+
+def test_batch_lines_in_one_message():
+    lines = [(0, 0, 127, 63), (127, 0, 0, 63), (5, 60, 5, 2), (100, 10, 90, 10), (64, 32, 64, 32)]
+    layer = Framebuffer(128, 64)
+    layer.draw_lines(lines)
+    assert np.array_equal(unpack_bits(layer.pages), pillow_lines(lines))
+    layer.draw_lines(lines[:2], 0)
+    assert np.array_equal(unpack_bits(layer.pages), pillow_lines(lines[2:]) & ~pillow_lines(lines[:2]))
+
+
+def test_rects_and_pixels_match_imagedraw():
+    rects = [(0, 0, 9, 9), (-5, 60, 3, 70), (120, 30, 200, 31)]
+    pixels = [(5, 5), (127, 63), (-1, 0), (128, 5)]
+    layer = Framebuffer(128, 64)
+    layer.fill_rects(rects)
+    layer.set_pixels(pixels, 0)
+    img = Image.new("1", (128, 64), 0)
+    draw = ImageDraw.Draw(img)
+    for rect in rects:
+        draw.rectangle(rect, fill=1)
+    for pixel in pixels:
+        draw.point(pixel, fill=0)
+    assert np.array_equal(layer.pages, pack_image(img))
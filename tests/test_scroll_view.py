@@ -0,0 +1,72 @@
+import numpy as np
+
+from canvas import Canvas
+from framebuffer import Framebuffer, unpack_bits
+from scroll_view import ScrollView
+
+from conftest import Applied
+
+LONG_TEXT = " ".join(f"line {i} of a long list" for i in range(40))
+
+
+def make_view(proxitalk, y=10, height=54):
+    view = ScrollView(Applied(proxitalk), proxitalk.text_layout, proxitalk.get_text_size, proxitalk.fontSmall,
+                      4, y, 120, height, line_pitch=6)
+    view.set_text(LONG_TEXT)
+    return view
+
+
+def show(proxitalk, view):
+    """Show view the way AppBase.set_screen does"""
+    screen = Framebuffer(128, 64)
+    view.draw_to(screen)
+    proxitalk.handle_display_command(("show_screen", screen.pages, None, view))
+
+
+def base_pixels(proxitalk):
+    return int(unpack_bits(proxitalk.base_layer.pages).sum())
+
+
+def test_scrolling_draws_the_new_window(proxitalk):
+    view = make_view(proxitalk)
+    show(proxitalk, view)
+    before = proxitalk.base_layer.pages.copy()
+    assert view.scroll_lines(2)
+    assert not np.array_equal(proxitalk.base_layer.pages, before)
+    assert np.array_equal(unpack_bits(proxitalk.base_layer.pages)[10:64, 4:124], view.window())
+
+
+def test_view_stops_drawing_after_clear_base(proxitalk):
+    view = make_view(proxitalk)
+    show(proxitalk, view)
+    proxitalk.handle_display_command(("clear_base",))
+    # e.g. the last follow_tts step of a clip still reading the old screen
+    proxitalk.handle_display_command(("follow_tts", view, 1.0))
+    assert view.detached
+    assert base_pixels(proxitalk) == 0
+
+
+def test_new_screen_detaches_the_old_view(proxitalk):
+    old = make_view(proxitalk)
+    show(proxitalk, old)
+    new = make_view(proxitalk)
+    show(proxitalk, new)
+    assert old.detached and not new.detached
+    shown = proxitalk.base_layer.pages.copy()
+    old.scroll_lines(3)
+    assert np.array_equal(proxitalk.base_layer.pages, shown)
+
+
+def test_canvas_detaches_only_views_it_covers(proxitalk):
+    canvas = Canvas(Applied(proxitalk), 128, 64)
+    canvas.present()
+    top = make_view(proxitalk, y=0, height=20)
+    bottom = make_view(proxitalk, y=40, height=24)
+    top.present()
+    bottom.present()
+    # Only the changed rectangle is presented this time
+    canvas.fill_rect(0, 0, 127, 9)
+    canvas.present()
+    assert top.detached
+    assert not bottom.detached
+    assert bottom.scroll_lines(1)
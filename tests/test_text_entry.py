@@ -0,0 +1,178 @@
+import random
+
+from PIL import ImageFont
+
+from text_entry import GapBuffer, TextEntry
+
+
+class CommandLog:
+    """Collects what the entry would put on the display queue"""
+
+    def __init__(self):
+        self.commands = []
+
+    def put(self, command):
+        self.commands.append(command)
+
+    def drawn_rows(self, entry):
+        return sorted((command[2] - entry.y) // entry.line_height
+                      for command in self.commands if command[0] == "clear_base_area")
+
+    def clear(self):
+        self.commands.clear()
+
+
+def make_entry(width=40, height=30, suggest=None):
+    """A 10 characters wide, 5 lines tall entry over a monospace measure (4px per character)"""
+    log = CommandLog()
+    context = {
+        "display_queue": log,
+        "get_text_size": lambda text, font: (4 * len(text), 5),
+        "fonts": {"small": ImageFont.load_default()},
+    }
+    entry = TextEntry(context, 0, 10, width, height, suggest=suggest)
+    return entry, log
+
+
+def wrapped(entry):
+    """The lines a full re-wrap of the entry's text gives"""
+    fresh, _ = make_entry(entry.width, entry.height)
+    fresh.set_text(entry.text, redraw=False)
+    return fresh.lines
+
+
+# --- GapBuffer --- #
+
+def test_gap_buffer_matches_a_plain_string():
+    rng = random.Random(3)
+    buffer = GapBuffer(gap=4)
+    text, cursor = "", 0
+    for _ in range(2000):
+        action = rng.random()
+        if action < 0.4:
+            chunk = "".join(rng.choice("ab ") for _ in range(rng.randint(1, 12)))
+            buffer.insert(chunk)
+            text = text[:cursor] + chunk + text[cursor:]
+            cursor += len(chunk)
+        elif action < 0.6:
+            count = buffer.delete_before(rng.randint(1, 5))
+            text = text[:cursor - count] + text[cursor:]
+            cursor -= count
+        elif action < 0.7:
+            count = buffer.delete_after(rng.randint(1, 5))
+            text = text[:cursor] + text[cursor + count:]
+        else:
+            cursor = max(0, min(len(text), rng.randint(-2, len(text) + 2)))
+            buffer.move(cursor)
+        assert buffer.cursor == cursor
+        assert len(buffer) == len(text)
+    assert buffer.text() == text
+    for start, end in [(0, len(text)), (0, cursor), (cursor, len(text)), (max(0, cursor - 3), cursor + 3)]:
+        assert buffer.slice(start, end) == text[start:end]
+    assert buffer[-1] == text[-1]
+
+
+# --- Wrapping --- #
+
+def test_wrap_by_words_and_break_long_words():
+    entry, _ = make_entry()
+    entry.set_text("hello big world abcdefghijklmnop", redraw=False)
+    assert [entry.buffer.slice(*line) for line in entry.lines] == ["hello big ", "world ", "abcdefghij", "klmnop"]
+
+
+def test_incremental_rewrap_matches_a_full_wrap():
+    rng = random.Random(7)
+    entry, _ = make_entry()
+    words = ["a", "to", "the", "word", "quick", "abcdefghijklmno", " "]
+    for _ in range(500):
+        action = rng.random()
+        if action < 0.6:
+            entry.insert(rng.choice(words) + " " * rng.randint(0, 2))
+        elif action < 0.75:
+            entry.backspace()
+        elif action < 0.8:
+            entry.delete()
+        elif action < 0.85:
+            entry.delete_word()
+        else:
+            entry.move(rng.randint(0, len(entry.text)))
+        assert entry.lines == wrapped(entry)
+
+
+def test_typing_at_the_end_redraws_only_the_last_line():
+    entry, log = make_entry(height=60)
+    entry.set_text("one two three four five six seven eight nine ten")
+    entry.move(len(entry.text))
+    last = len(entry.lines) - 1
+    log.clear()
+    entry.insert("x")
+    assert log.drawn_rows(entry) == [last]
+    assert log.commands[0] == ("begin_frame",) and log.commands[-1] == ("commit_frame",)
+
+
+def test_rewrap_stops_once_breaks_line_up_again():
+    entry, log = make_entry(height=60)
+    entry.set_text("aaaa bbbb cc dddddddddd eeee")
+    assert [entry.buffer.slice(*line) for line in entry.lines] == ["aaaa bbbb ", "cc ", "dddddddddd ", "eeee"]
+    entry.move(1)
+    log.clear()
+    entry.insert("xx")
+    # "bbbb" moves down onto the short line, and the lines from "dddddddddd" on are reused
+    assert [entry.buffer.slice(*line) for line in entry.lines] == ["axxaaa ", "bbbb cc ", "dddddddddd ", "eeee"]
+    assert entry.lines == wrapped(entry)
+    assert log.drawn_rows(entry) == [0, 1]
+
+
+def test_lines_that_only_moved_within_their_row_are_not_redrawn():
+    entry, log = make_entry(height=60)
+    entry.set_text("hello big world again")
+    entry.move(0)
+    log.clear()
+    # "xhello big" still fits, so the lines after it keep their text and rows
+    entry.insert("x")
+    assert log.drawn_rows(entry) == [0]
+    log.clear()
+    entry.backspace()
+    assert log.drawn_rows(entry) == [0]
+
+
+def test_view_follows_the_cursor():
+    entry, log = make_entry(height=12)  # Two visible lines
+    entry.set_text("aaaa bbbb cccc dddd eeee", redraw=False)
+    entry.move(len(entry.text))
+    assert entry.first_visible == len(entry.lines) - 2
+    entry.move(0)
+    assert entry.first_visible == 0
+    assert log.commands[-2] == ("set_cursor_position", 0, 10)
+
+
+# --- Editing keys and suggestions --- #
+
+def test_delete_word_removes_the_word_and_trailing_spaces():
+    entry, _ = make_entry()
+    entry.set_text("hello big  world  ", redraw=False)
+    entry.move(len(entry.text))
+    entry.delete_word()
+    assert entry.text == "hello big  "
+    entry.delete_word()
+    assert entry.text == "hello "
+
+
+def test_home_and_end_stay_on_the_cursor_line():
+    entry, _ = make_entry()
+    entry.set_text("hello big world", redraw=False)
+    entry.move(12)
+    entry.handle_key("KEY_HOME")
+    assert entry.cursor == 10
+    entry.move(2)
+    entry.handle_key("KEY_END")
+    assert entry.cursor == 9  # Before the space the line wraps on
+
+
+def test_suggestion_is_drawn_only_with_the_cursor_at_the_end():
+    entry, log = make_entry(suggest=lambda text: "llo" if text.endswith("he") else "")
+    entry.insert("he")
+    assert entry.suggestion == "llo"
+    assert any(command[0] == "draw_base_image" for command in log.commands)
+    entry.move_left()
+    assert entry.suggestion == ""
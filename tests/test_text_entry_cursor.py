@@ -0,0 +1,46 @@
+import numpy as np
+
+from framebuffer import unpack_bits
+from text_entry import TextEntry
+
+from conftest import Applied
+
+
+def entry_context(proxitalk):
+    return {
+        "display_queue": Applied(proxitalk),
+        "get_text_size": proxitalk.get_text_size,
+        "fonts": {"small": proxitalk.fontSmall},
+    }
+
+
+def cursor_columns(proxitalk):
+    return sorted(set(np.flatnonzero(unpack_bits(proxitalk.base_layer_2.pages).any(axis=0)).tolist()))
+
+
+def blink_until(proxitalk, on):
+    proxitalk.handle_display_command(("blink_cursor",))
+    if proxitalk.cursor_blink_on != on:
+        proxitalk.handle_display_command(("blink_cursor",))
+
+
+def test_moving_the_cursor_leaves_no_stale_bar(proxitalk):
+    entry = TextEntry(entry_context(proxitalk), 4, 8, 120, 56)
+    entry.insert("hello there")
+    for move in (entry.move_left, entry.move_home, entry.backspace, entry.move_right):
+        blink_until(proxitalk, True)
+        move()
+        blink_until(proxitalk, False)
+        assert cursor_columns(proxitalk) == []
+        blink_until(proxitalk, True)
+        assert cursor_columns(proxitalk) == [int(proxitalk.lastDrawX) + 1]
+
+
+def test_wrapping_moves_the_cursor_cleanly(proxitalk):
+    entry = TextEntry(entry_context(proxitalk), 4, 8, 40, 56)
+    for char in "typing until the line wraps":
+        blink_until(proxitalk, True)
+        entry.insert(char)
+    blink_until(proxitalk, False)
+    assert cursor_columns(proxitalk) == []
+    assert proxitalk.lastDrawY > 8
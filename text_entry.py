@@ -0,0 +1,358 @@
+import bisect
+
+from PIL import Image, ImageDraw
+
+CTRL_KEYS = ("KEY_LEFTCTRL", "KEY_RIGHTCTRL")
+
+
+class GapBuffer:
+    """
+    Text stored as a list of characters with a gap at the cursor, so typing and
+    deleting at the cursor cost O(1) however long the text is. Moving the
+    cursor moves the gap, which costs the distance moved.
+    """
+
+    def __init__(self, text="", gap=64):
+        self._buf = list(text) + [None] * gap
+        self._gap_start = len(text)
+        self._gap_end = len(self._buf)
+
+    def __len__(self):
+        return len(self._buf) - (self._gap_end - self._gap_start)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("GapBuffer index out of range")
+        return self._buf[index if index < self._gap_start else index + self._gap_end - self._gap_start]
+
+    @property
+    def cursor(self):
+        return self._gap_start
+
+    def move(self, pos):
+        """Put the cursor (the gap) at pos, clamped to the text"""
+        pos = max(0, min(len(self), pos))
+        if pos < self._gap_start:
+            count = self._gap_start - pos
+            self._buf[self._gap_end - count:self._gap_end] = self._buf[pos:self._gap_start]
+            self._gap_start = pos
+            self._gap_end -= count
+        elif pos > self._gap_start:
+            count = pos - self._gap_start
+            self._buf[self._gap_start:pos] = self._buf[self._gap_end:self._gap_end + count]
+            self._gap_start = pos
+            self._gap_end += count
+
+    def insert(self, text):
+        if len(text) > self._gap_end - self._gap_start:
+            # Grow the gap to at least double the buffer
+            grow = max(len(text), len(self._buf)) + 64
+            self._buf[self._gap_end:self._gap_end] = [None] * grow
+            self._gap_end += grow
+        self._buf[self._gap_start:self._gap_start + len(text)] = text
+        self._gap_start += len(text)
+
+    def delete_before(self, count):
+        """Delete up to count characters before the cursor; returns how many went"""
+        count = min(count, self._gap_start)
+        self._gap_start -= count
+        return count
+
+    def delete_after(self, count):
+        count = min(count, len(self._buf) - self._gap_end)
+        self._gap_end += count
+        return count
+
+    def slice(self, start, end):
+        """Text between start and end without joining the whole buffer"""
+        gap = self._gap_end - self._gap_start
+        if end <= self._gap_start:
+            return "".join(self._buf[start:end])
+        if start >= self._gap_start:
+            return "".join(self._buf[start + gap:end + gap])
+        return "".join(self._buf[start:self._gap_start]) + "".join(self._buf[self._gap_end:end + gap])
+
+    def text(self):
+        return self.slice(0, len(self))
+
+
+class TextEntry:
+    """
+    A multi-line text field drawn on the base layer, for typing apps such as proxi.
+
+    Text lives in a GapBuffer, and wrapped lines are kept as (start, end)
+    offsets. An edit re-wraps from the line before the edit until the breaks
+    line up with the old ones again. Only lines whose text or position changed
+    are cleared and redrawn, so a keystroke costs about the same at any text
+    length. suggest(word), if given, returns an autocomplete suggestion for the
+    word before the cursor. It is drawn highlighted after the text while the
+    cursor is at the end. The display cursor is moved with set_cursor_position.
+    """
+
+    HIGHLIGHT_PADDING = 1
+
+    def __init__(self, context, x, y, width, height, font=None, line_height=6, suggest=None):
+        self.display_queue = context["display_queue"]
+        self.get_text_size = context["get_text_size"]
+        self.pressed_keys = context.get("pressed_keys", set())
+        self.font = font or context["fonts"]["small"]
+        self.x, self.y = x, y
+        self.width, self.height = width, height
+        self.line_height = line_height
+        self.suggest = suggest
+        self.visible_lines = max(1, height // line_height)
+
+        self.buffer = GapBuffer()
+        self.lines = [(0, 0)]     # (start, end) per wrapped line; spaces at a break end the line
+        self.first_visible = 0    # Index of the top line on screen
+        self.suggestion = ""
+        self._drawn = {}          # Screen row -> text drawn there (with suggestion)
+
+    # --- Editing --- #
+
+    @property
+    def text(self):
+        return self.buffer.text()
+
+    @property
+    def cursor(self):
+        return self.buffer.cursor
+
+    def insert(self, text):
+        pos = self.buffer.cursor
+        self.buffer.insert(text)
+        self._edited(pos, len(text))
+
+    def backspace(self):
+        pos = self.buffer.cursor
+        if self.buffer.delete_before(1):
+            self._edited(pos - 1, -1)
+
+    def delete(self):
+        pos = self.buffer.cursor
+        if self.buffer.delete_after(1):
+            self._edited(pos, -1)
+
+    def delete_word(self):
+        """Delete back to the start of the word before the cursor (and spaces after it)"""
+        pos = end = self.buffer.cursor
+        while pos > 0 and self.buffer[pos - 1] == " ":
+            pos -= 1
+        while pos > 0 and self.buffer[pos - 1] != " ":
+            pos -= 1
+        if pos < end:
+            self.buffer.delete_before(end - pos)
+            self._edited(pos, pos - end)
+
+    def set_text(self, text, redraw=True):
+        self.buffer = GapBuffer(text)
+        self.lines = self._wrap_from(0, [])[0]
+        self.first_visible = 0
+        if redraw:
+            self.redraw()
+
+    def clear(self, redraw=True):
+        self.suggestion = ""
+        self.set_text("", redraw)
+
+    def move(self, pos):
+        self.buffer.move(pos)
+        self._render([])
+
+    def move_left(self):
+        self.move(self.buffer.cursor - 1)
+
+    def move_right(self):
+        self.move(self.buffer.cursor + 1)
+
+    def move_home(self):
+        """Start of the current line"""
+        self.move(self.lines[self._line_of(self.buffer.cursor)][0])
+
+    def move_end(self):
+        """End of the current line (before the spaces it wraps on)"""
+        index = self._line_of(self.buffer.cursor)
+        start, end = self.lines[index]
+        if index < len(self.lines) - 1:
+            end = start + len(self.buffer.slice(start, end).rstrip(" "))
+        self.move(end)
+
+    def at_end(self):
+        return self.buffer.cursor == len(self.buffer)
+
+    def word_before_cursor(self):
+        pos = end = self.buffer.cursor
+        while pos > 0 and self.buffer[pos - 1] != " ":
+            pos -= 1
+        return self.buffer.slice(pos, end)
+
+    def handle_key(self, keycode):
+        """Cursor keys and (Ctrl+)Backspace; returns True if the key was used"""
+        if keycode == "KEY_LEFT":
+            self.move_left()
+        elif keycode == "KEY_RIGHT":
+            self.move_right()
+        elif keycode == "KEY_HOME":
+            self.move_home()
+        elif keycode == "KEY_END":
+            self.move_end()
+        elif keycode == "KEY_DELETE":
+            self.delete()
+        elif keycode == "KEY_BACKSPACE":
+            if any(key in self.pressed_keys for key in CTRL_KEYS):
+                self.delete_word()
+            else:
+                self.backspace()
+        else:
+            return False
+        return True
+
+    # --- Drawing --- #
+
+    def redraw(self):
+        """Draw every visible line (after the screen under the entry was cleared)"""
+        self._drawn = {}
+        self._scroll_to_cursor()
+        self._render(range(len(self.lines)), force=True)
+
+    def _edited(self, pos, delta):
+        """Re-wrap after delta characters were inserted (or -delta deleted) at pos"""
+        first = max(0, self._line_of(pos) - 1)
+        old_lines = self.lines
+        new_lines, rewrapped = self._wrap_from(first, old_lines, pos + max(0, -delta), delta)
+        # Re-wrapped lines may hold new text; reused ones only matter if they moved row
+        changed = list(range(first, rewrapped))
+        changed += [i for i in range(rewrapped, len(new_lines))
+                    if i >= len(old_lines) or new_lines[i] != old_lines[i]]
+        # Lines that no longer exist have to be cleared too
+        changed += range(len(new_lines), len(old_lines))
+        self.lines = new_lines
+        self._render(changed)
+
+    def _wrap_from(self, index, old_lines, unchanged_from=None, delta=0):
+        """
+        Re-wrap from line index to the end of the text. Wrapping from an offset only
+        depends on the text after it, so once a break lands on an old line start in
+        the unchanged tail (old offset >= unchanged_from), the old lines from there
+        on are reused, shifted by delta. Returns the lines and the index of the
+        first reused line.
+        """
+        lines = old_lines[:index]
+        resume_at = {}
+        if unchanged_from is not None:
+            resume_at = {start + delta: i for i, (start, _) in enumerate(old_lines) if start >= unchanged_from}
+        start = old_lines[index][0] if index < len(old_lines) else 0
+        length = len(self.buffer)
+        while True:
+            end = self._wrap_line(start)
+            lines.append((start, end))
+            if end >= length:
+                return lines, len(lines)
+            resume = resume_at.get(end)
+            if resume is not None:
+                rewrapped = len(lines)
+                lines.extend((s + delta, e + delta) for s, e in old_lines[resume:])
+                return lines, rewrapped
+            start = end
+
+    def _wrap_line(self, start):
+        """End offset of the line starting at start (greedy by words; long words break anywhere)"""
+        length = len(self.buffer)
+        pos = start
+        fitted = start
+        while pos < length:
+            # Next word and the spaces after it
+            word_end = pos
+            while word_end < length and self.buffer[word_end] != " ":
+                word_end += 1
+            if self._width(start, word_end) > self.width:
+                if fitted > start:
+                    return fitted
+                return self._break_word(start, word_end)
+            space_end = word_end
+            while space_end < length and self.buffer[space_end] == " ":
+                space_end += 1
+            fitted = pos = space_end
+        return length
+
+    def _break_word(self, start, word_end):
+        """Longest prefix of an over-long word that fits (always at least one character)"""
+        end = start + 1
+        while end < word_end and self._width(start, end + 1) <= self.width:
+            end += 1
+        return end
+
+    def _width(self, start, end):
+        return self.get_text_size(self.buffer.slice(start, end), self.font)[0] if end > start else 0
+
+    def _line_of(self, pos):
+        """Index of the line the offset pos is on (a break offset starts the next line)"""
+        starts = [start for start, _ in self.lines]
+        return max(0, bisect.bisect_right(starts, pos) - 1)
+
+    def _scroll_to_cursor(self):
+        """Keep the cursor line on screen; True if the view moved"""
+        line = self._line_of(self.buffer.cursor)
+        first = self.first_visible
+        if line < first:
+            first = line
+        elif line >= first + self.visible_lines:
+            first = line - self.visible_lines + 1
+        first = max(0, min(first, max(0, len(self.lines) - self.visible_lines)))
+        if first == self.first_visible:
+            return False
+        self.first_visible = first
+        return True
+
+    def _render(self, line_indices, force=False):
+        if self.suggest is not None:
+            self.suggestion = self.suggest(self.word_before_cursor()) if self.at_end() else ""
+            line_indices = list(line_indices) + [len(self.lines) - 1]
+        if self._scroll_to_cursor():
+            # The view moved: every row shows a different line now
+            line_indices = range(self.first_visible, self.first_visible + self.visible_lines)
+        last = len(self.lines) - 1
+        commands = []
+        for index in sorted(set(line_indices)):
+            row = index - self.first_visible
+            if not 0 <= row < self.visible_lines:
+                continue
+            text = self.buffer.slice(*self.lines[index]) if index <= last else ""
+            suggestion = self.suggestion if index == last and self.at_end() else ""
+            if not force and self._drawn.get(row) == (text, suggestion):
+                continue
+            self._drawn[row] = (text, suggestion)
+            commands.extend(self._line_commands(row, text, suggestion))
+        # Clear the bar at the old position first; a move during a blink-on phase
+        # would otherwise leave it behind
+        commands.append(("clear_cursor_area",))
+        commands.append(self._cursor_command())
+        self.display_queue.put(("begin_frame",))
+        for command in commands:
+            self.display_queue.put(command)
+        self.display_queue.put(("commit_frame",))
+
+    def _line_commands(self, row, text, suggestion):
+        y = self.y + row * self.line_height
+        commands = [("clear_base_area", self.x, y, self.width - 1, self.line_height - 1)]
+        if text.strip():
+            commands.append(("draw_base_text", self.font, text, self.x, y))
+        if suggestion:
+            x = self.get_text_size(text, self.font)[0] if text else 0
+            text_width, text_height = self.get_text_size(suggestion, self.font)
+            bg_width = min(text_width + self.HIGHLIGHT_PADDING, self.width - x)
+            if bg_width > 0:
+                bg_img = Image.new("1", (bg_width, text_height + 2), 1)
+                ImageDraw.Draw(bg_img).text((1, 0), suggestion, font=self.font, fill=0)
+                commands.append(("draw_base_image", bg_img, self.x + x, y))
+        return commands
+
+    def _cursor_command(self):
+        pos = self.buffer.cursor
+        index = self._line_of(pos)
+        start = self.lines[index][0]
+        x = self._width(start, pos)
+        y = self.y + (index - self.first_visible) * self.line_height
+        return ("set_cursor_position", self.x + x, y)
@@ -0,0 +1,209 @@
+import re
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from display_commands import TimingStats
+
+HIGHLIGHT_PATTERN = re.compile(r"\[([^\]]+)\]")
+
+# A run of text on one line; x is relative to the start of the line
+Segment = namedtuple("Segment", "text highlighted x width")
+
+
+class TextLayout:
+    """Wrapped lines of segments, as returned by TextLayoutEngine.layout (treat as read-only)"""
+
+    __slots__ = ("lines", "widths", "truncated")
+
+    def __init__(self, lines, widths, truncated):
+        self.lines = lines          # tuple of lines, each a tuple of Segments
+        self.widths = widths        # pixel width of each line
+        self.truncated = truncated  # True if text was cut off at max_lines
+
+    def line_texts(self):
+        return ["".join(segment.text for segment in line) for line in self.lines]
+
+
+class TextLayoutEngine:
+    """
+    Greedy word wrap by pixel width, shared by set_screen and AppBase.set_screen.
+
+    With markup, [text] is a highlighted run, drawn inverted on a background one
+    pixel wider than the text. Words are split on single spaces (repeated spaces
+    are kept). A word wider than the whole line is broken between characters,
+    without a hyphen. Spaces at a wrap point are dropped. Results are cached per
+    (text, font, width, max_lines, markup) with LRU eviction.
+
+    measure(text, font) returns a pixel width (get_text_size's width).
+    """
+
+    HIGHLIGHT_PADDING = 1
+
+    def __init__(self, measure, max_entries=256):
+        self.measure = measure
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.timing = TimingStats()         # Every layout() call, cached or not
+        self.miss_timing = TimingStats()    # Layouts that had to be computed
+
+    def layout(self, text, font, max_width, max_lines=None, markup=True):
+        start = time.perf_counter()
+        key = (text, font, max_width, max_lines, markup)
+        with self._lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+        if result is None:
+            result = self._layout(text, font, max_width, max_lines, markup)
+            with self._lock:
+                self._cache[key] = result
+                self.misses += 1
+                if len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+                    self.evictions += 1
+                self.miss_timing.record((time.perf_counter() - start) * 1000.0)
+        with self._lock:
+            self.timing.record((time.perf_counter() - start) * 1000.0)
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._cache),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "layout": self.timing.as_dict(),
+                "computed": self.miss_timing.as_dict(),
+            }
+
+    # --- Layout --- #
+
+    def _layout(self, text, font, max_width, max_lines, markup):
+        lines = [[]]
+        x = 0
+        pending_spaces = 0
+
+        def place(piece, highlighted, width):
+            nonlocal x
+            lines[-1].append(Segment(piece, highlighted, x, width))
+            x += width
+
+        def new_line():
+            nonlocal x, pending_spaces
+            lines.append([])
+            x = 0
+            pending_spaces = 0
+
+        for word in self._words(text, markup):
+            if not word:
+                pending_spaces += 1
+                continue
+            widths = [self._piece_width(piece, highlighted, font) for piece, highlighted in word]
+            word_width = sum(widths)
+            space_width = self.measure(" " * pending_spaces, font) if pending_spaces else 0
+
+            if x + space_width + word_width > max_width and lines[-1]:
+                new_line()
+                space_width = 0
+            if space_width:
+                place(" " * pending_spaces, False, space_width)
+            pending_spaces = 0
+
+            if word_width <= max_width - x:
+                for (piece, highlighted), width in zip(word, widths):
+                    place(piece, highlighted, width)
+                continue
+
+            # Wider than a whole line: break between characters
+            for piece, highlighted in word:
+                while piece:
+                    count = self._fitting_chars(piece, highlighted, font, max_width - x)
+                    if count == 0:
+                        if lines[-1]:
+                            new_line()
+                            continue
+                        count = 1  # Not even one character fits an empty line; place it anyway
+                    place(piece[:count], highlighted, self._piece_width(piece[:count], highlighted, font))
+                    piece = piece[count:]
+                    if piece:
+                        new_line()
+
+        # Trailing spaces stay if they fit, so a cursor after them lands in the right place
+        if pending_spaces:
+            space_width = self.measure(" " * pending_spaces, font)
+            if x + space_width <= max_width:
+                place(" " * pending_spaces, False, space_width)
+
+        if lines[-1] == [] and len(lines) > 1:
+            lines.pop()
+        truncated = max_lines is not None and len(lines) > max_lines
+        if truncated:
+            lines = lines[:max_lines]
+        return TextLayout(tuple(tuple(line) for line in lines),
+                          tuple(line[-1].x + line[-1].width if line else 0 for line in lines),
+                          truncated)
+
+    def _piece_width(self, piece, highlighted, font):
+        return self.measure(piece, font) + (self.HIGHLIGHT_PADDING if highlighted else 0)
+
+    def _fitting_chars(self, piece, highlighted, font, available):
+        """Length of the longest prefix of piece no wider than available"""
+        count = 0
+        while count < len(piece) and self._piece_width(piece[:count + 1], highlighted, font) <= available:
+            count += 1
+        return count
+
+    @staticmethod
+    def _words(text, markup):
+        """
+        Split text into words, each a list of (piece, highlighted) runs; an empty
+        word stands for one space. Runs on either side of a highlight with no space
+        between them ("hel[lo]") belong to the same word.
+        """
+        runs = []
+        last = 0
+        for match in (HIGHLIGHT_PATTERN.finditer(text) if markup else ()):
+            runs.append((text[last:match.start()], False))
+            runs.append((match.group(1), True))
+            last = match.end()
+        runs.append((text[last:], False))
+
+        words = []
+        current = []
+        for run, highlighted in runs:
+            for i, part in enumerate(run.split(" ")):
+                if i > 0:
+                    if current:
+                        words.append(current)
+                        current = []
+                    words.append([])
+                if part:
+                    current.append((part, highlighted))
+        if current:
+            words.append(current)
+        return words
+
+
+def draw_layout(fb, layout, font, x, y, line_pitch, get_text_size):
+    """
+    Rasterize a TextLayout into a Framebuffer with its first line at (x, y).
+    Highlighted segments are a filled box as wide as the segment, with the text
+    cut out of it one pixel in.
+    """
+    for row, line in enumerate(layout.lines):
+        line_y = y + row * line_pitch
+        for segment in line:
+            segment_x = x + segment.x
+            if segment.highlighted:
+                text_height = get_text_size(segment.text, font)[1]
+                fb.fill_rect(segment_x, line_y, segment_x + segment.width - 1, line_y + text_height + 1)
+                fb.draw_text(font, segment.text, segment_x + 1, line_y, fill=0)
+            elif segment.text.strip():
+                fb.draw_text(font, segment.text, segment_x, line_y)
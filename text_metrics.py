@@ -0,0 +1,89 @@
+import threading
+import weakref
+
+from PIL import Image, ImageDraw, ImageFont
+
+
+class TextMetrics:
+    """
+    Text measurement with a per-font glyph cache, matching ImageDraw.textbbox on
+    a mode "1" image (the old get_text_size) pixel for pixel.
+
+    Each glyph's advance and bounding box is measured once per font. A string's
+    box is the union of its glyph boxes placed at the running sum of advances,
+    which is how Pillow's basic layout computes it (kerning does not move the
+    box). Text the glyph model can't reproduce - multiline text, bitmap fonts,
+    fonts using the raqm layout engine - is measured with one shared draw
+    context instead of a new image per call.
+    """
+
+    def __init__(self):
+        # font -> {char: (advance, left, top, right, bottom)}; weak so fonts can be unloaded
+        self._glyphs = weakref.WeakKeyDictionary()
+        self._draw = ImageDraw.Draw(Image.new("1", (1, 1)))
+        self._lock = threading.Lock()
+        self.glyph_misses = 0
+        self.fast = 0
+        self.fallback = 0
+
+    def size(self, text, font):
+        """(width, height) of text's ink box, like textbbox right - left, bottom - top"""
+        if not text:
+            return 0, 0
+        left, top, right, bottom = self.bbox(text, font)
+        return right - left, bottom - top
+
+    def width(self, text, font):
+        return self.size(text, font)[0]
+
+    def bbox(self, text, font):
+        """textbbox((0, 0), text, font) for a mode "1" image"""
+        glyphs = self._font_glyphs(font)
+        if glyphs is None or "\n" in text:
+            return self._fallback_bbox(text, font)
+
+        self.fast += 1
+        pen = 0
+        left = top = float("inf")
+        right = bottom = float("-inf")
+        for char in text:
+            glyph = glyphs.get(char)
+            if glyph is None:
+                glyph = self._measure_glyph(font, glyphs, char)
+            advance, g_left, g_top, g_right, g_bottom = glyph
+            left = min(left, pen + g_left)
+            right = max(right, pen + g_right)
+            top = min(top, g_top)
+            bottom = max(bottom, g_bottom)
+            pen += advance
+        return int(left), int(top), int(right), int(bottom)
+
+    def stats(self):
+        return {
+            "fonts": len(self._glyphs),
+            "glyphs": sum(len(glyphs) for glyphs in self._glyphs.values()),
+            "glyph_misses": self.glyph_misses,
+            "fast": self.fast,
+            "fallback": self.fallback,
+        }
+
+    def _font_glyphs(self, font):
+        glyphs = self._glyphs.get(font)
+        if glyphs is None:
+            if not isinstance(font, ImageFont.FreeTypeFont) or font.layout_engine != ImageFont.Layout.BASIC:
+                return None
+            glyphs = self._glyphs.setdefault(font, {})
+        return glyphs
+
+    def _measure_glyph(self, font, glyphs, char):
+        with self._lock:
+            left, top, right, bottom = font.getbbox(char, mode="1")
+            glyph = (font.getlength(char, mode="1"), left, top, right, bottom)
+            glyphs[char] = glyph
+            self.glyph_misses += 1
+        return glyph
+
+    def _fallback_bbox(self, text, font):
+        with self._lock:
+            self.fallback += 1
+            return self._draw.textbbox((0, 0), text, font=font)
@@ -0,0 +1,456 @@
+import time
+
+import numpy as np
+
+from canvas import Canvas
+from display_commands import TimingStats
+from framebuffer import text_bits
+
+
+class Prop:
+    """
+    A widget attribute. Assigning a different value marks the widget for
+    redrawing; for geometry (position, size) both the old and the new area.
+    """
+
+    def __init__(self, default=None, geometry=False):
+        self.default = default
+        self.geometry = geometry
+
+    def __set_name__(self, owner, name):
+        self.attr = "_" + name
+
+    def __get__(self, widget, owner=None):
+        if widget is None:
+            return self
+        return getattr(widget, self.attr, self.default)
+
+    def __set__(self, widget, value):
+        old = getattr(widget, self.attr, self.default)
+        if _same(old, value):
+            return
+        if self.geometry:
+            widget.invalidate()
+        setattr(widget, self.attr, value)
+        widget.invalidate()
+
+
+class Widget:
+    """
+    A rectangle of a Screen that draws itself. Changing a Prop marks only this
+    widget's area dirty; nothing is drawn until the screen's render().
+    """
+
+    x = Prop(0, geometry=True)
+    y = Prop(0, geometry=True)
+    width = Prop(0, geometry=True)
+    height = Prop(0, geometry=True)
+    visible = Prop(True)
+
+    def __init__(self, x=0, y=0, width=0, height=0, visible=True):
+        self.parent = None
+        self._x, self._y = x, y
+        self._width, self._height = width, height
+        self._visible = visible
+
+    @property
+    def rect(self):
+        """Area the widget draws in, half-open (x0, y0, x1, y1)"""
+        x, y = int(self.x), int(self.y)
+        return x, y, x + int(self.width), y + int(self.height)
+
+    @property
+    def screen(self):
+        node = self.parent
+        while node is not None and not isinstance(node, Screen):
+            node = node.parent
+        return node
+
+    def invalidate(self, rect=None):
+        """Mark the widget (or just rect of it) to be redrawn at the next render()"""
+        screen = self.screen
+        if screen is not None:
+            screen.damage(rect or self.rect)
+
+    def walk(self):
+        yield self
+
+    def draw(self, screen):
+        """Draw into screen (a Canvas); the area was cleared and drawing is clipped to it"""
+
+
+class Container(Widget):
+    """A widget holding other widgets; children draw after (on top of) the container"""
+
+    def __init__(self, x=0, y=0, width=0, height=0, visible=True):
+        super().__init__(x, y, width, height, visible)
+        self.children = []
+
+    def add(self, widget):
+        widget.parent = self
+        self.children.append(widget)
+        widget.invalidate()
+        return widget
+
+    def remove(self, widget):
+        widget.invalidate()
+        self.children.remove(widget)
+        widget.parent = None
+
+    def invalidate(self, rect=None):
+        """Mark the container and everything in it (or just rect) to be redrawn"""
+        if rect is not None:
+            return super().invalidate(rect)
+        super().invalidate()
+        for child in self.children:
+            child.invalidate()
+
+    def clear_children(self):
+        for widget in list(self.children):
+            self.remove(widget)
+
+    def walk(self):
+        yield self
+        for child in self.children:
+            if child.visible:
+                yield from child.walk()
+
+
+class Grid(Container):
+    """Places children in cells, left to right and then down, cols to a row"""
+
+    def __init__(self, x, y, cols, cell_width, cell_height, spacing=0, visible=True):
+        super().__init__(x, y, 0, 0, visible)
+        self.cols = max(1, cols)
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.spacing = spacing
+
+    def add(self, widget):
+        index = len(self.children)
+        col, row = index % self.cols, index // self.cols
+        widget.x = self.x + col * (self.cell_width + self.spacing)
+        widget.y = self.y + row * (self.cell_height + self.spacing)
+        rows = row + 1
+        self._width = min(len(self.children) + 1, self.cols) * (self.cell_width + self.spacing) - self.spacing
+        self._height = rows * (self.cell_height + self.spacing) - self.spacing
+        return super().add(widget)
+
+    def cell(self, index):
+        return self.children[index]
+
+
+class Label(Widget):
+    """
+    A line of text. With width and height the label fills that box and the
+    text is aligned in it (align "left"/"center"/"right", valign "top"/"middle");
+    without them the label is as big as its text. inverted draws light text on
+    a filled box.
+    """
+
+    text = Prop("", geometry=True)
+    font = Prop(None, geometry=True)
+    align = Prop("left")
+    valign = Prop("top")
+    inverted = Prop(False)
+
+    def __init__(self, x, y, text="", font=None, width=None, height=None,
+                 align="left", valign="top", inverted=False, visible=True):
+        super().__init__(x, y, width or 0, height or 0, visible)
+        self.fixed_size = width is not None and height is not None
+        self._text = text
+        self._font = font
+        self._align = align
+        self._valign = valign
+        self._inverted = inverted
+        self._glyphs_key = None
+        self._glyphs = None
+
+    @property
+    def rect(self):
+        """The box (if given) grown to cover the text's pixels, so no text is left behind"""
+        x, y = int(self.x), int(self.y)
+        box = super().rect if self.fixed_size else (x, y, x, y)
+        glyphs = self.glyphs()
+        if glyphs is None:
+            return box
+        bits, gx, gy = glyphs
+        return _union(box, (gx, gy, gx + bits.shape[1], gy + bits.shape[0]))
+
+    def glyphs(self):
+        """The rendered text as (bits, x, y), cached until the text or its position changes"""
+        screen = self.screen
+        if screen is None or not self.text:
+            return None
+        font = self.font or screen.font
+        x, y = self.x, self.y
+        if self.fixed_size and (self.align != "left" or self.valign != "top"):
+            text_width, text_height = screen.get_text_size(self.text, font)
+            if self.align == "center":
+                x += (self.width - text_width) / 2
+            elif self.align == "right":
+                x += self.width - text_width
+            if self.valign == "middle":
+                y += (self.height - text_height) / 2
+        key = (self.text, font, x, y)
+        if key != self._glyphs_key:
+            self._glyphs_key = key
+            self._glyphs = text_bits(font, self.text, x, y)
+        return self._glyphs
+
+    def draw(self, screen):
+        if self.inverted:
+            x0, y0, x1, y1 = self.rect
+            screen.fill_rect(x0, y0, x1 - 1, y1 - 1)
+        glyphs = self.glyphs()
+        if glyphs is not None:
+            screen.blit(*glyphs, "clear" if self.inverted else "or")
+
+
+class Icon(Widget):
+    """A PIL image; masked icons only turn pixels on, unmasked ones cover their box"""
+
+    image = Prop(None, geometry=True)
+
+    def __init__(self, x, y, image=None, masked=False, visible=True):
+        super().__init__(x, y, 0, 0, visible)
+        self._image = image
+        self.masked = masked
+
+    @property
+    def rect(self):
+        x, y = int(self.x), int(self.y)
+        if self.image is None:
+            return x, y, x, y
+        return x, y, x + self.image.width, y + self.image.height
+
+    def draw(self, screen):
+        if self.image is not None:
+            screen.paste(self.image, int(self.x), int(self.y), self.masked)
+
+
+class ProgressBar(Widget):
+    """
+    An outlined bar filled to value (0-1), with an optional text label in
+    front of it. width is the bar's own width; the label adds to it.
+    """
+
+    value = Prop(0.0)
+    label = Prop(None, geometry=True)
+
+    def __init__(self, x, y, width, height, value=0.0, label=None, font=None, visible=True):
+        super().__init__(x, y, width, height, visible)
+        self._value = value
+        self._label = label
+        self.font = font
+
+    def label_width(self):
+        screen = self.screen
+        if not self.label or screen is None:
+            return 0
+        return screen.get_text_size(self.label, self.font or screen.font)[0] + 1
+
+    @property
+    def rect(self):
+        x, y = int(self.x), int(self.y)
+        return x, y, x + self.label_width() + int(self.width), y + int(self.height)
+
+    def draw(self, screen):
+        x, y = int(self.x), int(self.y)
+        label_width = self.label_width()
+        if self.label:
+            # Nudged up a pixel so 4px text fits a 4px bar
+            screen.draw_text(self.font or screen.font, self.label, x, y - 1)
+        bar_x0 = x + label_width
+        bar_x1 = bar_x0 + int(self.width) - 1
+        bottom = y + int(self.height) - 1
+        screen.rect_outline(bar_x0, y, bar_x1, bottom)
+        fill_width = int(max(0.0, min(1.0, self.value)) * int(self.width))
+        if fill_width > 0:
+            screen.fill_rect(bar_x0, y, bar_x0 + fill_width - 1, bottom)
+
+
+class List(Widget):
+    """
+    Rows of text with one selected (drawn inverted), scrolled to keep the
+    selection in view. Moving the selection redraws just the two rows involved
+    unless the list has to scroll.
+    """
+
+    items = Prop((), geometry=True)
+    font = Prop(None, geometry=True)
+
+    def __init__(self, x, y, width, height, items=(), font=None, line_height=6, selected=0, visible=True):
+        super().__init__(x, y, width, height, visible)
+        self._items = tuple(items)
+        self._font = font
+        self.line_height = line_height
+        self._selected = selected
+        self.top = 0  # Index of the first row shown
+
+    @property
+    def visible_rows(self):
+        return max(1, int(self.height) // self.line_height)
+
+    @property
+    def selected(self):
+        return self._selected
+
+    @selected.setter
+    def selected(self, index):
+        index = max(0, min(len(self.items) - 1, index)) if self.items else 0
+        if index == self._selected:
+            return
+        old = self._selected
+        self._selected = index
+        if self._scroll_to_selection():
+            self.invalidate()
+        else:
+            self.invalidate(self.row_rect(old))
+            self.invalidate(self.row_rect(index))
+
+    def row_rect(self, index):
+        x, y = int(self.x), int(self.y) + (index - self.top) * self.line_height
+        return x, y, x + int(self.width), y + self.line_height
+
+    def _scroll_to_selection(self):
+        top = self.top
+        if self._selected < top:
+            top = self._selected
+        elif self._selected >= top + self.visible_rows:
+            top = self._selected - self.visible_rows + 1
+        changed = top != self.top
+        self.top = top
+        return changed
+
+    def draw(self, screen):
+        self._scroll_to_selection()
+        font = self.font or screen.font
+        for index in range(self.top, min(len(self.items), self.top + self.visible_rows)):
+            x0, y0, x1, y1 = self.row_rect(index)
+            if index == self._selected:
+                screen.fill_rect(x0, y0, x1 - 1, y1 - 1)
+                screen.draw_text(font, str(self.items[index]), x0 + 1, y0, fill=False)
+            else:
+                screen.draw_text(font, str(self.items[index]), x0 + 1, y0)
+
+
+class Screen(Canvas):
+    """
+    The root of a widget tree: a Canvas whose pixels are drawn by its widgets.
+
+    Widgets mark their areas dirty as their properties change. render() clears
+    just those areas, redraws the widgets that overlap them (clipped to the
+    dirty areas, so overlapping widgets stay correct) and presents the result,
+    so a screen that hasn't changed costs nothing. The screen starts clean; a
+    new screen, or one the app has come back to, calls invalidate() to take
+    over its whole layer. Dirty area per frame is kept for stats().
+    """
+
+    def __init__(self, display_queue, width, height, get_text_size, font, layer="base"):
+        super().__init__(display_queue, width, height, layer)
+        self.get_text_size = get_text_size
+        self.font = font
+        self.parent = None
+        self.children = []
+        self._dirty = None  # Canvas: don't send anything until a widget changes
+        self._damage = np.zeros((height, width), dtype=bool)
+        self._keep = np.zeros_like(self._damage)
+        self._before = np.zeros_like(self.pixels)
+        self._damage_box = None
+
+        self.frames = 0
+        self.last_area = 0
+        self.max_area = 0
+        self.total_area = 0
+        self.render_timing = TimingStats()
+
+    # --- Tree --- #
+
+    def add(self, widget):
+        widget.parent = self
+        self.children.append(widget)
+        widget.invalidate()
+        return widget
+
+    def remove(self, widget):
+        widget.invalidate()
+        self.children.remove(widget)
+        widget.parent = None
+
+    def walk(self):
+        for child in self.children:
+            if child.visible:
+                yield from child.walk()
+
+    # --- Rendering --- #
+
+    def damage(self, rect):
+        """Add a half-open (x0, y0, x1, y1) area to redraw at the next render()"""
+        x0, y0 = max(0, int(rect[0])), max(0, int(rect[1]))
+        x1, y1 = min(self.width, int(rect[2])), min(self.height, int(rect[3]))
+        if x0 >= x1 or y0 >= y1:
+            return
+        self._damage[y0:y1, x0:x1] = True
+        box = self._damage_box
+        self._damage_box = (x0, y0, x1, y1) if box is None else \
+            (min(box[0], x0), min(box[1], y0), max(box[2], x1), max(box[3], y1))
+
+    def invalidate(self, rect=None):
+        """Redraw rect (default: the whole screen) at the next render()"""
+        self.damage(rect or (0, 0, self.width, self.height))
+
+    def render(self):
+        """Redraw and present the dirty areas; returns how many pixels were dirty"""
+        box = self._damage_box
+        if box is None:
+            return 0
+        start = time.perf_counter()
+        x0, y0, x1, y1 = box
+        mask = self._damage[y0:y1, x0:x1]
+        np.copyto(self._before, self.pixels)
+
+        self.pixels[self._damage] = False
+        for widget in self.walk():
+            wx0, wy0, wx1, wy1 = widget.rect
+            if wx0 < x1 and wx1 > x0 and wy0 < y1 and wy1 > y0 and mask[max(0, wy0 - y0):wy1 - y0, max(0, wx0 - x0):wx1 - x0].any():
+                widget.draw(self)
+        # Widgets draw whole; keep only what they drew inside the dirty areas
+        np.logical_not(self._damage, out=self._keep)
+        np.copyto(self.pixels, self._before, where=self._keep)
+
+        area = int(mask.sum())
+        self._damage.fill(False)
+        self._damage_box = None
+        self._dirty = None
+        self.present(box)
+
+        self.frames += 1
+        self.last_area = area
+        self.max_area = max(self.max_area, area)
+        self.total_area += area
+        self.render_timing.record((time.perf_counter() - start) * 1000.0)
+        return area
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "last_area": self.last_area,
+            "avg_area": self.total_area / self.frames if self.frames else None,
+            "max_area": self.max_area,
+            "total_area": self.total_area,
+            "render": self.render_timing.as_dict(),
+        }
+
+
+def _union(a, b):
+    return min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])
+
+
+def _same(a, b):
+    if a is b:
+        return True
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):
+        return False